@@ -1 +1,227 @@
-# backtest engine
+# System_1_Nifty_OI/backtest/backtest_engine.py
+# Vectorised intraday level-breakout backtester (Entry / SL / Target lines).
+#
+# Each session the Alert + Order Manager lines are derived from the previous
+# session's close:
+#     entry  = ref · (1 ± entry_pct %)      (+ for BUY, − for SELL)
+#     sl     = entry · (1 ∓ sl_pct %)
+#     target = entry · (1 ± target_pct %)
+# A trade opens at the close of the first bar whose trigger fires (same
+# cross / touch rules as shared/alert_index.py) before `last_entry`, and
+# optionally only when the put/call OI ratio agrees. It exits on the first
+# later bar that reaches the SL (checked first) or target — at the line, or
+# at the open if the bar gapped through it — else at the session's last
+# close. One trade per session, charges from shared/charges_engine (the
+# schedule behind risk_engine.calculate_charges).
+#
+# Everything is whole-array NumPy: per-session "first bar where ..." is a
+# np.minimum.reduceat over session starts, so a run is O(bars) with no
+# Python loop. prepare() holds the parameter-independent arrays (sessions,
+# Heikin-Ashi, PCR) so sweeps pay for it once.
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from shared.charges_engine import charges
+from shared.heikin_ashi import heikin_ashi
+from System_1_Nifty_OI.data_loader import _to_epoch
+from System_1_Nifty_OI.backtest.backtest_utils import (
+    NONE, Bars, drawdown, first_index, hhmm, minute_of_day, session_bounds, summarize)
+
+# ---------------------------
+# Settings
+# ---------------------------
+TRIGGERS = ("Price Cross", "Price Touch", "HA Body Cross", "HA Body Touch")
+_SESSION_KEYS = ("starts", "ends", "ref", "sid", "index")
+EXIT_REASONS = np.array(["sl", "target", "eod"])
+SIDE_SIGN = {"BUY": 1.0, "SELL": -1.0}
+DEFAULT_CAPITAL = 1_000_000.0
+DEFAULT_PARAMS = {
+    "side": "BUY",
+    "trigger": "Price Cross",
+    "entry_pct": 0.2,           # entry line offset from the previous close
+    "sl_pct": 0.3,              # SL / target offsets from the entry line
+    "target_pct": 0.6,
+    "qty": 75,                  # fixed quantity (one NIFTY lot) ...
+    "risk_pct": None,           # ... or size by risk % of capital (risk_engine.calculate_position_size)
+    "min_pcr": None,            # BUY needs PCR >= min_pcr, SELL needs PCR <= 1 / min_pcr
+    "last_entry": "15:00",
+    "segment": "EQ_INTRADAY",
+}
+
+
+# ---------------------------
+# Precompute
+# ---------------------------
+def prepare(bars: Bars) -> Dict[str, np.ndarray]:
+    """Parameter-independent arrays for run_backtest (reuse across parameter sets)."""
+    ctx = {col: np.asarray(bars[col], dtype=np.float64) for col in ("open", "high", "low", "close")}
+    ctx["time"] = np.asarray(bars["time"], dtype=np.int64)
+    starts, ends, sid = session_bounds(ctx["time"])
+    close = ctx["close"]
+    n = close.size
+    ctx.update(starts=starts, ends=ends, sid=sid, index=np.arange(n, dtype=np.int64),
+               minute=minute_of_day(ctx["time"]))
+    ctx["ref"] = np.r_[np.nan, close[ends[:-1] - 1]] if starts.size else np.zeros(0)
+    ctx["prev_close"] = np.r_[np.nan, close[:-1]]
+    last_bar = np.zeros(n, dtype=bool)
+    last_bar[ends - 1] = True
+    ctx["last_bar"] = last_bar
+    ha_open, _, _, ha_close = heikin_ashi(ctx["open"], ctx["high"], ctx["low"], close)
+    ctx.update(ha_open=ha_open, ha_close=ha_close, prev_ha_close=np.r_[np.nan, ha_close[:-1]])
+    if "oi_call" in bars and "oi_put" in bars:
+        call = np.asarray(bars["oi_call"], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ctx["pcr"] = np.where(call > 0, np.asarray(bars["oi_put"], dtype=np.float64) / call, np.nan)
+    return ctx
+
+
+def slice_context(ctx: Dict[str, np.ndarray], start=None, end=None) -> Dict[str, np.ndarray]:
+    """
+    Sessions with start <= time < end of a prepare() context, as views where possible.
+    Indicators (HA, previous closes, session ref) keep their full-history values, so
+    overlapping windows (walk-forward folds) share one prepare() and need no warm-up.
+    """
+    time, starts = ctx["time"], ctx["starts"]
+    lo = _to_epoch(start)
+    hi = _to_epoch(end)
+    i = int(np.searchsorted(time, lo)) if lo is not None else 0
+    j = int(np.searchsorted(time, hi)) if hi is not None else time.size
+    s0, s1 = int(np.searchsorted(starts, i)), int(np.searchsorted(starts, j))
+    i = int(starts[s0]) if s0 < starts.size else time.size
+    j = int(starts[s1]) if s1 < starts.size else time.size
+    out = {k: v[i:j] for k, v in ctx.items() if k not in _SESSION_KEYS}
+    out.update(starts=starts[s0:s1] - i, ends=ctx["ends"][s0:s1] - i, ref=ctx["ref"][s0:s1],
+               sid=ctx["sid"][i:j] - s0, index=np.arange(j - i, dtype=np.int64))
+    return out
+
+
+def session_levels(ref, sign: float, p: dict):
+    """Entry / SL / target lines from the reference (previous session) close."""
+    line = ref * (1 + sign * p["entry_pct"] / 100.0)
+    return line, line * (1 - sign * p["sl_pct"] / 100.0), line * (1 + sign * p["target_pct"] / 100.0)
+
+
+def trigger_mask(ctx: Dict[str, np.ndarray], trigger: str, line: np.ndarray, sign: float) -> np.ndarray:
+    """
+    Bars whose trigger fires on `line` (alert_index semantics): cross modes need a
+    cross in the trade direction, touch modes fire on any "Lenient" alert (touch or cross).
+    """
+    if trigger.startswith("HA"):
+        prev, ho, hc = ctx["prev_ha_close"], ctx["ha_open"], ctx["ha_close"]
+        lo, hi = np.minimum(ho, hc), np.maximum(ho, hc)
+        up, down = (prev < line) & (line < hi), (lo < line) & (line < prev)
+    else:
+        prev, close = ctx["prev_close"], ctx["close"]
+        lo, hi = ctx["low"], ctx["high"]
+        up, down = (prev < line) & (line < close), (close < line) & (line < prev)
+    if trigger in ("Price Cross", "HA Body Cross"):
+        return up if sign > 0 else down
+    if trigger in ("Price Touch", "HA Body Touch"):
+        return ((lo <= line) & (line <= hi)) | up | down
+    raise ValueError(f"unknown trigger {trigger!r} (expected one of {TRIGGERS})")
+
+
+# ---------------------------
+# Backtest
+# ---------------------------
+def run_backtest(data, params: Optional[dict] = None, capital: float = DEFAULT_CAPITAL, **overrides) -> dict:
+    """
+    data: bars (dict of schema columns) or a prepare() context.
+    Returns {"equity", "drawdown", "position" (per bar), "trades" (columnar dict), "stats", "params"}.
+    """
+    ctx = data if "sid" in data else prepare(data)
+    p = {**DEFAULT_PARAMS, **(params or {}), **overrides}
+    sign = SIDE_SIGN[p["side"].upper()]
+    starts, ends, sid, idx = ctx["starts"], ctx["ends"], ctx["sid"], ctx["index"]
+    open_, high, low, close = ctx["open"], ctx["high"], ctx["low"], ctx["close"]
+    n = close.size
+
+    # session lines
+    line_s, sl_s, tgt_s = session_levels(ctx["ref"], sign, p)
+
+    # entries: first trigger per session
+    signal = trigger_mask(ctx, p["trigger"], line_s[sid], sign)
+    signal &= (ctx["minute"] <= hhmm(p["last_entry"])) & ~ctx["last_bar"]
+    if p["min_pcr"]:
+        pcr = ctx["pcr"]
+        signal &= (pcr >= p["min_pcr"]) if sign > 0 else (pcr <= 1.0 / p["min_pcr"])
+    entry_s = first_index(signal, starts)
+
+    # exits: first later bar touching SL / target, else the session close
+    after = idx > entry_s[sid]
+    hit_sl = sign * (low if sign > 0 else high) <= sign * sl_s[sid]
+    hit_tgt = sign * (high if sign > 0 else low) >= sign * tgt_s[sid]
+    exit_s = first_index((hit_sl | hit_tgt) & after, starts)
+    eod = exit_s == NONE
+    exit_s = np.where(eod, ends - 1, exit_s)
+
+    traded = np.flatnonzero(entry_s != NONE)
+    ei, xi = entry_s[traded], exit_s[traded]
+    entry_px = close[ei]
+    sl, tgt = sl_s[traded], tgt_s[traded]
+    reason = np.where(eod[traded], 2, np.where(hit_sl[xi], 0, 1))
+    gap_sl = np.where(sign * open_[xi] < sign * sl, open_[xi], sl)
+    gap_tgt = np.where(sign * open_[xi] > sign * tgt, open_[xi], tgt)
+    exit_px = np.where(reason == 0, gap_sl, np.where(reason == 1, gap_tgt, close[xi]))
+
+    if p["risk_pct"]:
+        qty = np.maximum(np.floor_divide(capital * p["risk_pct"] / 100, np.abs(entry_px - sl)), 1.0)
+    else:
+        qty = np.full(traded.size, float(p["qty"]))
+
+    is_buy = sign > 0
+    c_in = charges(qty, entry_px, is_buy, p["segment"])
+    c_out = charges(qty, exit_px, not is_buy, p["segment"])
+    gross = sign * qty * (exit_px - entry_px)
+    net = gross - c_in - c_out
+
+    # equity: realised cash flows at entry / exit bars + open-trade mark-to-market
+    flow = np.zeros(n)
+    flow[ei] -= c_in
+    flow[xi] += gross - c_out
+    qty_s = np.zeros(starts.size)
+    qty_s[traded] = sign * qty
+    px_s = np.zeros(starts.size)
+    px_s[traded] = entry_px
+    stop_s = np.zeros(starts.size, dtype=np.int64)
+    stop_s[traded] = xi
+    holding = (idx >= entry_s[sid]) & (idx < stop_s[sid])
+    position = np.where(holding, qty_s[sid], 0.0)
+    equity = capital + np.cumsum(flow) + position * (close - px_s[sid])
+
+    time = ctx["time"]
+    trades = {
+        "entry_time": time[ei], "exit_time": time[xi], "side": np.full(ei.size, sign, dtype=np.int8),
+        "qty": qty, "entry": entry_px, "exit": exit_px, "sl": sl, "target": tgt,
+        "gross": gross, "charges": c_in + c_out, "net": net, "reason": EXIT_REASONS[reason],
+    }
+    return {"equity": equity, "drawdown": drawdown(equity),
+            "position": position, "trades": trades, "stats": summarize(equity, trades, ends, capital),
+            "params": p}
+
+
+# ---------------------------
+# Smoke test
+# ---------------------------
+if __name__ == "__main__":
+    import time as _time
+
+    from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars, trades_frame
+    from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+    bars = frame_to_bars(synthetic_minutes(days=250))
+    ctx = prepare(bars)
+    for trigger in TRIGGERS:
+        for side in SIDE_SIGN:
+            res = run_backtest(ctx, trigger=trigger, side=side)
+            t = res["trades"]
+            assert np.all(t["exit_time"] > t["entry_time"])
+            assert abs(res["equity"][-1] - DEFAULT_CAPITAL - t["net"].sum()) < 1e-6
+            assert not res["position"][ctx["ends"] - 1].any()
+    t0 = _time.perf_counter()
+    res = run_backtest(ctx, trigger="HA Body Cross", risk_pct=0.5, min_pcr=0.9)
+    ms = (_time.perf_counter() - t0) * 1000
+    print(f"✅ Vectorised backtest OK: {ctx['close'].size:,} bars in {ms:.1f} ms |", res["stats"])
+    print(trades_frame(res["trades"]).head(3).to_string())
@@ -1 +1,106 @@
-# backtest utils
+# System_1_Nifty_OI/backtest/backtest_utils.py
+# Array helpers shared by the backtest engines.
+#
+#   bars      dict of equal-length NumPy columns in the demo_data_schema.txt
+#             layout (time as int64 epoch seconds, naive exchange time):
+#             time, open, high, low, close, volume, oi_call, oi_put
+#   sessions  one trading day per group; per-group reductions use
+#             ufunc.reduceat over the session start offsets (no Python loop)
+
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from System_1_Nifty_OI.data_loader import DATA_COLUMNS, DEFAULT_ARCHIVE, TimeLike, open_archive
+
+Bars = Dict[str, np.ndarray]
+NONE = np.iinfo(np.int64).max          # "no index" sentinel for per-session min reductions
+
+
+# ---------------------------
+# Loading
+# ---------------------------
+def frame_to_bars(df: pd.DataFrame) -> Bars:
+    """Schema DataFrame (symbol, datetime, open, ..., oi_put) → column arrays."""
+    times = pd.to_datetime(df["datetime"]).to_numpy().astype("datetime64[s]").astype(np.int64)
+    bars = {"time": times}
+    for col in DATA_COLUMNS:
+        bars[col] = df[col].to_numpy()
+    return bars
+
+
+def load_bars(symbol: str = "NIFTY", start: TimeLike = None, end: TimeLike = None,
+              archive_root: Union[str, Path] = DEFAULT_ARCHIVE) -> Bars:
+    """Zero-copy memmapped columns for [start, end) from the columnar archive."""
+    return open_archive(symbol, archive_root).slice(start, end)
+
+
+# ---------------------------
+# Sessions
+# ---------------------------
+def session_bounds(times: np.ndarray):
+    """(starts, ends, sid): first / one-past-last row of each trading day and the day index per bar."""
+    day = np.asarray(times, dtype=np.int64) // 86400
+    n = day.size
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]]) if n else np.zeros(0, dtype=np.intp)
+    ends = np.r_[starts[1:], n].astype(np.intp)
+    sid = np.repeat(np.arange(starts.size), ends - starts)
+    return starts, ends, sid
+
+
+def first_index(mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Per session, the first row where mask is True (NONE when it never is)."""
+    if not starts.size:
+        return np.zeros(0, dtype=np.int64)
+    cand = np.where(mask, np.arange(mask.size, dtype=np.int64), NONE)
+    return np.minimum.reduceat(cand, starts)
+
+
+def minute_of_day(times: np.ndarray) -> np.ndarray:
+    return (np.asarray(times, dtype=np.int64) % 86400) // 60
+
+
+def hhmm(value: str) -> int:
+    """"15:00" → minute of day."""
+    h, m = value.split(":")
+    return int(h) * 60 + int(m)
+
+
+# ---------------------------
+# Results
+# ---------------------------
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """Fractional drawdown from the running peak (0 at new highs, negative below)."""
+    peak = np.maximum.accumulate(equity)
+    return equity / peak - 1.0
+
+
+def trades_frame(trades: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Columnar trade list → DataFrame with readable timestamps."""
+    df = pd.DataFrame(trades)
+    for col in ("entry_time", "exit_time"):
+        if col in df:
+            df[col] = pd.to_datetime(df[col], unit="s")
+    return df
+
+
+def summarize(equity: np.ndarray, trades: Dict[str, np.ndarray], ends: np.ndarray, capital: float) -> dict:
+    """Headline stats: P&L, win rate, profit factor, max drawdown, daily Sharpe."""
+    net = trades["net"]
+    wins, losses = net[net > 0].sum(), -net[net < 0].sum()
+    daily = equity[ends - 1] if ends.size else equity[-1:]
+    rets = np.diff(np.r_[capital, daily]) / np.r_[capital, daily[:-1]]
+    sd = rets.std()
+    dd = drawdown(equity) if equity.size else np.zeros(1)
+    return {
+        "trades": int(net.size),
+        "net_pnl": round(float(net.sum()), 2),
+        "charges": round(float(trades["charges"].sum()), 2),
+        "win_rate": round(float((net > 0).mean() * 100), 2) if net.size else 0.0,
+        "profit_factor": round(float(wins / losses), 3) if losses > 0 else float("inf") if wins > 0 else 0.0,
+        "return_pct": round(float((equity[-1] / capital - 1) * 100), 3) if equity.size else 0.0,
+        "max_drawdown_pct": round(float(dd.min() * 100), 3),
+        "sharpe": round(float(rets.mean() / sd * np.sqrt(252)), 3) if sd > 0 else 0.0,
+    }
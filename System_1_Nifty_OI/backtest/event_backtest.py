@@ -0,0 +1,320 @@
+# System_1_Nifty_OI/backtest/event_backtest.py
+# Event-driven backtest on the live paper-trading components.
+#
+# The vectorised engine fills at bar closes and assumes the SL / target line
+# price. This runner replays ticks (or a synthetic O → extreme → extreme → C
+# path per 1-minute bar) through the same objects the terminal wires to the
+# live feed, in the same order a feed tick reaches them:
+#
+#   BarAggregator("1m")      closes bars → HeikinAshiState + alert_index.level_ranges
+#                            on the entry line (alert_logic.monitor_chart rules)
+#   position_size            risk_engine.calculate_position_size
+#   build_order + RiskController.check      place_order → validate_order
+#   PaperMatchingEngine      MARKET orders with latency / slippage / participation
+#   PositionBook             fills (with charges_engine charges) and tick marks
+#   AlertIndex.on_tick       SL / target lines armed on the entry fill; a hit
+#                            sends the exit order, filled on the next tick
+#
+# Time comes from a SimClock set to each tick's timestamp (matcher latency,
+# risk-rate windows). Latency and slippage default to the live paper models
+# of get_paper_engine (seeded, so runs repeat); latency_ms=0, slippage_bps=0
+# gives ideal next-tick fills. Nothing touches Streamlit, the ledger or the journal,
+# so a run is a tight loop over ticks. Lines, triggers and one-trade-per-
+# session match backtest_engine; exits square off at `square_off`.
+
+from typing import Optional
+
+import numpy as np
+
+from shared.alert_index import AlertIndex, level_ranges
+from shared.bar_aggregator import BarAggregator
+from shared.charges_engine import charges
+from shared.heikin_ashi import HeikinAshiState
+from shared.position_book import PositionBook
+from shared.position_sizer import position_size
+from shared.strategy_engine.data_feed_bridge import feed_symbol
+from shared.strategy_engine.execution_manager import (PAPER_LATENCY_MS, PAPER_SLIPPAGE_BPS, BpsSlippage,
+                                                      FixedLatency, PaperMatchingEngine, RandomLatency)
+from shared.strategy_engine.order_router import build_order
+from shared.strategy_engine.risk_controller import RiskController
+from System_1_Nifty_OI.backtest.backtest_engine import DEFAULT_CAPITAL, DEFAULT_PARAMS, SIDE_SIGN, session_levels
+from System_1_Nifty_OI.backtest.backtest_utils import Bars, drawdown, hhmm, summarize
+
+# ---------------------------
+# Settings
+# ---------------------------
+TICK_OFFSETS = np.array([0, 20, 40, 59])        # seconds into the bar: O, first extreme, second extreme, C
+EVENT_PARAMS = {
+    "square_off": "15:29",      # exit any open trade on the first tick at / after this time
+    "latency_ms": PAPER_LATENCY_MS[0],      # matcher models, as get_paper_engine uses live;
+    "latency_jitter_ms": PAPER_LATENCY_MS[1],   # latency_ms=0 → no latency, jitter 0 → fixed
+    "slippage_bps": PAPER_SLIPPAGE_BPS,
+    "seed": 7,                  # latency RNG seed
+    "participation": 1.0,
+}
+
+
+class SimClock:
+    """Callable clock for the matcher / risk controller; the runner sets `now` per tick."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def bar_ticks(bars: Bars):
+    """1-minute bars → (time, price, volume) ticks: O, L, H, C for up bars, O, H, L, C for down bars."""
+    t = np.asarray(bars["time"], dtype=np.int64)
+    o, h, l, c = (np.asarray(bars[k], dtype=np.float64) for k in ("open", "high", "low", "close"))
+    up = c >= o
+    prices = np.column_stack([o, np.where(up, l, h), np.where(up, h, l), c]).ravel()
+    times = (t[:, None] + TICK_OFFSETS).ravel().astype(np.float64)
+    volume = np.repeat(np.asarray(bars["volume"], dtype=np.float64) / TICK_OFFSETS.size, TICK_OFFSETS.size)
+    return times, prices, volume
+
+
+class EventBacktest:
+    """One symbol: alerts → sizing → risk check → paper matcher → position book, on a simulated clock."""
+
+    def __init__(self, params: Optional[dict] = None, capital: float = DEFAULT_CAPITAL,
+                 risk_rules: Optional[dict] = None, symbol: str = "NIFTY", **overrides):
+        p = self.params = {**DEFAULT_PARAMS, **EVENT_PARAMS, **(params or {}), **overrides}
+        self.symbol = feed_symbol(symbol)
+        self.capital = capital
+        self.sign = SIDE_SIGN[p["side"].upper()]
+        self.side, self.exit_side = ("BUY", "SELL") if self.sign > 0 else ("SELL", "BUY")
+        self.use_ha = p["trigger"].startswith("HA")
+        self.touch = p["trigger"].endswith("Touch")
+        self.last_entry = hhmm(p["last_entry"])
+        self.square_off = hhmm(p["square_off"])
+
+        self.clock = SimClock()
+        self.book = PositionBook()
+        latency = (RandomLatency(p["latency_ms"], p["latency_jitter_ms"], p["seed"])
+                   if p["latency_ms"] and p["latency_jitter_ms"] else FixedLatency(p["latency_ms"]))
+        self.engine = PaperMatchingEngine(latency=latency,
+                                          slippage=BpsSlippage(p["slippage_bps"]),
+                                          participation=p["participation"], clock=self.clock)
+        self.engine.add_listener(self._on_order_event)
+        self.risk = RiskController({"capital": capital, **(risk_rules or {})}, book=self.book,
+                                   sectors=[], clock=self.clock)
+        self.alerts = AlertIndex()
+        self.bars = BarAggregator(["1m"])
+        self.bars.subscribe(self.symbol)
+        self.bars.add_close_listener(self._on_bar_close)
+        self.ha = HeikinAshiState()
+
+        self.day = None
+        self.levels = None              # (entry, sl, target) for the session
+        self.traded_today = False
+        self.last_price = None
+        self.prev_close = None
+        self.entry_id = None
+        self.trade = None               # open trade being built from fills
+        self.exiting = False
+        self.armed_at = None
+        self.bank = 0.0                 # realised net P&L of closed sessions (book resets daily)
+        self.equity, self.position, self.session_ends, self.closed = [], [], [], []
+        self.stats = {"ticks": 0, "bars": 0, "alerts": 0, "risk_rejects": 0}
+
+    # ---------- feed ----------
+    def on_tick(self, ts: float, price: float, volume: float = 1.0):
+        """One trade tick, dispatched in the live listener order (bars → matcher → book → alerts)."""
+        self.clock.now = ts
+        sym = self.symbol
+        self.bars.on_tick(sym, price, volume, ts)
+        day = int(ts) // 86400
+        if day != self.day:
+            self._new_session(day)
+        self.engine.on_tick(sym, price, volume, ts)
+        if self.trade is not None:
+            self.book.mark(sym, price)
+            if not self.exiting and ts > self.armed_at:
+                hits = self.alerts.on_tick(sym, self.last_price, price)
+                if hits:
+                    self.stats["alerts"] += 1
+                    self._exit(self.alerts.to_alerts(hits[:1])[0]["line"])
+                elif (int(ts) % 86400) // 60 >= self.square_off:
+                    self._exit("eod")
+        self.last_price = price
+        self.stats["ticks"] += 1
+
+    def _new_session(self, day: int):
+        if self.day is not None:
+            self.session_ends.append(len(self.equity))
+            self.bank += self.book.realized - self.book.charges
+            self.book.reset_day()
+        self.day = day
+        self.traded_today = False
+        ref = self.last_price
+        self.levels = session_levels(ref, self.sign, self.params) if ref else None
+
+    def _on_bar_close(self, symbol: str, timeframe: str, series):
+        i = series.n - 2
+        t = int(series.time[i])
+        o, h, l, c, _ = series.ohlcv[i].tolist()
+        prev_ha = self.ha.ha_close
+        ha_o, _, _, ha_c = self.ha.update(o, h, l, c)
+        self._record()
+        if (self.levels is not None and not self.traded_today and self.trade is None
+                and (t % 86400) // 60 <= self.last_entry):
+            line = self.levels[0]
+            sens = "Lenient" if self.touch else "Strict"
+            if self.use_ha:
+                prev = prev_ha
+                crosses, touches = level_ranges([line], prev, ha_o, h, l, ha_c, True, sens)
+            else:
+                prev = self.prev_close
+                crosses, touches = level_ranges([line], prev, o, h, l, c, False, sens)
+            if self.touch:
+                fired = bool(crosses or touches)
+            else:
+                fired = bool(crosses) and self.sign * prev < self.sign * line
+            if fired:
+                self.stats["alerts"] += 1
+                self._enter(c)
+        self.prev_close = c
+
+    def _record(self):
+        book = self.book
+        pos = book.positions.get(self.symbol)
+        self.equity.append(self.capital + self.bank + book.daily_pnl)
+        self.position.append(pos.qty if pos is not None else 0)
+        self.stats["bars"] += 1
+
+    # ---------- orders ----------
+    def _enter(self, price: float):
+        p = self.params
+        _, sl, target = self.levels
+        self.traded_today = True
+        qty = position_size(price, sl, self.capital, p["risk_pct"]) if p["risk_pct"] else p["qty"]
+        order = build_order(self.symbol, self.side, qty, price, sl, target)
+        ok, _ = self.risk.check(order)
+        if not ok:
+            self.stats["risk_rejects"] += 1
+            return
+        self.entry_id = self.engine.submit(self.symbol, self.side, qty, "MARKET", ts=self.clock.now,
+                                           tag={"role": "entry", "sl": sl, "target": target})
+
+    def _exit(self, reason: str):
+        self.exiting = True
+        self.trade["reason"] = reason
+        self.alerts.clear(self.symbol)
+        self.engine.cancel(self.entry_id, ts=self.clock.now)            # unfilled remainder, if any
+        qty = abs(self.book.positions[self.symbol].qty)
+        self.engine.submit(self.symbol, self.exit_side, qty, "MARKET", ts=self.clock.now, tag={"role": "exit"})
+
+    def _on_order_event(self, event: dict):
+        if event["type"] != "fill":
+            return
+        side, qty, price, ts = event["side"], event["qty"], event["price"], event["ts"]
+        fee = float(charges(qty, price, side, self.params["segment"])[0])
+        self.book.on_fill(self.symbol, side, qty, price, fee)
+        tag = event["tag"]
+        trade = self.trade
+        if tag["role"] == "entry":
+            if trade is None:
+                trade = self.trade = {"entry_time": ts, "qty": 0, "entry": 0.0, "exit_qty": 0, "exit": 0.0,
+                                      "sl": tag["sl"], "target": tag["target"], "charges": 0.0}
+                self.alerts.add(self.symbol, tag["sl"], "sl", once=True)
+                self.alerts.add(self.symbol, tag["target"], "target", once=True)
+                self.armed_at = ts
+            trade["entry"] = (trade["entry"] * trade["qty"] + price * qty) / (trade["qty"] + qty)
+            trade["qty"] += qty
+        else:
+            trade["exit"] = (trade["exit"] * trade["exit_qty"] + price * qty) / (trade["exit_qty"] + qty)
+            trade["exit_qty"] += qty
+        trade["charges"] += fee
+        if tag["role"] == "exit" and self.book.positions[self.symbol].qty == 0:
+            trade["exit_time"] = ts
+            self.closed.append(trade)
+            self.trade, self.exiting = None, False
+
+    # ---------- run ----------
+    def run_ticks(self, times, prices, volumes=None) -> dict:
+        times = np.asarray(times, dtype=np.float64).tolist()
+        prices = np.asarray(prices, dtype=np.float64).tolist()
+        volumes = [1.0] * len(times) if volumes is None else np.asarray(volumes, dtype=np.float64).tolist()
+        on_tick = self.on_tick
+        for ts, px, v in zip(times, prices, volumes):
+            on_tick(ts, px, v)
+        return self.finish()
+
+    def run_bars(self, bars: Bars) -> dict:
+        return self.run_ticks(*bar_ticks(bars))
+
+    def finish(self) -> dict:
+        """Record the still-open last bar and build the result (same shape as run_backtest)."""
+        if self.stats["ticks"]:
+            self._record()
+        equity = np.array(self.equity, dtype=np.float64)
+        sign = self.sign
+        rows = self.closed
+        col = lambda k, dtype=np.float64: np.array([r[k] for r in rows], dtype=dtype)
+        qty, entry, exit_ = col("qty"), col("entry"), col("exit")
+        gross = sign * qty * (exit_ - entry)
+        fees = col("charges")
+        trades = {
+            "entry_time": col("entry_time", np.int64), "exit_time": col("exit_time", np.int64),
+            "side": np.full(len(rows), sign, dtype=np.int8), "qty": qty, "entry": entry, "exit": exit_,
+            "sl": col("sl"), "target": col("target"), "gross": gross, "charges": fees,
+            "net": gross - fees, "reason": np.array([r["reason"] for r in rows], dtype="<U6"),
+        }
+        ends = np.array(self.session_ends + [equity.size], dtype=np.intp)
+        events = self.stats["ticks"] + self.stats["bars"] + self.stats["alerts"] + sum(self.engine.stats.values())
+        return {"equity": equity, "drawdown": drawdown(equity) if equity.size else equity,
+                "position": np.array(self.position, dtype=np.float64), "trades": trades,
+                "stats": {**summarize(equity, trades, ends, self.capital), "events": events,
+                          "risk_rejects": self.stats["risk_rejects"]},
+                "params": self.params}
+
+
+def run_event_backtest(bars: Bars, params: Optional[dict] = None, capital: float = DEFAULT_CAPITAL,
+                       risk_rules: Optional[dict] = None, ticks=None, **overrides) -> dict:
+    """Bars (synthetic intrabar path) or explicit ticks=(time, price, volume) through EventBacktest."""
+    runner = EventBacktest(params, capital, risk_rules, **overrides)
+    return runner.run_ticks(*ticks) if ticks is not None else runner.run_bars(bars)
+
+
+# ---------------------------
+# Smoke test
+# ---------------------------
+if __name__ == "__main__":
+    import time as _time
+
+    from System_1_Nifty_OI.backtest.backtest_engine import run_backtest
+    from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars
+    from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+    bars = frame_to_bars(synthetic_minutes(days=60))
+    ideal = {"latency_ms": 0.0, "slippage_bps": 0.0}
+    t0 = _time.perf_counter()
+    res = run_event_backtest(bars, trigger="HA Body Cross", **ideal)
+    dt = _time.perf_counter() - t0
+    tr = res["trades"]
+    assert res["equity"].size == bars["close"].size
+    assert abs(res["equity"][-1] - DEFAULT_CAPITAL - tr["net"].sum()) < 1e-6
+    assert np.all(tr["exit_time"] > tr["entry_time"]) and set(tr["reason"]) <= {"sl", "target", "eod"}
+
+    # same entry sessions as the vectorised engine; fills differ only by the next-tick execution
+    vec = run_backtest(bars, trigger="HA Body Cross")["trades"]
+    assert np.array_equal(vec["entry_time"] // 86400, tr["entry_time"] // 86400)
+    assert np.array_equal(tr["entry_time"], vec["entry_time"] + 60)         # next bar's open tick
+
+    # explicit ticks and bars → identical run
+    again = run_event_backtest(None, trigger="HA Body Cross", ticks=bar_ticks(bars), **ideal)
+    assert np.array_equal(again["equity"], res["equity"])
+
+    # default = live paper models: latency misses the entry tick, seeded so runs repeat
+    live = run_event_backtest(bars, trigger="HA Body Cross")
+    assert np.array_equal(live["equity"], run_event_backtest(bars, trigger="HA Body Cross")["equity"])
+    assert np.all(live["trades"]["entry_time"] > vec["entry_time"] + 60)
+
+    strict = run_event_backtest(bars, trigger="HA Body Cross", risk_rules={"max_daily_loss": 1000})
+    assert strict["stats"]["risk_rejects"] > 0
+    ev = res["stats"]["events"]
+    print(f"✅ Event backtest OK: {ev:,} events in {dt:.2f} s ({ev / dt * 60 / 1e6:.1f} M events/min) |", res["stats"])
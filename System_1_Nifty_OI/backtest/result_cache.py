@@ -0,0 +1,291 @@
+# System_1_Nifty_OI/backtest/result_cache.py
+# Content-addressed cache of backtest results.
+#
+#   key     sha1 over (strategy code version, full parameter dict, capital,
+#           data fingerprint, charges schedule) — change any of them and the
+#           old entry is simply never asked for again
+#   entry   one zip per key: meta.json (params, stats and any other JSON
+#           fields) plus one .npy member per array (equity, position,
+#           trades.*), deflate level 1; sweeps store stats-only entries
+#           (meta.json alone)
+#   LRU     a hit touches the file's mtime; a put evicts least recently used
+#           entries until the directory is back under max_bytes
+#
+# cached_backtest() is run_backtest() behind the cache; iter_sweep(cache=...)
+# and run_walk_forward(cache=...) store their rows / folds in the same store.
+
+import hashlib
+import io
+import json
+import os
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from shared import charges_engine, heikin_ashi
+from System_1_Nifty_OI import data_loader
+from System_1_Nifty_OI.backtest import backtest_engine, backtest_utils
+from System_1_Nifty_OI.backtest.backtest_engine import DEFAULT_CAPITAL, DEFAULT_PARAMS, run_backtest
+from System_1_Nifty_OI.backtest.backtest_utils import drawdown
+from System_1_Nifty_OI.data_loader import COLUMN_DTYPES, DEFAULT_ARCHIVE, ROOT, TimeLike, open_archive
+
+# ---------------------------
+# Settings
+# ---------------------------
+DEFAULT_CACHE = ROOT / "demo_data" / "cache" / "results"
+MAX_BYTES = 512 * 2 ** 20
+CODE_MODULES = (backtest_engine, backtest_utils, heikin_ashi, charges_engine, data_loader)
+DERIVED_KEYS = ("drawdown",)            # recomputed on load, never stored
+_WARMUP_KEYS = ("ref", "prev_close", "ha_open", "prev_ha_close")
+_VERSIONS = {}
+
+
+# ---------------------------
+# Key parts
+# ---------------------------
+def code_version() -> str:
+    """Digest of the modules that decide a backtest's trades (read once per process)."""
+    if "code" not in _VERSIONS:
+        h = hashlib.sha1()
+        for module in CODE_MODULES:
+            h.update(Path(module.__file__).read_bytes())
+        _VERSIONS["code"] = h.hexdigest()
+    return _VERSIONS["code"]
+
+
+def charges_version() -> str:
+    """Digest of the charges schedule (segments, fields, rates)."""
+    if "charges" not in _VERSIONS:
+        h = hashlib.sha1(json.dumps([charges_engine.SEGMENTS, charges_engine.FIELDS]).encode())
+        h.update(charges_engine.SCHEDULE_TABLE.tobytes())
+        _VERSIONS["charges"] = h.hexdigest()
+    return _VERSIONS["charges"]
+
+
+def data_fingerprint(data) -> str:
+    """
+    Content digest of bars or a prepare() context: time, OHLC and PCR. A bars dict
+    and its prepare() context hash alike; a slice_context() window also hashes the
+    history it inherits (previous session close, Heikin-Ashi seed).
+    """
+    h = hashlib.sha1()
+    for key in ("time", "open", "high", "low", "close"):
+        h.update(np.ascontiguousarray(data[key]).view(np.uint8))
+    if "pcr" in data:
+        pcr = data["pcr"]
+    elif "oi_call" in data and "oi_put" in data:
+        call = np.asarray(data["oi_call"], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pcr = np.where(call > 0, np.asarray(data["oi_put"], dtype=np.float64) / call, np.nan)
+    else:
+        pcr = np.zeros(0)
+    h.update(b"pcr")
+    h.update(np.ascontiguousarray(pcr, dtype=np.float64).view(np.uint8))
+    if "ref" in data and data["ref"].size and not np.isnan(data["ref"][0]):
+        for key in _WARMUP_KEYS:
+            h.update(np.ascontiguousarray(data[key][:1]).view(np.uint8))
+    return h.hexdigest()
+
+
+def archive_fingerprint(symbol: str = "NIFTY", start: TimeLike = None, end: TimeLike = None,
+                        archive_root: Union[str, Path] = DEFAULT_ARCHIVE) -> str:
+    """
+    Cheap fingerprint of an archive range without reading it: the archive is
+    append-only, so the row bounds, their timestamps and the column files'
+    identity pin the content. Rebuilding the archive creates new files.
+    """
+    series = open_archive(symbol, archive_root)
+    i, j = series.index_range(start, end)
+    t = series["time"]
+    ident = [symbol, i, j, int(t[i]) if j > i else None, int(t[j - 1]) if j > i else None]
+    for col, dtype in COLUMN_DTYPES.items():
+        st = os.stat(series.folder / f"{col}.{dtype[1:]}") if series.rows else None
+        ident.append((st.st_dev, st.st_ino) if st else None)
+    return hashlib.sha1(json.dumps(ident).encode()).hexdigest()
+
+
+def result_key(params: Optional[dict], data_fp: str, capital: float = DEFAULT_CAPITAL, **overrides) -> str:
+    """Cache key of one backtest; params are completed with DEFAULT_PARAMS first."""
+    p = {**DEFAULT_PARAMS, **(params or {}), **overrides}
+    blob = json.dumps([code_version(), p, float(capital), data_fp, charges_version()], sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+# ---------------------------
+# On-disk store
+# ---------------------------
+class ResultCache:
+    """Directory of <key>.zip entries, LRU-evicted to stay under max_bytes."""
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_CACHE, max_bytes: int = MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._index = None                      # key -> [last use (mtime_ns), size]
+        self._bytes = 0
+
+    def _entries(self) -> Dict[str, list]:
+        if self._index is None:
+            self._index = {}
+            if self.root.exists():
+                for path in self.root.glob("*.zip"):
+                    st = path.stat()
+                    self._index[path.stem] = [st.st_mtime_ns, st.st_size]
+            self._bytes = sum(size for _, size in self._index.values())
+        return self._index
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.zip"
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries()
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    @property
+    def nbytes(self) -> int:
+        self._entries()
+        return self._bytes
+
+    def get(self, key: str, stats_only: bool = False) -> Optional[dict]:
+        """Cached result as stored (arrays included), or its JSON fields alone with stats_only; None on miss."""
+        path = self._path(key)
+        try:
+            with zipfile.ZipFile(path) as zf:
+                out = json.loads(zf.read("meta.json"))
+                names = zf.namelist()[1:]
+                if not stats_only:
+                    if not names:                       # stats-only entry can't serve a full result
+                        raise KeyError(key)
+                    for name in names:
+                        arr = np.lib.format.read_array(io.BytesIO(zf.read(name)))
+                        group, _, col = name[:-4].rpartition(".")
+                        if group:
+                            out.setdefault(group, {})[col] = arr
+                        else:
+                            out[col] = arr
+                    if "equity" in out:
+                        out["drawdown"] = drawdown(out["equity"])
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(path)
+        st = path.stat()
+        entries = self._entries()
+        if key not in entries:                          # written by another process since the scan
+            self._bytes += st.st_size
+        entries[key] = [st.st_mtime_ns, st.st_size]
+        return out
+
+    def put(self, key: str, result: dict):
+        """
+        Store a result dict: arrays and dicts of arrays (trades) become .npy
+        members, everything else goes to meta.json. A run_backtest() result,
+        a stats-only {"params", "stats"} row and a walk-forward fold all fit.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        meta, columns = {}, {}
+        for k, v in result.items():
+            if k in DERIVED_KEYS:
+                continue
+            if isinstance(v, np.ndarray):
+                columns[k] = v
+            elif isinstance(v, dict) and v and all(isinstance(a, np.ndarray) for a in v.values()):
+                columns.update({f"{k}.{col}": a for col, a in v.items()})
+            else:
+                meta[k] = v
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            zf.writestr("meta.json", json.dumps(meta, default=str))
+            for name, arr in columns.items():
+                with zf.open(f"{name}.npy", "w") as fh:
+                    np.lib.format.write_array(fh, np.ascontiguousarray(arr), allow_pickle=False)
+        os.replace(tmp, path)
+        st = path.stat()
+        entries = self._entries()
+        self._bytes += st.st_size - entries.get(key, [0, 0])[1]
+        entries[key] = [st.st_mtime_ns, st.st_size]
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self, max_bytes: Optional[int] = None):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._entries()
+        for key, (_, size) in sorted(entries.items(), key=lambda kv: kv[1][0]):
+            if self._bytes <= limit:
+                break
+            self._path(key).unlink(missing_ok=True)
+            del entries[key]
+            self._bytes -= size
+
+    def clear(self):
+        self.evict(0)
+
+
+_CACHE = {}
+
+
+def get_result_cache(root: Union[str, Path] = DEFAULT_CACHE, max_bytes: int = MAX_BYTES) -> ResultCache:
+    """Shared cache per directory."""
+    key = str(Path(root).resolve())
+    if key not in _CACHE:
+        _CACHE[key] = ResultCache(root, max_bytes)
+    return _CACHE[key]
+
+
+# ---------------------------
+# Cached backtest
+# ---------------------------
+def cached_backtest(data, params: Optional[dict] = None, capital: float = DEFAULT_CAPITAL,
+                    cache: Optional[ResultCache] = None, fingerprint: Optional[str] = None, **overrides) -> dict:
+    """
+    run_backtest() behind the result cache. Pass `fingerprint` (data_fingerprint /
+    archive_fingerprint) when calling repeatedly on the same data to skip re-hashing.
+    """
+    cache = get_result_cache() if cache is None else cache
+    key = result_key(params, fingerprint or data_fingerprint(data), capital, **overrides)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    res = run_backtest(data, params, capital, **overrides)
+    cache.put(key, res)
+    return res
+
+
+# ---------------------------
+# Smoke test
+# ---------------------------
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from System_1_Nifty_OI.backtest.backtest_engine import prepare
+    from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars
+    from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+    bars = frame_to_bars(synthetic_minutes(days=250))
+    ctx = prepare(bars)
+    assert data_fingerprint(bars) == data_fingerprint(ctx)
+    with tempfile.TemporaryDirectory() as root:
+        cache = ResultCache(root)
+        t0 = time.perf_counter()
+        cold = cached_backtest(ctx, trigger="HA Body Cross", cache=cache)
+        cold_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        warm = cached_backtest(ctx, {"trigger": "HA Body Cross"}, cache=cache)
+        warm_ms = (time.perf_counter() - t0) * 1000
+        assert cache.hits == 1 and warm["stats"] == cold["stats"]
+        assert np.array_equal(warm["equity"], cold["equity"]) and np.array_equal(warm["drawdown"], cold["drawdown"])
+        assert all(np.array_equal(warm["trades"][k], v) for k, v in cold["trades"].items())
+        assert cached_backtest(ctx, trigger="HA Body Cross", capital=2e6, cache=cache)["stats"] != cold["stats"]
+        assert list(warm["trades"]) == list(cold["trades"])
+        size = cache.nbytes
+        cache.evict(size - 1)
+        assert len(cache) == 1
+    print(f"✅ Result cache OK: cold {cold_ms:.1f} ms, warm {warm_ms:.1f} ms, {size / 1024:.0f} KB for 2 entries")
@@ -0,0 +1,222 @@
+# System_1_Nifty_OI/backtest/walk_forward.py
+# Walk-forward optimisation: optimise on a rolling in-sample window, trade the
+# winning parameters on the following out-of-sample window, roll forward.
+#
+#   plan_windows     calendar-month fold plan (rolling or anchored IS window)
+#   run_fold         IS grid sweep → best params → OOS backtest, for one fold
+#   run_walk_forward prepare() once, slice each fold out of the shared context
+#                    (indicators are never recomputed per window), run the
+#                    folds missing from the cache in parallel, stitch the OOS
+#                    trades into one equity curve
+#
+# Fold results are entries of the backtest ResultCache (same zip format and
+# LRU size bound), keyed by the fold dates, grid, ranking, a fingerprint of
+# the window's data and the strategy code / charges versions — appending a
+# month to the archive only computes the new fold.
+
+import hashlib
+import json
+import multiprocessing as mp
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from System_1_Nifty_OI.backtest import param_sweep
+from System_1_Nifty_OI.backtest.backtest_engine import DEFAULT_CAPITAL, prepare, run_backtest, slice_context
+from System_1_Nifty_OI.backtest.backtest_utils import summarize, trades_frame
+from System_1_Nifty_OI.backtest.param_sweep import RANK_BY, RankedTable, SharedBars, attach, param_grid
+from System_1_Nifty_OI.backtest.result_cache import (ResultCache, charges_version, code_version, data_fingerprint,
+                                                     get_result_cache)
+
+# ---------------------------
+# Settings
+# ---------------------------
+IS_MONTHS = 12
+OOS_MONTHS = 1
+FOLD_COLUMNS = ["fold", "is_start", "is_end", "oos_start", "oos_end"]
+
+
+# ---------------------------
+# Fold plan
+# ---------------------------
+def plan_windows(times: np.ndarray, is_months: int = IS_MONTHS, oos_months: int = OOS_MONTHS,
+                 step_months: Optional[int] = None, anchored: bool = False) -> List[dict]:
+    """
+    Folds over the months covered by `times` (epoch seconds). Window bounds are
+    month starts ("YYYY-MM-01", end exclusive); the last OOS window may be the
+    current, partial month. anchored=True keeps every IS window starting at the
+    first month (expanding window).
+    """
+    if not len(times):
+        return []
+    first, last = np.asarray([times[0], times[-1]], dtype="datetime64[s]").astype("datetime64[M]")
+    step = np.timedelta64(step_months or oos_months, "M")
+    is_len, oos_len = np.timedelta64(is_months, "M"), np.timedelta64(oos_months, "M")
+    folds, k = [], 0
+    while first + k * step + is_len <= last:
+        is_start = first if anchored else first + k * step
+        oos_start = first + k * step + is_len
+        bounds = (is_start, oos_start, oos_start, oos_start + oos_len)
+        folds.append(dict(zip(FOLD_COLUMNS, [k, *(str(b.astype("datetime64[D]")) for b in bounds)])))
+        k += 1
+    return folds
+
+
+_FOLD_CODE = {}
+
+
+def _fold_code_version() -> str:
+    """code_version() plus the fold logic itself (this module, the IS ranking)."""
+    if "code" not in _FOLD_CODE:
+        h = hashlib.sha1(code_version().encode())
+        for path in (__file__, param_sweep.__file__):
+            h.update(Path(path).read_bytes())
+        _FOLD_CODE["code"] = h.hexdigest()
+    return _FOLD_CODE["code"]
+
+
+def fold_key(fold: dict, grid: List[dict], rank_by: str, capital: float, digest: str) -> str:
+    """Cache key of one fold: window, grid, ranking, data digest, strategy code and charges versions."""
+    blob = json.dumps(["walk_forward", {k: fold[k] for k in FOLD_COLUMNS[1:]}, grid, rank_by, capital, digest,
+                       _fold_code_version(), charges_version()], sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+# ---------------------------
+# One fold
+# ---------------------------
+def run_fold(ctx: Dict[str, np.ndarray], fold: dict, grid: List[dict],
+             rank_by: str = RANK_BY, capital: float = DEFAULT_CAPITAL) -> dict:
+    """Optimise on the fold's IS window, then backtest the best parameters on its OOS window."""
+    is_ctx = slice_context(ctx, fold["is_start"], fold["is_end"])
+    table = RankedTable(rank_by)
+    for params in grid:
+        table.add({**params, **run_backtest(is_ctx, params, capital)["stats"]})
+    best = table.top(1)[0]
+    params = {k: best[k] for k in grid[0]}
+
+    oos_ctx = slice_context(ctx, fold["oos_start"], fold["oos_end"])
+    res = run_backtest(oos_ctx, params, capital)
+    daily = res["equity"][oos_ctx["ends"] - 1] if oos_ctx["ends"].size else np.zeros(0)
+    return {
+        **fold,
+        "params": params,
+        "is_stats": {k: best[k] for k in best if k not in params},
+        "oos_stats": res["stats"],
+        "oos_trades": res["trades"],
+        "oos_days": oos_ctx["time"][oos_ctx["starts"]].astype(np.int64),
+        "oos_daily_pnl": np.diff(np.r_[capital, daily]),
+    }
+
+
+_WORKER = {}
+
+
+def _init_worker(spec):
+    _WORKER["ctx"], _WORKER["handles"] = attach(spec)
+
+
+def _run_fold_task(task):
+    fold, grid, rank_by, capital = task
+    return run_fold(_WORKER["ctx"], fold, grid, rank_by, capital)
+
+
+# ---------------------------
+# Walk-forward
+# ---------------------------
+def run_walk_forward(data, grid: Optional[Iterable[dict]] = None, is_months: int = IS_MONTHS,
+                     oos_months: int = OOS_MONTHS, step_months: Optional[int] = None,
+                     anchored: bool = False, rank_by: str = RANK_BY, workers: Optional[int] = None,
+                     capital: float = DEFAULT_CAPITAL, cache: Union[ResultCache, bool, None] = None) -> dict:
+    """
+    data: bars or a prepare() context. cache: a ResultCache (default: the shared
+    one, get_result_cache()); cache=False disables the fold cache.
+    Returns {"folds" (DataFrame: window, best params, IS / OOS stats), "oos_trades",
+             "oos_equity" (end-of-day, stitched OOS), "oos_stats", "computed", "cached"}.
+    """
+    ctx = data if "sid" in data else prepare(data)
+    grid = list(grid) if grid is not None else param_grid()
+    folds = plan_windows(ctx["time"], is_months, oos_months, step_months, anchored)
+    cache = get_result_cache() if cache is None else (None if cache is False else cache)
+
+    results, todo = {}, []
+    for fold in folds:
+        window = slice_context(ctx, fold["is_start"], fold["oos_end"])
+        fold["key"] = fold_key(fold, grid, rank_by, capital, data_fingerprint(window))
+        hit = cache.get(fold["key"]) if cache is not None else None
+        if hit is not None:
+            results[fold["fold"]] = {**hit, "fold": fold["fold"]}
+        else:
+            todo.append(fold)
+
+    workers = min(workers or os.cpu_count() or 1, len(todo)) or 1
+    tasks = [(fold, grid, rank_by, capital) for fold in todo]
+    if workers == 1:
+        done = (run_fold(ctx, *task) for task in tasks)
+    else:
+        shared = SharedBars(ctx)
+        pool = mp.get_context().Pool(workers, initializer=_init_worker, initargs=(shared.spec,))
+        done = pool.imap_unordered(_run_fold_task, tasks)
+    try:
+        for res in done:
+            results[res["fold"]] = res
+            if cache is not None:
+                cache.put(res["key"], res)
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+            shared.close()
+
+    ordered = [results[f["fold"]] for f in folds]
+    rows = [{**{k: r[k] for k in FOLD_COLUMNS}, **r["params"],
+             **{f"is_{k}": v for k, v in r["is_stats"].items()},
+             **{f"oos_{k}": v for k, v in r["oos_stats"].items()}} for r in ordered]
+    trades = {k: np.concatenate([r["oos_trades"][k] for r in ordered])
+              for k in (ordered[0]["oos_trades"] if ordered else ())}
+    days = np.concatenate([r["oos_days"] for r in ordered]) if ordered else np.zeros(0, np.int64)
+    equity = capital + np.cumsum(np.concatenate([r["oos_daily_pnl"] for r in ordered]) if ordered else np.zeros(0))
+    stats = summarize(equity, trades, np.arange(1, equity.size + 1), capital) if trades else {}
+    return {
+        "folds": pd.DataFrame(rows),
+        "oos_trades": trades_frame(trades),
+        "oos_equity": pd.Series(equity, index=pd.to_datetime(days, unit="s").normalize(), name="equity"),
+        "oos_stats": stats,
+        "computed": len(todo),
+        "cached": len(folds) - len(todo),
+    }
+
+
+# ---------------------------
+# Smoke test
+# ---------------------------
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars
+    from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+    bars = frame_to_bars(synthetic_minutes(start="2022-01-03", days=400))
+    grid = param_grid(trigger=["Price Cross", "HA Body Cross"], side=["BUY", "SELL"],
+                      entry_pct=[0.1, 0.2], sl_pct=[0.3], target_pct=[0.6, 0.9])
+    with tempfile.TemporaryDirectory() as root:
+        cache = ResultCache(root)
+        t0 = time.perf_counter()
+        cold = run_walk_forward(bars, grid, is_months=6, workers=2, cache=cache)
+        cold_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        warm = run_walk_forward(bars, grid, is_months=6, workers=2, cache=cache)
+        warm_s = time.perf_counter() - t0
+        serial = run_walk_forward(bars, grid, is_months=6, workers=1, cache=False)
+        assert len(cache) == len(cold["folds"]) == cache.hits
+    n = len(cold["folds"])
+    assert n and cold["computed"] == n and warm["cached"] == n and warm["computed"] == 0
+    assert cold["folds"]["oos_net_pnl"].tolist() == warm["folds"]["oos_net_pnl"].tolist() \
+        == serial["folds"]["oos_net_pnl"].tolist()
+    assert abs(cold["oos_stats"]["net_pnl"] - cold["folds"]["oos_net_pnl"].sum()) < 1e-2 * n
+    print(f"✅ Walk-forward OK: {n} folds cold {cold_s:.2f} s, warm {warm_s * 1000:.0f} ms |", cold["oos_stats"])
+    print(cold["folds"][["oos_start", "trigger", "side", "entry_pct", "is_net_pnl", "oos_net_pnl"]].to_string())
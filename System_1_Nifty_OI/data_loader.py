@@ -1 +1,207 @@
-# data loader
+# System_1_Nifty_OI/data_loader.py
+# Columnar memory-mapped OHLCV+OI archive for the demo_data_schema.txt layout.
+#
+#   CSV   : symbol,datetime,open,high,low,close,volume,oi_call,oi_put
+#   ARCHIVE (one folder per symbol):
+#       <root>/<SYMBOL>/time.i8      int64 epoch seconds (naive exchange time), sorted
+#       <root>/<SYMBOL>/open.f8 ...  one raw little-endian column per field
+#       <root>/<SYMBOL>/meta.json    row count, dtypes, first/last time
+#
+# Opening an archive maps the columns with numpy.memmap (no parsing); date
+# ranges are sliced with a binary search on the time column.
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_ARCHIVE = ROOT / "demo_data" / "archive"
+
+SCHEMA_COLUMNS = ["symbol", "datetime", "open", "high", "low", "close", "volume", "oi_call", "oi_put"]
+COLUMN_DTYPES: Dict[str, str] = {
+    "time": "<i8",
+    "open": "<f8",
+    "high": "<f8",
+    "low": "<f8",
+    "close": "<f8",
+    "volume": "<i8",
+    "oi_call": "<i8",
+    "oi_put": "<i8",
+}
+DATA_COLUMNS = list(COLUMN_DTYPES.keys())[1:]
+
+TimeLike = Union[str, pd.Timestamp, np.datetime64, int, None]
+
+
+def _to_epoch(value: TimeLike) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).to_datetime64().astype("datetime64[s]").astype(np.int64))
+
+
+# ---------------------------
+# CSV → archive converter
+# ---------------------------
+def _append_symbol(folder: Path, frame: pd.DataFrame) -> int:
+    """Append rows newer than the archive's last timestamp. Returns rows written."""
+    folder.mkdir(parents=True, exist_ok=True)
+    meta_path = folder / "meta.json"
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() else {"rows": 0, "last": None}
+
+    times = frame["time"].to_numpy(dtype=np.int64)
+    if meta["last"] is not None:
+        frame = frame[times > meta["last"]]
+        times = times[times > meta["last"]]
+    if not len(frame):
+        return 0
+
+    # meta.json is the commit point: bytes past meta["rows"] are a crashed append, cut them first
+    for col, dtype in COLUMN_DTYPES.items():
+        values = times if col == "time" else frame[col].to_numpy()
+        with open(folder / f"{col}.{dtype[1:]}", "ab") as fh:
+            fh.truncate(meta["rows"] * np.dtype(dtype).itemsize)
+            fh.write(values.astype(dtype).tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    meta.update({
+        "rows": meta["rows"] + len(frame),
+        "first": meta.get("first") if meta.get("first") is not None else int(times[0]),
+        "last": int(times[-1]),
+        "dtypes": COLUMN_DTYPES,
+    })
+    tmp = meta_path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(meta, indent=2))
+    os.replace(tmp, meta_path)
+    return len(frame)
+
+
+def convert_csv(csv_paths: Union[str, Path, Iterable[Union[str, Path]]],
+                archive_root: Union[str, Path] = DEFAULT_ARCHIVE,
+                chunksize: int = 1_000_000) -> Dict[str, int]:
+    """
+    Convert schema CSVs into the per-symbol columnar archive.
+    Rows already archived (time <= last) are skipped, so re-running on a
+    growing CSV only appends the new tail. Returns rows written per symbol.
+    """
+    if isinstance(csv_paths, (str, Path)):
+        csv_paths = [csv_paths]
+    archive_root = Path(archive_root)
+    written: Dict[str, int] = {}
+    for path in csv_paths:
+        for chunk in pd.read_csv(path, usecols=SCHEMA_COLUMNS, chunksize=chunksize):
+            chunk["time"] = (pd.to_datetime(chunk["datetime"]).to_numpy()
+                             .astype("datetime64[s]").astype(np.int64))
+            for symbol, frame in chunk.groupby("symbol", sort=False):
+                frame = frame.sort_values("time", kind="stable")
+                n = _append_symbol(archive_root / str(symbol), frame)
+                written[symbol] = written.get(symbol, 0) + n
+    return written
+
+
+# ---------------------------
+# Memory-mapped reader
+# ---------------------------
+class ArchiveSeries:
+    """Read-only memmapped columns of one symbol; slices are zero-copy views."""
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self.symbol = self.folder.name
+        self.meta = json.loads((self.folder / "meta.json").read_text())
+        self.rows = int(self.meta["rows"])
+        self.columns: Dict[str, np.ndarray] = {}
+        for col, dtype in COLUMN_DTYPES.items():
+            path = self.folder / f"{col}.{dtype[1:]}"
+            self.columns[col] = (np.memmap(path, dtype=dtype, mode="r", shape=(self.rows,))
+                                 if self.rows else np.empty(0, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        return self.columns[col]
+
+    def index_range(self, start: TimeLike = None, end: TimeLike = None):
+        """[i, j) row bounds for start <= time < end via binary search."""
+        t = self.columns["time"]
+        s, e = _to_epoch(start), _to_epoch(end)
+        i = int(np.searchsorted(t, s, side="left")) if s is not None else 0
+        j = int(np.searchsorted(t, e, side="left")) if e is not None else self.rows
+        return i, j
+
+    def slice(self, start: TimeLike = None, end: TimeLike = None) -> Dict[str, np.ndarray]:
+        i, j = self.index_range(start, end)
+        return {col: arr[i:j] for col, arr in self.columns.items()}
+
+    def to_frame(self, start: TimeLike = None, end: TimeLike = None) -> pd.DataFrame:
+        cols = self.slice(start, end)
+        df = pd.DataFrame({c: np.asarray(cols[c]) for c in DATA_COLUMNS})
+        df.insert(0, "datetime", pd.to_datetime(np.asarray(cols["time"]), unit="s"))
+        df.insert(0, "symbol", self.symbol)
+        return df
+
+
+def open_archive(symbol: str, archive_root: Union[str, Path] = DEFAULT_ARCHIVE) -> ArchiveSeries:
+    return ArchiveSeries(Path(archive_root) / symbol)
+
+
+def list_symbols(archive_root: Union[str, Path] = DEFAULT_ARCHIVE):
+    root = Path(archive_root)
+    return sorted(p.name for p in root.iterdir() if (p / "meta.json").exists()) if root.exists() else []
+
+
+def load_range(symbol: str, start: TimeLike = None, end: TimeLike = None,
+               archive_root: Union[str, Path] = DEFAULT_ARCHIVE) -> pd.DataFrame:
+    """Convenience: schema-shaped DataFrame for a date range."""
+    return open_archive(symbol, archive_root).to_frame(start, end)
+
+
+# ---------------------------
+# Synthetic demo data
+# ---------------------------
+def synthetic_minutes(symbol: str = "NIFTY", start: str = "2020-01-01", days: int = 250,
+                      base: float = 12000.0, seed: int = 7) -> pd.DataFrame:
+    """Weekday 09:15–15:29 one-minute bars in the schema layout."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=days)
+    minute = np.arange(375, dtype="timedelta64[m]")
+    stamps = (dates.values.astype("datetime64[m]")[:, None]
+              + np.timedelta64(9 * 60 + 15, "m") + minute[None, :]).ravel()
+    n = stamps.size
+    close = base * np.exp(np.cumsum(rng.normal(0, 0.0006, n)))
+    open_ = np.concatenate([[base], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.0004, n)) * close
+    oi_call = np.maximum(0, 5_000_000 + np.cumsum(rng.integers(-5000, 5000, n)))
+    oi_put = np.maximum(0, 5_000_000 + np.cumsum(rng.integers(-5000, 5000, n)))
+    return pd.DataFrame({
+        "symbol": symbol,
+        "datetime": stamps,
+        "open": open_.round(2),
+        "high": (np.maximum(open_, close) + spread).round(2),
+        "low": (np.minimum(open_, close) - spread).round(2),
+        "close": close.round(2),
+        "volume": rng.integers(1_000, 50_000, n),
+        "oi_call": oi_call,
+        "oi_put": oi_put,
+    })
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = Path(tmp) / "nifty.csv"
+        synthetic_minutes(days=20).to_csv(csv, index=False)
+        print("written:", convert_csv(csv, Path(tmp) / "archive"))
+        print("re-run (no new rows):", convert_csv(csv, Path(tmp) / "archive"))
+        series = open_archive("NIFTY", Path(tmp) / "archive")
+        part = series.to_frame("2020-01-03", "2020-01-04")
+        assert len(part) == 375 and part["datetime"].iloc[0] == pd.Timestamp("2020-01-03 09:15")
+        print("✅ archive OK:", len(series), "rows;", part.head(2).to_dict("records"))
@@ -5,19 +5,45 @@
 # FILE: Streamlit_TradingSystems/System_2_TradingTerminal/api/api_bridge.py
 # ==============================================================================
 
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Header, WebSocket, WebSocketDisconnect, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import uvicorn
 import json
 import time
-import random
 import asyncio
-from typing import Dict, Any, List
+import hmac
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+
+from shared.strategy_engine.data_cache_engine import get_market_store
+from shared.strategy_engine.data_feed_bridge import get_feed
+from shared.bar_aggregator import DEFAULT_MAX_BARS, get_bar_aggregator, TIMEFRAME_SECONDS
+from shared.basket_orders import MAX_LEGS, route_basket, summarize, validate_basket
+from shared.position_book import get_position_book
+from shared.strategy_engine.order_router import get_order_router
+from System_2_TradingTerminal.api.ws_hub import get_hub
+
+WATCH_SYMBOLS = ["NIFTY", "BANKNIFTY", "RELIANCE", "INFY", "TCS"]
 
 # ------------------------------------------------------------------------------
-# 🧠 Initialize app
+# 🧠 Initialize app (single tick producer → shared market store)
 # ------------------------------------------------------------------------------
-app = FastAPI(title="Trading Terminal Backend API", version="1.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    feed = get_feed()
+    get_hub().attach(feed, asyncio.get_running_loop())
+    get_bar_aggregator(feed)
+    feed.backfill(120)   # seed the store with history before the first request
+    feed.start()
+    yield
+    feed.stop()
+
+app = FastAPI(title="Trading Terminal Backend API", version="1.2.0", lifespan=lifespan)
 
 # Allow React frontend (localhost:8080)
 app.add_middleware(
@@ -29,18 +55,39 @@ app.add_middleware(
 )
 
 # ------------------------------------------------------------------------------
-# 📊 Helper: Mock Market Data (replace with real Fyers/FNO feed later)
+# 📊 Helper: Market Data (read-only view of the shared store)
 # ------------------------------------------------------------------------------
 def generate_market_data(symbol: str) -> Dict[str, Any]:
-    price = round(random.uniform(22000, 23000), 2)
-    change = round(random.uniform(-150, 150), 2)
-    return {
-        "symbol": symbol,
-        "price": price,
-        "change": change,
-        "percent": round((change / price) * 100, 2),
-        "timestamp": time.strftime("%H:%M:%S"),
-    }
+    quotes = get_market_store().quotes([symbol])
+    return quotes[0] if quotes else {"symbol": symbol, "price": 0.0, "change": 0.0,
+                                     "percent": 0.0, "timestamp": time.strftime("%H:%M:%S")}
+
+
+MAX_CACHED_RESPONSES = 256
+_RESPONSE_CACHE: Dict[Any, tuple] = OrderedDict()   # key -> (version, bytes), LRU
+_RESPONSE_LOCK = threading.Lock()
+
+def _cached_json(key, version: int, build) -> Response:
+    """Serve pre-encoded JSON; re-encode only when the store version moves."""
+    with _RESPONSE_LOCK:
+        hit = _RESPONSE_CACHE.get(key)
+        if hit is not None:
+            _RESPONSE_CACHE.move_to_end(key)
+    if hit is None or hit[0] != version:
+        hit = (version, json.dumps(build()).encode("utf-8"))
+        with _RESPONSE_LOCK:
+            _RESPONSE_CACHE[key] = hit
+            _RESPONSE_CACHE.move_to_end(key)
+            while len(_RESPONSE_CACHE) > MAX_CACHED_RESPONSES:
+                _RESPONSE_CACHE.popitem(last=False)
+    return Response(content=hit[1], media_type="application/json")
+
+def _bars_to_candles(bars) -> List[Dict[str, Any]]:
+    if not bars:
+        return []
+    cols = [bars[k].tolist() for k in ("time", "open", "high", "low", "close", "volume")]
+    return [{"time": t, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for t, o, h, l, c, v in zip(*cols)]
 
 # ------------------------------------------------------------------------------
 # 🧩 REST API Routes
@@ -51,17 +98,17 @@ def root():
 
 # ----- Market Summary -----
 @app.get("/api/market_summary")
-def market_summary() -> Dict[str, List[Dict[str, Any]]]:
-    symbols = ["NIFTY", "BANKNIFTY", "RELIANCE", "INFY", "TCS"]
-    data = [generate_market_data(sym) for sym in symbols]
-    return {"summary": data}
+def market_summary():
+    store = get_market_store()
+    return _cached_json("summary", store.version,
+                        lambda: {"summary": store.quotes(WATCH_SYMBOLS)})
 
 # ----- Watchlist -----
 @app.get("/api/get_watchlist")
-def get_watchlist() -> Dict[str, List[Dict[str, Any]]]:
-    symbols = ["NIFTY", "BANKNIFTY", "RELIANCE", "INFY", "TCS"]
-    data = [generate_market_data(sym) for sym in symbols]
-    return {"watchlist": data}
+def get_watchlist():
+    store = get_market_store()
+    return _cached_json("watchlist", store.version,
+                        lambda: {"watchlist": store.quotes(WATCH_SYMBOLS)})
 
 # ----- Positions -----
 @app.get("/api/get_positions")
@@ -81,38 +128,82 @@ def place_order(order: Dict[str, Any]):
         "timestamp": time.strftime("%H:%M:%S"),
     }
 
-# ----- Chart Data (mock candles) -----
+# ----- Basket / Multi-Leg Order (one round-trip for N legs) -----
+#   {"legs": [{symbol, side, qty, price, sl, target, order_type}, ...],
+#    "mode": "Paper"|"Real", "basket_id": "...", "all_or_none": false,
+#    "risk_limits": {...}, "capital": 0, "confirm": true}
+#   Real baskets are live orders: the server must set API_TOKEN, the request
+#   must carry it in X-API-Token and set "confirm": true.
+def _real_allowed(token: Optional[str]) -> bool:
+    expected = os.getenv("API_TOKEN")
+    return bool(expected) and token is not None and hmac.compare_digest(token, expected)
+
+@app.post("/api/place_basket")
+async def place_basket(basket: Dict[str, Any], x_api_token: Optional[str] = Header(None)):
+    legs = basket.get("legs") or []
+    if not isinstance(legs, list) or not legs or len(legs) > MAX_LEGS:
+        return {"status": "error", "message": f"basket needs 1..{MAX_LEGS} legs",
+                "timestamp": time.strftime("%H:%M:%S")}
+    basket_id = basket.get("basket_id") or f"basket-{uuid.uuid4().hex}"
+    mode = basket.get("mode", "Paper")
+    if mode == "Real" and not (_real_allowed(x_api_token) and basket.get("confirm") is True):
+        return JSONResponse({"status": "error", "message": 'Real baskets need a valid X-API-Token and "confirm": true',
+                             "timestamp": time.strftime("%H:%M:%S")}, status_code=403)
+    risk_limits = dict(basket.get("risk_limits") or {})
+    if risk_limits and "daily_loss" not in risk_limits:
+        risk_limits["daily_loss"] = get_position_book().daily_loss
+    ok, reasons, expected_loss, legs = validate_basket(legs, risk_limits, capital=basket.get("capital", 0.0),
+                                                       all_or_none=basket.get("all_or_none", False))
+    broker_url = os.getenv("BROKER_API_URL")
+    router = (get_order_router(base_url=broker_url, idempotent=os.getenv("BROKER_IDEMPOTENT") == "1")
+              if mode == "Real" and broker_url else None)
+    statuses = await route_basket(legs, ok, reasons, mode, router, basket_id)
+    return {
+        "status": "success" if ok.all() else ("partial" if ok.any() else "rejected"),
+        "basket_id": basket_id,
+        "summary": summarize(statuses),
+        "expected_loss": round(float(expected_loss[ok].sum()), 2),
+        "legs": statuses,
+        "timestamp": time.strftime("%H:%M:%S"),
+    }
+
+# ----- Chart Data (1m ring buffer; higher timeframes from the bar aggregator) -----
 @app.get("/api/chart_data")
-def chart_data(symbol: str = "NIFTY"):
-    candles = []
-    base_price = 22500
-    for i in range(30):
-        o = base_price + random.uniform(-100, 100)
-        c = o + random.uniform(-50, 50)
-        h = max(o, c) + random.uniform(10, 30)
-        l = min(o, c) - random.uniform(10, 30)
-        candles.append({"time": i, "open": o, "high": h, "low": l, "close": c})
-    return {"symbol": symbol, "data": candles}
+def chart_data(symbol: str = "NIFTY", bars: int = 30, tf: str = "1m"):
+    store = get_market_store()
+    if store.get_ring(symbol) is None:              # unknown symbols are answered, never cached
+        return {"symbol": symbol, "data": []}
+    if tf != "1m" and tf in TIMEFRAME_SECONDS:
+        bars = max(1, min(bars, DEFAULT_MAX_BARS))
+        agg = get_bar_aggregator()
+        return _cached_json(("chart", symbol, bars, tf), agg.version(symbol, tf),
+                            lambda: {"symbol": symbol, "timeframe": tf,
+                                     "data": _bars_to_candles(agg.last(symbol, tf, bars))})
+    ring = store.get_ring(symbol)
+    bars = max(1, min(bars, ring.capacity))
+    return _cached_json(("chart", symbol, bars), ring.version,
+                        lambda: {"symbol": symbol, "data": store.candles(symbol, bars)})
 
 # ------------------------------------------------------------------------------
-# 🔄 WebSocket (Live price stream)
+# 🔄 WebSocket (Live price stream — one hub fans out every tick)
+#   ?symbols=NIFTY,TCS&batch=1  (batch → one JSON array per tick) or send {"action": "subscribe"|"unsubscribe"|"set", "symbols": [...]}
 # ------------------------------------------------------------------------------
 @app.websocket("/ws/market")
-async def websocket_market(ws: WebSocket):
+async def websocket_market(ws: WebSocket, symbols: str = "", batch: bool = False):
     await ws.accept()
+    wanted = [s for s in symbols.split(",") if s]
     try:
-        while True:
-            packet = {
-                "symbol": "NIFTY",
-                "price": round(random.uniform(22000, 23000), 2),
-                "timestamp": time.strftime("%H:%M:%S"),
-            }
-            await ws.send_text(json.dumps(packet))
-            await asyncio.sleep(1)
+        await get_hub().serve(ws, wanted or None, batch)
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         print("WebSocket closed:", e)
         await ws.close()
 
+@app.get("/api/ws_stats")
+def ws_stats():
+    return get_hub().stats()
+
 # ------------------------------------------------------------------------------
 # 🚀 ENTRY POINT
 # ------------------------------------------------------------------------------
@@ -0,0 +1,181 @@
+# ==============================================================================
+# 📡 WS HUB — Phase 26.1 → Pub/Sub Fan-out for /ws/market
+# Encode each tick once, push to every subscriber through bounded queues
+# ==============================================================================
+# FILE: Streamlit_TradingSystems/System_2_TradingTerminal/api/ws_hub.py
+# ==============================================================================
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+import numpy as np
+
+DEFAULT_QUEUE_SIZE = 64          # pending symbols per client before drop-oldest
+LATENCY_WINDOW = 8192
+
+
+# ------------------------------------------------------------------------------
+# 👤 Subscriber: coalesce-latest per symbol, drop-oldest when full
+# ------------------------------------------------------------------------------
+class Subscriber:
+    __slots__ = ("ws", "symbols", "batch", "pending", "maxsize", "wake", "dropped", "coalesced", "task")
+
+    def __init__(self, ws, symbols: Optional[Iterable[str]] = None, maxsize: int = DEFAULT_QUEUE_SIZE,
+                 batch: bool = False):
+        self.ws = ws
+        self.batch = batch      # True → one JSON-array frame per wake-up
+        self.symbols: Optional[Set[str]] = set(symbols) if symbols else None   # None → all
+        self.pending: "OrderedDict[str, tuple]" = OrderedDict()
+        self.maxsize = maxsize
+        self.wake = asyncio.Event()
+        self.dropped = 0
+        self.coalesced = 0
+        self.task = None
+
+    def wants(self, symbol: str) -> bool:
+        return self.symbols is None or symbol in self.symbols
+
+    def offer(self, symbol: str, item: tuple):
+        """Queue a packet; a newer tick for the same symbol replaces the older one."""
+        if symbol in self.pending:
+            self.coalesced += 1
+            self.pending.move_to_end(symbol)
+        self.pending[symbol] = item
+        if len(self.pending) > self.maxsize:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+        self.wake.set()
+
+
+# ------------------------------------------------------------------------------
+# 🔀 Hub
+# ------------------------------------------------------------------------------
+class MarketHub:
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers: Set[Subscriber] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self._latency = np.zeros(LATENCY_WINDOW, dtype=np.float64)
+        self._lat_count = 0
+        self._attached = set()
+        self.universe: Set[str] = set()     # every symbol the attached feeds publish
+        self._closed_dropped = 0        # counters carried over from closed clients
+        self._closed_coalesced = 0
+
+    # ---------- wiring ----------
+    def attach(self, feed, loop: asyncio.AbstractEventLoop):
+        """Bind to the server loop and listen to the single tick producer."""
+        self.loop = loop
+        self.universe.update(getattr(feed, "symbols", ()))
+        if id(feed) not in self._attached:
+            feed.add_listener(self.publish)
+            self._attached.add(id(feed))
+
+    # ---------- producer side (feed thread) ----------
+    def publish(self, ticks, ts: float):
+        """Encode each symbol packet once, then hand the batch to the loop."""
+        if self.loop is None or not self.subscribers:
+            return
+        stamp = time.strftime("%H:%M:%S", time.localtime(ts))
+        encoded = [
+            (sym, json.dumps({"symbol": sym, "price": round(price, 2),
+                              "timestamp": stamp, "ts": ts}))
+            for sym, price, _vol in ticks
+        ]
+        self.loop.call_soon_threadsafe(self._fanout, encoded, time.perf_counter())
+
+    def _fanout(self, encoded, t_pub: float):
+        self.published += len(encoded)
+        for sub in self.subscribers:
+            for sym, text in encoded:
+                if sub.wants(sym):
+                    sub.offer(sym, (text, t_pub))
+
+    # ---------- consumer side ----------
+    async def _writer(self, sub: Subscriber):
+        while True:
+            await sub.wake.wait()
+            sub.wake.clear()
+            if sub.batch:
+                # join the already-encoded packets; no per-client json.dumps
+                items = list(sub.pending.values())
+                sub.pending.clear()
+                if items:
+                    await sub.ws.send_text("[" + ",".join(text for text, _ in items) + "]")
+                    self._record(time.perf_counter() - items[0][1])
+                continue
+            while sub.pending:
+                _sym, (text, t_pub) = sub.pending.popitem(last=False)
+                await sub.ws.send_text(text)
+                self._record(time.perf_counter() - t_pub)
+
+    def _record(self, seconds: float):
+        self._latency[self._lat_count % LATENCY_WINDOW] = seconds
+        self._lat_count += 1
+
+    async def serve(self, ws, symbols: Optional[Iterable[str]] = None, batch: bool = False):
+        """Run one WebSocket connection until it disconnects."""
+        sub = Subscriber(ws, symbols, self.queue_size, batch)
+        self.subscribers.add(sub)
+        sub.task = asyncio.create_task(self._writer(sub))
+        try:
+            while True:
+                text = await ws.receive_text()
+                try:
+                    msg = json.loads(text)
+                except ValueError:
+                    continue                    # malformed control frame: ignore, keep streaming
+                self._control(sub, msg)
+        finally:
+            self.subscribers.discard(sub)
+            self._closed_dropped += sub.dropped
+            self._closed_coalesced += sub.coalesced
+            sub.task.cancel()
+
+    def _control(self, sub: Subscriber, msg: Dict):
+        if not isinstance(msg, dict):
+            return
+        action = msg.get("action")
+        symbols = msg.get("symbols") or []
+        if not isinstance(symbols, list) or not all(isinstance(s, str) for s in symbols):
+            return
+        symbols = set(symbols)
+        if action == "subscribe":
+            # first explicit subscribe narrows the default "all symbols" stream
+            sub.symbols = (sub.symbols or set()) | symbols if symbols else None
+        elif action == "unsubscribe" and symbols:
+            # on the default stream, "all" becomes every feed symbol but these
+            sub.symbols = (self.universe if sub.symbols is None else sub.symbols) - symbols
+            for sym in symbols:
+                sub.pending.pop(sym, None)
+        elif action == "set":
+            sub.symbols = symbols or None
+
+    # ---------- metrics ----------
+    def stats(self) -> Dict:
+        n = min(self._lat_count, LATENCY_WINDOW)
+        lat = self._latency[:n] * 1000.0
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "delivered": self._lat_count,
+            "dropped": self._closed_dropped + sum(s.dropped for s in self.subscribers),
+            "coalesced": self._closed_coalesced + sum(s.coalesced for s in self.subscribers),
+            "fanout_ms_p50": round(float(np.percentile(lat, 50)), 3) if n else None,
+            "fanout_ms_p99": round(float(np.percentile(lat, 99)), 3) if n else None,
+            "fanout_ms_max": round(float(lat.max()), 3) if n else None,
+        }
+
+
+_HUB: Optional[MarketHub] = None
+
+
+def get_hub() -> MarketHub:
+    global _HUB
+    if _HUB is None:
+        _HUB = MarketHub()
+    return _HUB
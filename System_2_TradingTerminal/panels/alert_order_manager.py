@@ -14,6 +14,9 @@ import streamlit as st
 import datetime
 import random
 
+from shared.position_book import get_position_book
+from shared.trailing_stop_engine import get_trailing_stops
+
 # ---------------------------------------------
 # MOCK PRICE
 # ---------------------------------------------
@@ -35,7 +38,12 @@ def get_risk_params():
     }
     if "risk_params" not in st.session_state:
         st.session_state["risk_params"] = default_risk
-    return st.session_state["risk_params"]
+    risk = st.session_state["risk_params"]
+    # live margin / daily-loss guard from the position book (no trade-log parsing)
+    snap = get_position_book().snapshot(risk["capital"], risk.get("max_daily_loss", 10000))
+    risk["margin_used"] = snap["margin_used"]
+    risk["safe"] = snap["trade_allowed"]
+    return risk
 
 # ---------------------------------------------
 # RENDER TRADE LINES
@@ -68,6 +76,20 @@ def render_trade_lines():
     st.markdown("<div class='trade-line stop'><span class='line-label'>STOP LOSS</span></div>", unsafe_allow_html=True)
     st.markdown("<div class='trade-line target'><span class='line-label'>TARGET</span></div>", unsafe_allow_html=True)
 
+# ---------------------------------------------
+# TRAILING STOPS (streaming manager on the tick feed)
+# ---------------------------------------------
+def render_trailing_stops(mode, param):
+    manager = get_trailing_stops()
+    manager.sync_book(get_position_book(), mode, param)
+    stats = manager.stats()
+    latency = stats.get("update_us", {})
+    st.caption(f"🪜 Trailing {stats['positions']} position(s) | {stats['events']} stop moves | "
+               f"update p50 {latency.get('p50', 0)} µs · p99 {latency.get('p99', 0)} µs")
+    rows = manager.rows()
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
 # ---------------------------------------------
 # MAIN RENDER FUNCTION
 # ---------------------------------------------
@@ -109,6 +131,10 @@ def render():
     st.markdown("---")
     mode = st.radio("Trigger Mode", ["Price Cross", "HA Body Cross", "HA Body Touch"], horizontal=True)
     trail = st.selectbox("Trailing SL Mode", ["None", "Step %", "ATR", "Fixed %"], index=0)
+    if trail != "None":
+        label = "ATR Multiple" if trail == "ATR" else "Trail %"
+        trail_param = st.number_input(label, value=2.0 if trail == "ATR" else 1.0, step=0.1, format="%.2f")
+        render_trailing_stops(trail, trail_param)
     st.checkbox("Enable Sound Alert", value=True)
     st.checkbox("Popup Notification", value=True)
 
@@ -10,6 +10,11 @@ import numpy as np
 import uuid
 from datetime import datetime, timedelta
 
+from shared.bar_aggregator import merge_delta, start_live_bars, to_frame
+from shared.heikin_ashi import extend_frame, heikin_ashi_frame
+from shared.indicators.overlay import OVERLAY_COLORS, OVERLAY_NAMES, PRICE_OVERLAYS, compute_overlays
+from shared.strategy_engine.data_feed_bridge import feed_symbol
+
 # === GLOBAL SETTINGS ===
 DEFAULT_TIMEFRAMES = ["1m", "3m", "5m", "15m", "30m", "1h", "4h", "1D"]
 DEFAULT_CHART_TYPES = ["Candlestick", "Heikin Ashi", "Line", "Area"]
@@ -28,6 +33,7 @@ def _ensure_state(chart_id: str):
             "entry": None,
             "sl": None,
             "target": None,
+            "indicators": [],
         }
     st.session_state.setdefault(base + "::uid", str(uuid.uuid4())[:8])
     return base
@@ -50,15 +56,39 @@ def _generate_sample_data(n=150):
     return pd.DataFrame({"time": t, "open": o, "high": h, "low": l, "close": c})
 
 
+# === LIVE BARS (incremental multi-timeframe aggregator) ===
+@st.cache_resource
+def _live_bars():
+    """Start the process-wide feed once and return its bar aggregator."""
+    return start_live_bars(400)
+
+
+def _load_bars(base: str, meta: dict, n: int = 200):
+    """Cached frame per chart; only the bars changed since the last rerun are merged."""
+    agg = _live_bars()
+    sym, tf = feed_symbol(meta["symbol"]), meta["timeframe"]
+    if not agg.has(sym):
+        return _generate_sample_data(n)
+
+    key = base + "::bars"
+    cached = st.session_state.get(key)
+    if cached and cached["series"] == (sym, tf):
+        if cached["version"] == agg.version(sym, tf):
+            return cached["df"]
+        delta = agg.since(sym, tf, cached["version"])
+        df = merge_delta(cached["df"], delta, n)
+        df = extend_frame(cached["df"], df, delta["start"])     # HA for the changed tail only
+    else:
+        delta = agg.last(sym, tf, n)
+        df = heikin_ashi_frame(to_frame(delta))
+    st.session_state[key] = {"series": (sym, tf), "version": delta["version"], "df": df}
+    return df
+
+
 # === HEIKIN ASHI CONVERSION ===
 def _heikin_ashi(df):
-    ha_df = df.copy()
-    ha_df["HA_Close"] = (df["open"] + df["high"] + df["low"] + df["close"]) / 4
-    ha_df["HA_Open"] = (df["open"].shift(1) + df["close"].shift(1)) / 2
-    ha_df["HA_High"] = ha_df[["high", "HA_Open", "HA_Close"]].max(axis=1)
-    ha_df["HA_Low"] = ha_df[["low", "HA_Open", "HA_Close"]].min(axis=1)
-    ha_df.dropna(inplace=True)
-    return ha_df
+    # live frames already carry incrementally maintained HA columns
+    return df if "HA_Open" in df.columns else heikin_ashi_frame(df)
 
 
 # === PLOTLY CHART RENDERER ===
@@ -88,6 +118,17 @@ def _render_plot(meta, df):
         fig.add_trace(go.Scatter(x=df["time"], y=df["close"],
                                  fill="tozeroy", line=dict(color="#64b5f6"), name="Area"))
 
+    # === INDICATOR OVERLAYS (price pane) ===
+    for name, series in compute_overlays(df, meta.get("indicators") or []).items():
+        if name not in PRICE_OVERLAYS:
+            continue
+        for label, values in series.items():
+            fig.add_trace(go.Scatter(
+                x=df["time"], y=values, name=label,
+                mode="markers" if name == "PSAR" else "lines",
+                marker=dict(size=3), line=dict(color=OVERLAY_COLORS.get(name), width=1.2),
+            ))
+
     # === GLOBAL TRADE LINES ===
     for key, color in LINE_COLORS.items():
         val = meta.get(key)
@@ -116,11 +157,15 @@ def render_chart_unit(parent, chart_id: str, default_symbol: str = "NSE:NIFTY50"
     with parent:
         st.markdown(f"### {meta['symbol']} • {meta['timeframe']} • {meta['chart_type']}")
 
-        # Sample Data (Live feed later)
-        df = _generate_sample_data(200)
+        # Live bars (falls back to sample data for symbols the feed does not carry)
+        df = _load_bars(base, meta, 200)
 
         # Chart settings layout
         set_cols = st.columns([3, 1, 1])
+        with set_cols[0]:
+            meta["indicators"] = st.multiselect("Indicators", OVERLAY_NAMES,
+                                                default=meta.get("indicators") or [],
+                                                key=f"{base}::indicators")
         with set_cols[1]:
             meta["entry"] = st.number_input("Entry", 0.0, 30000.0, value=meta.get("entry") or 0.0, step=10.0)
         with set_cols[2]:
@@ -131,6 +176,13 @@ def render_chart_unit(parent, chart_id: str, default_symbol: str = "NSE:NIFTY50"
         fig = _render_plot(meta, df)
         st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
+        # Oscillators: latest values under the chart
+        oscillators = [n for n in meta["indicators"] if n not in PRICE_OVERLAYS]
+        if oscillators:
+            latest = {label: values[-1] for series in compute_overlays(df, oscillators).values()
+                      for label, values in series.items()}
+            st.caption(" | ".join(f"{k}: {v:.2f}" for k, v in latest.items()))
+
         st.caption(
             f"🟢 Entry: {meta.get('entry') or '—'} | 🔴 SL: {meta.get('sl') or '—'} | 🔵 Target: {meta.get('target') or '—'}  "
             f"• Crosshair: {'ON' if meta['crosshair'] else 'OFF'} | Wick: {'Shown' if meta['show_wick'] else 'Hidden'}"
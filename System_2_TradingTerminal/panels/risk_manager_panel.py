@@ -8,6 +8,7 @@
 # ==============================================================
 
 import streamlit as st
+from shared.position_book import get_position_book
 from shared.style_manager import animated_card
 
 # ==============================================================
@@ -101,6 +102,8 @@ def render_risk_manager():
     target_percent = st.session_state.get("target_percent", 1.5)
     rr_ratio = round(target_percent / sl_percent, 2)
     qty = int(100 * risk_percent / sl_percent)
+    capital = st.session_state.get("risk_params", {}).get("capital", 100000)
+    book = get_position_book().snapshot(capital)        # O(1): maintained on fills + ticks
 
     risk_html = f"""
     <div class="risk-panel fade-in">
@@ -121,7 +124,9 @@ def render_risk_manager():
             <button class="risk-button">Auto Calculate</button>
             <div class="risk-summary">
                 <b>R:R Ratio:</b> {rr_ratio} <br/>
-                <b>Suggested Qty:</b> {qty}
+                <b>Suggested Qty:</b> {qty} <br/>
+                <b>Open:</b> {book['open_positions']} | <b>Exposure:</b> {book['exposure_pct']}% <br/>
+                <b>Day P&amp;L:</b> ₹ {book['daily_pnl']:,} (U: {book['unrealized']:,})
             </div>
         </div>
     </div>
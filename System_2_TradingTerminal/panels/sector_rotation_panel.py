@@ -9,38 +9,26 @@
 # - Bridge log in session_state["bridge_sync"]
 # ===============================================================
 
-import streamlit as st, pandas as pd, numpy as np, random, datetime, time, json
+import streamlit as st, numpy as np, datetime, time, json
 import plotly.graph_objects as go
 from pathlib import Path
 
+from shared.bar_aggregator import start_live_bars
+from shared.sector_engine import BIAS_LABELS, bias_flips, get_sector_engine
+
 LAYOUT_PATH = Path("Streamlit_TradingSystems/shared/layout_tokens.py")
 
 # ---------------------------------------------------------------
-# 🧮 Generate Mock Sector Data
+# 🧮 Sector Data (constituent RSI / trend via shared.sector_engine)
 # ---------------------------------------------------------------
-def generate_mock_sector_data():
-    sectors = [
-        "NIFTY BANK", "NIFTY AUTO", "NIFTY IT",
-        "NIFTY METAL", "NIFTY FMCG", "NIFTY PHARMA"
-    ]
-    data = []
-    for s in sectors:
-        sc = random.randint(0, 100)
-        bias = (
-            "Strong Bull" if sc >= 75 else
-            "Bull" if sc >= 60 else
-            "Neutral" if 45 <= sc <= 55 else
-            "Bear" if sc >= 25 else "Strong Bear"
-        )
-        forecast = sc + random.randint(-10, 10)
-        data.append({
-            "Sector": s,
-            "BiasScore": sc,
-            "Bias": bias,
-            "ForecastScore": max(0, min(100, forecast)),
-            "Heat": round(random.uniform(-2, 2), 2)
-        })
-    return pd.DataFrame(data)
+@st.cache_resource
+def _sector_engine():
+    start_live_bars(400)
+    return get_sector_engine()
+
+def load_sector_data(universe="Nifty F&O", timeframe="15m", rsi_period=14):
+    # cached per (universe, tf, rsi_period) inside the engine; copy so the dashboard can add columns
+    return _sector_engine().snapshot(universe, timeframe, rsi_period).copy()
 
 # ---------------------------------------------------------------
 # 💾 Presets (save / load)
@@ -61,18 +49,13 @@ def load_presets():
 # 🔔 Detect Bias Changes + Bridge Sync
 # ---------------------------------------------------------------
 def detect_bias_changes(df):
-    if "prev_bias" not in st.session_state:
-        st.session_state["prev_bias"] = {r["Sector"]: r["Bias"] for _, r in df.iterrows()}
+    sectors, codes = df["Sector"].to_numpy(), df["BiasCode"].to_numpy()
+    prev = st.session_state.get("prev_bias")
+    st.session_state["prev_bias"] = (sectors, codes)
+    if prev is None or not np.array_equal(prev[0], sectors):
         return []
-    prev = st.session_state["prev_bias"]
-    changes = []
-    for _, r in df.iterrows():
-        s, b = r["Sector"], r["Bias"]
-        if s in prev and prev[s] != b:
-            changes.append((s, prev[s], b))
-            prev[s] = b
-    st.session_state["prev_bias"] = prev
-    return changes
+    idx = bias_flips(prev[1], codes)
+    return list(zip(sectors[idx], BIAS_LABELS[prev[1][idx]], BIAS_LABELS[codes[idx]]))
 
 def bridge_sync(event_type, symbol, sector, bias, extra=None):
     if "bridge_sync" not in st.session_state:
@@ -153,18 +136,20 @@ def render_sector_rotation_panel():
             st.info(f"Loaded Preset → {sel}")
     with c7:
         if st.button("📷 Export CSV"):
-            csv = generate_mock_sector_data().to_csv(index=False)
+            csv = load_sector_data(uni, tf, rsi).drop(columns="BiasCode").to_csv(index=False)
             st.download_button("Download CSV", data=csv, file_name="sector_snapshot.csv")
 
     st.divider()
 
-    # — Auto Refresh —
-    if ref != "Off":
-        sec = int(ref.split()[0])
-        if "last_refresh" not in st.session_state or time.time() - st.session_state["last_refresh"] > sec:
-            st.session_state["last_refresh"] = time.time()
-            st.session_state["data"] = generate_mock_sector_data()
-    df = st.session_state.get("data", generate_mock_sector_data())
+    # — Auto Refresh (sector scores are recomputed only after a constituent bar closes) —
+    sec = None if ref == "Off" else int(ref.split()[0])
+    stale = (st.session_state.get("sector_key") != (uni, tf, rsi) or "sector_data" not in st.session_state
+             or (sec is not None and time.time() - st.session_state.get("last_refresh", 0) > sec))
+    if stale:
+        st.session_state["sector_data"] = load_sector_data(uni, tf, rsi)
+        st.session_state["sector_key"] = (uni, tf, rsi)
+        st.session_state["last_refresh"] = time.time()
+    df = st.session_state["sector_data"].copy()
 
     # — Bias Changes —
     for s, old, new in detect_bias_changes(df):
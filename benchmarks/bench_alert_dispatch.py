@@ -0,0 +1,58 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_alert_dispatch.py
+# 🔹 BENCHMARK — render-path cost of webhook alerts: sync post vs enqueue
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_alert_dispatch --alerts 200 --delay 0.05
+# ==============================================================
+
+import argparse
+import time
+
+import requests
+
+from benchmarks.stub_webhook import StubWebhook
+from shared.alert_dispatcher import AlertDispatcher
+
+
+def _alert(i):
+    return {"timestamp": "", "event": "cross", "symbol": f"SYM{i % 50:03d}", "line": "entry", "price": 100.0 + i}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.05, help="webhook response time (s)")
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StubWebhook(delay=args.delay, fail_rate=args.fail_rate) as stub:
+        # legacy: requests.post inside the render loop
+        n_sync = max(1, args.alerts // 10)
+        t0 = time.perf_counter()
+        for i in range(n_sync):
+            try:
+                requests.post(stub.url, json=_alert(i), timeout=3)
+            except Exception:
+                pass
+        sync_ms = (time.perf_counter() - t0) * 1000 / n_sync
+        sync_requests = stub.stats()["requests"]
+
+        disp = AlertDispatcher(stub.url, batch_window=0.1, backoff=0.05)
+        t0 = time.perf_counter()
+        for i in range(args.alerts):
+            disp.enqueue(_alert(i))
+        enqueue_us = (time.perf_counter() - t0) * 1e6 / args.alerts
+        t1 = time.perf_counter()
+        disp.flush(60)
+        drain_s = time.perf_counter() - t1
+        disp.stop()
+        stats = disp.stats()
+
+    print(f"webhook delay {args.delay * 1000:.0f} ms, fail rate {args.fail_rate:.0%}")
+    print(f"sync requests.post : {sync_ms:8.2f} ms blocked per alert (render thread)")
+    print(f"dispatcher enqueue : {enqueue_us / 1000:8.4f} ms blocked per alert ({enqueue_us:.1f} µs)")
+    print(f"delivery           : {stats['delivered']}/{args.alerts} alerts in {stats['batches']} batches, "
+          f"{stub.stats()['requests'] - sync_requests} HTTP requests, {stats['retries']} retries, "
+          f"drained in {drain_s:.2f} s")
+    print(f"latency (enqueue → delivered): {stats.get('latency_ms')}")
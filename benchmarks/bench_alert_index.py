@@ -0,0 +1,102 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_alert_index.py
+# 🔹 BENCHMARK — indexed alerts vs per-line checks (100k alerts / 500 symbols)
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_alert_index --alerts 100000 --symbols 500
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from shared.alert_index import AlertIndex
+
+
+def _legacy_round(books, bars):
+    """Per-line scalar checks, same expressions as alert_logic.check_ha_body_* (Lenient)."""
+    hits = 0
+    for sym, levels in books.items():
+        pc, o, h, l, c = bars[sym]
+        for lv in levels:
+            crossed = (pc < lv and (o > lv or c > lv)) or (pc > lv and (o < lv or c < lv))
+            touched = o <= lv <= c or c <= lv <= o
+            hits += crossed or touched
+    return hits
+
+
+def _linear_round(arrays, ids, bars):
+    """Vectorised full scan of every level (no index), materialising hit ids."""
+    hits = 0
+    for sym, levels in arrays.items():
+        pc, o, h, l, c = bars[sym]
+        crossed = ((pc < levels) & ((o > levels) | (c > levels))) | ((pc > levels) & ((o < levels) | (c < levels)))
+        touched = ((o <= levels) & (levels <= c)) | ((c <= levels) & (levels <= o))
+        hits += len(ids[sym][crossed | touched].tolist())
+    return hits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", type=int, default=100_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    base = dict(zip(symbols, rng.uniform(100, 5000, args.symbols)))
+    per = args.alerts // args.symbols
+
+    idx = AlertIndex()
+    t0 = time.perf_counter()
+    books = {}
+    for sym in symbols:
+        levels = base[sym] * (1 + rng.uniform(-0.05, 0.05, per))
+        books[sym] = levels.tolist()
+        idx.add_many(sym, books[sym], "level")
+    for sym in symbols:
+        idx._book(sym)                                            # one sort per symbol
+    build_ms = (time.perf_counter() - t0) * 1000
+    arrays = {s: np.asarray(v) for s, v in books.items()}
+    ids = {s: np.arange(len(v)) for s, v in books.items()}
+
+    def _bars():
+        out = {}
+        for sym in symbols:
+            pc = base[sym] * (1 + rng.normal(0, 0.002))
+            o, c = pc * (1 + rng.normal(0, 0.001)), pc * (1 + rng.normal(0, 0.003))
+            out[sym] = (pc, o, max(o, c) * 1.001, min(o, c) * 0.999, c)
+        return out
+
+    rounds = [_bars() for _ in range(args.rounds)]
+
+    t0 = time.perf_counter()
+    idx_hits = sum(sum(len(h) for h in idx.evaluate_bars(b, True, "Lenient").values()) for b in rounds)
+    idx_ms = (time.perf_counter() - t0) * 1000 / args.rounds
+
+    t0 = time.perf_counter()
+    for b in rounds:
+        for sym, (pc, o, h, l, c) in b.items():
+            idx.on_tick(sym, pc, c)
+    tick_us = (time.perf_counter() - t0) * 1e6 / (args.rounds * len(symbols))
+
+    t0 = time.perf_counter()
+    lin_hits = sum(_linear_round(arrays, ids, b) for b in rounds)
+    lin_ms = (time.perf_counter() - t0) * 1000 / args.rounds
+
+    k = max(1, args.rounds // 10)
+    t0 = time.perf_counter()
+    for b in rounds[:k]:
+        _legacy_round(books, b)
+    leg_ms = (time.perf_counter() - t0) * 1000 / k
+
+    assert idx_hits == lin_hits, (idx_hits, lin_hits)
+    print(f"{args.alerts:,} alerts × {len(symbols)} symbols ({per}/symbol); build {build_ms:.0f} ms")
+    print(f"{'path':28s} {'ms / round':>12s} {'µs / symbol':>12s}")
+    for name, ms in (("per-line scalar checks", leg_ms), ("vectorised linear scan", lin_ms),
+                     ("sorted index (HA, Lenient)", idx_ms)):
+        print(f"{name:28s} {ms:12.2f} {1000 * ms / len(symbols):12.2f}")
+    print(f"{'sorted index tick path':28s} {'':12s} {tick_us:12.2f}")
+    print(f"hits/round: {idx_hits / args.rounds:.0f}")
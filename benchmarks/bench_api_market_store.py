@@ -0,0 +1,115 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_api_market_store.py
+# 🔹 BENCHMARK — REST throughput: per-request generation vs MarketStore
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_api_market_store --clients 128 --seconds 5
+# ==============================================================
+
+import argparse
+import http.client
+import random
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI
+
+LEGACY_TARGET = "benchmarks.bench_api_market_store:legacy_app"
+STORE_TARGET = "System_2_TradingTerminal.api.api_bridge:app"
+ROUTES = ["/api/market_summary", "/api/get_watchlist", "/api/chart_data?symbol=NIFTY"]
+
+
+# --------------------------------------------------------------
+# 🧱 LEGACY APP (pre-store behaviour, kept here for comparison)
+# --------------------------------------------------------------
+def _legacy_app() -> FastAPI:
+    app = FastAPI()
+    symbols = ["NIFTY", "BANKNIFTY", "RELIANCE", "INFY", "TCS"]
+
+    def generate_market_data(symbol):
+        price = round(random.uniform(22000, 23000), 2)
+        change = round(random.uniform(-150, 150), 2)
+        return {"symbol": symbol, "price": price, "change": change,
+                "percent": round((change / price) * 100, 2),
+                "timestamp": time.strftime("%H:%M:%S")}
+
+    @app.get("/api/market_summary")
+    def market_summary():
+        return {"summary": [generate_market_data(s) for s in symbols]}
+
+    @app.get("/api/get_watchlist")
+    def get_watchlist():
+        return {"watchlist": [generate_market_data(s) for s in symbols]}
+
+    @app.get("/api/chart_data")
+    def chart_data(symbol: str = "NIFTY"):
+        candles = []
+        for i in range(30):
+            o = 22500 + random.uniform(-100, 100)
+            c = o + random.uniform(-50, 50)
+            h = max(o, c) + random.uniform(10, 30)
+            l = min(o, c) - random.uniform(10, 30)
+            candles.append({"time": i, "open": o, "high": h, "low": l, "close": c})
+        return {"symbol": symbol, "data": candles}
+
+    return app
+
+
+legacy_app = _legacy_app()
+
+
+# --------------------------------------------------------------
+# 🚀 HARNESS (server in its own process, clients here)
+# --------------------------------------------------------------
+def _serve(target, port):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", target, "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "error"])
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"server on :{port} did not start")
+
+
+def _client(port, deadline):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    done = 0
+    while time.perf_counter() < deadline:
+        conn.request("GET", ROUTES[done % len(ROUTES)])
+        conn.getresponse().read()
+        done += 1
+    conn.close()
+    return done
+
+
+def run(target, port, clients, seconds):
+    proc = _serve(target, port)
+    try:
+        time.sleep(0.5)      # let the store feed its first batch
+        deadline = time.perf_counter() + seconds
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            total = sum(pool.map(lambda _: _client(port, deadline), range(clients)))
+        return total / seconds
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=128)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    before = run(LEGACY_TARGET, 9101, args.clients, args.seconds)
+    after = run(STORE_TARGET, 9102, args.clients, args.seconds)
+    print(f"clients={args.clients}  seconds={args.seconds}")
+    print(f"before (per-request generation): {before:10.1f} req/s")
+    print(f"after  (shared MarketStore)    : {after:10.1f} req/s  ({after / before:.2f}x)")
@@ -0,0 +1,100 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_backtest.py
+# 🔹 BENCHMARK — vectorised backtest bars/sec vs a per-bar Python loop
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_backtest --years 5
+# Synthetic 1-minute NIFTY bars (375 per session). The loop is a plain
+# bar-by-bar implementation of the same rules, run on the first year to
+# check the trade list matches and to extrapolate its speed.
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from shared.charges_engine import charges
+from System_1_Nifty_OI.backtest.backtest_engine import DEFAULT_PARAMS, TRIGGERS, prepare, run_backtest
+from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars, hhmm
+from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+
+def loop_backtest(bars, p):
+    """Reference: Price Cross BUY, fixed qty, one trade per session."""
+    t = bars["time"].tolist()
+    o, h, l, c = (bars[k].tolist() for k in ("open", "high", "low", "close"))
+    last_entry = hhmm(p["last_entry"])
+    trades, ref, pos, day = [], None, None, None
+    line = sl = tgt = None
+    done = False
+    for i in range(len(t)):
+        d = t[i] // 86400
+        if d != day:
+            if pos is not None:                                  # square off at the previous close
+                trades.append((pos[0], i - 1, c[i - 1]))
+                pos = None
+            ref = c[i - 1] if i else None
+            day, done = d, False
+            if ref is not None:
+                line = ref * (1 + p["entry_pct"] / 100)
+                sl, tgt = line * (1 - p["sl_pct"] / 100), line * (1 + p["target_pct"] / 100)
+        if ref is None:
+            continue
+        if pos is not None:
+            if l[i] <= sl:
+                trades.append((pos[0], i, o[i] if o[i] < sl else sl))
+                pos = None
+            elif h[i] >= tgt:
+                trades.append((pos[0], i, o[i] if o[i] > tgt else tgt))
+                pos = None
+        elif not done and i and c[i - 1] < line < c[i] and (t[i] % 86400) // 60 <= last_entry \
+                and i + 1 < len(t) and t[i + 1] // 86400 == d:
+            pos, done = (i,), True
+    if pos is not None:
+        trades.append((pos[0], len(t) - 1, c[-1]))
+    entry = np.array([c[i] for i, _, _ in trades])
+    exit_ = np.array([x for _, _, x in trades])
+    qty = np.full(entry.size, float(p["qty"]))
+    net = qty * (exit_ - entry) - charges(qty, entry, True) - charges(qty, exit_, False)
+    return np.array([i for i, _, _ in trades]), net
+
+
+def _best(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    bars = frame_to_bars(synthetic_minutes("NIFTY", start="2019-01-01", days=250 * args.years))
+    n = bars["close"].size
+
+    prep_s, ctx = _best(lambda: prepare(bars))
+    run_s, res = _best(lambda: run_backtest(ctx))
+    total_s, _ = _best(lambda: run_backtest(bars))
+    trig_s = {tr: _best(lambda: run_backtest(ctx, trigger=tr, side="SELL", min_pcr=0.95))[0] for tr in TRIGGERS}
+
+    year = {k: v[:250 * 375] for k, v in bars.items()}
+    t0 = time.perf_counter()
+    ref_entries, ref_net = loop_backtest(year, DEFAULT_PARAMS)
+    loop_s = (time.perf_counter() - t0) * n / year["close"].size
+    vec = run_backtest(year)["trades"]
+    same = np.array_equal(np.searchsorted(year["time"], vec["entry_time"]), ref_entries)
+    diff = np.abs(vec["net"] - ref_net).max() if same else float("nan")
+
+    print(f"{n:,} one-minute bars ({args.years} years), {res['stats']['trades']} trades")
+    print(f"prepare()               : {prep_s * 1000:8.1f} ms")
+    print(f"run_backtest(prepared)  : {run_s * 1000:8.1f} ms  → {n / run_s / 1e6:6.1f} M bars/s")
+    print(f"run_backtest(raw bars)  : {total_s * 1000:8.1f} ms  → {n / total_s / 1e6:6.1f} M bars/s")
+    for tr, s in trig_s.items():
+        print(f"  SELL {tr:<15}   : {s * 1000:8.1f} ms")
+    print(f"per-bar Python loop     : {loop_s * 1000:8.1f} ms  → {loop_s / run_s:6.1f}x slower (extrapolated from 1 year)")
+    print(f"parity vs loop (1 year) : entries match={same}, max |Δ net| {diff:.6f}")
@@ -0,0 +1,68 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_charges.py
+# 🔹 BENCHMARK — per-trade calculate_charges loop vs vectorised charges()
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_charges --fills 1000000
+# The loop is the original scalar calculate_charges body (risk_engine
+# imports streamlit, so it is reproduced here); results are compared
+# fill by fill on the EQ_INTRADAY schedule.
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from shared.charges_engine import SEGMENTS, charges
+
+
+def legacy_charges(qty, price, side="BUY"):
+    turnover = qty * price
+    brokerage = min(20, 0.0003 * turnover)
+    stt = 0.00025 * turnover
+    exchange_fee = 0.0000345 * turnover
+    gst = 0.18 * (brokerage + exchange_fee)
+    stamp = 0.00015 * turnover if side == "BUY" else 0
+    slippage = 0.0005 * turnover
+    total = brokerage + stt + exchange_fee + gst + stamp + slippage
+    return round(total, 2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fills", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    qty = rng.integers(1, 500, args.fills)
+    price = np.round(rng.uniform(50, 25000, args.fills), 2)
+    side = np.where(rng.random(args.fills) < 0.5, "BUY", "SELL")
+
+    n_loop = min(args.fills, 200_000)
+    q_list, p_list, s_list = qty[:n_loop].tolist(), price[:n_loop].tolist(), side[:n_loop].tolist()
+    t0 = time.perf_counter()
+    loop = [legacy_charges(q, p, s) for q, p, s in zip(q_list, p_list, s_list)]
+    loop_s = (time.perf_counter() - t0) * args.fills / n_loop
+
+    t0 = time.perf_counter()
+    vec = charges(qty, price, side)
+    vec_s = time.perf_counter() - t0
+
+    is_buy = side == "BUY"
+    t0 = time.perf_counter()
+    charges(qty, price, is_buy)
+    vec_bool_s = time.perf_counter() - t0
+
+    seg = rng.integers(0, len(SEGMENTS), args.fills)
+    t0 = time.perf_counter()
+    charges(qty, price, is_buy, seg)
+    mixed_s = time.perf_counter() - t0
+
+    diff = np.abs(vec[:n_loop] - np.array(loop))
+    print(f"{args.fills:,} fills")
+    print(f"per-trade loop        : {loop_s:8.3f} s  (extrapolated from {n_loop:,})")
+    print(f"charges(), str sides  : {vec_s:8.3f} s  → {loop_s / vec_s:5.1f}x")
+    print(f"charges(), bool sides : {vec_bool_s:8.3f} s  → {loop_s / vec_bool_s:5.1f}x")
+    print(f"charges(), 4 segments : {mixed_s:8.3f} s")
+    print(f"parity vs loop        : max |Δ| {diff.max():.4f}, {int((diff > 0).sum())} fills differ in the last paisa")
@@ -0,0 +1,43 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_event_backtest.py
+# 🔹 BENCHMARK — event-driven backtest throughput (events / minute)
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_event_backtest --years 1
+# Synthetic 1-minute NIFTY bars replayed as 4 ticks per bar through the
+# live paper path (bar aggregator → alerts → risk check → matcher → book).
+# The vectorised run on the same bars is shown for comparison: same
+# entry sessions, different fills (next tick + intrabar SL / target).
+# ==============================================================
+
+import argparse
+import time
+
+from System_1_Nifty_OI.backtest.backtest_engine import run_backtest
+from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars
+from System_1_Nifty_OI.backtest.event_backtest import run_event_backtest
+from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--trigger", default="HA Body Cross")
+    args = parser.parse_args()
+
+    bars = frame_to_bars(synthetic_minutes("NIFTY", start="2019-01-01", days=250 * args.years))
+    n = bars["close"].size
+    print(f"{n:,} one-minute bars ({args.years} year(s)), trigger {args.trigger}")
+
+    for label, kw in (("ideal fills", {"latency_ms": 0.0, "slippage_bps": 0.0}),
+                      ("live paper", {})):
+        t0 = time.perf_counter()
+        res = run_event_backtest(bars, trigger=args.trigger, **kw)
+        dt = time.perf_counter() - t0
+        s = res["stats"]
+        print(f"event-driven, {label:<14}: {dt:6.2f} s | {s['events']:,} events → "
+              f"{s['events'] / dt * 60 / 1e6:5.1f} M events/min | {s['trades']} trades, net {s['net_pnl']:,.0f}")
+
+    t0 = time.perf_counter()
+    vec = run_backtest(bars, trigger=args.trigger)
+    dt = time.perf_counter() - t0
+    print(f"vectorised                 : {dt:6.2f} s | {vec['stats']['trades']} trades, net {vec['stats']['net_pnl']:,.0f}")
@@ -0,0 +1,66 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_heikin_ashi.py
+# 🔹 BENCHMARK — legacy pandas HA vs shared batch / streaming engine
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_heikin_ashi --bars 1000000
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from shared.heikin_ashi import HeikinAshiState, heikin_ashi, heikin_ashi_frame
+
+
+def legacy_heikin_ashi(df):
+    """Pre-engine implementation (alert_logic / chart_unit), kept for comparison."""
+    ha_df = df.copy()
+    ha_df["HA_Close"] = (df["open"] + df["high"] + df["low"] + df["close"]) / 4
+    ha_df["HA_Open"] = (df["open"].shift(1) + df["close"].shift(1)) / 2
+    ha_df["HA_High"] = ha_df[["high", "HA_Open", "HA_Close"]].max(axis=1)
+    ha_df["HA_Low"] = ha_df[["low", "HA_Open", "HA_Close"]].min(axis=1)
+    ha_df.dropna(inplace=True)
+    return ha_df
+
+
+def _best(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    n = args.bars
+    c = 22000 + np.cumsum(rng.standard_normal(n))
+    o = np.concatenate([[22000.0], c[:-1]])
+    h = np.maximum(o, c) + rng.random(n) * 5
+    l = np.minimum(o, c) - rng.random(n) * 5
+    df = pd.DataFrame({"open": o, "high": h, "low": l, "close": c})
+
+    t_legacy = _best(lambda: legacy_heikin_ashi(df))
+    t_frame = _best(lambda: heikin_ashi_frame(df))
+    t_arrays = _best(lambda: heikin_ashi(o, h, l, c))
+
+    state = HeikinAshiState()
+    k = min(n, 200_000)
+    t0 = time.perf_counter()
+    for bar in zip(o[:k].tolist(), h[:k].tolist(), l[:k].tolist(), c[:k].tolist()):
+        state.update(*bar)
+    t_stream = (time.perf_counter() - t0) / k
+
+    print(f"bars={n:,}")
+    print(f"legacy pandas (non-recursive)  : {t_legacy * 1000:8.1f} ms")
+    print(f"heikin_ashi_frame (recursive)  : {t_frame * 1000:8.1f} ms  ({t_legacy / t_frame:.1f}x)")
+    print(f"heikin_ashi arrays (recursive) : {t_arrays * 1000:8.1f} ms  ({t_legacy / t_arrays:.1f}x)")
+    print(f"HeikinAshiState.update         : {t_stream * 1e9:8.0f} ns/bar")
@@ -0,0 +1,65 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_indicators.py
+# 🔹 BENCHMARK — batch (bars/s) vs streaming (updates/s) indicators
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_indicators --bars 1000000
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from shared.indicators import batch, streaming
+
+
+def _rate(fn, count):
+    t0 = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--stream-bars", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    n = args.bars
+    c = 22000 + np.cumsum(rng.standard_normal(n) * 5)
+    o = np.concatenate([[22000.0], c[:-1]])
+    h = np.maximum(o, c) + rng.random(n) * 8
+    l = np.minimum(o, c) - rng.random(n) * 8
+    v = rng.integers(100, 5000, n).astype(float)
+    sess = batch.session_ids(1_700_000_000 + np.arange(n) * 60)
+
+    k = min(n, args.stream_bars)
+    cl, hl, ll, vl, sl = c[:k].tolist(), h[:k].tolist(), l[:k].tolist(), v[:k].tolist(), sess[:k].tolist()
+
+    cases = [
+        ("SMA 200", lambda: batch.sma(c, 200),
+         lambda: [s.update(x) for s in [streaming.SMA(200)] for x in cl]),
+        ("EMA 21", lambda: batch.ema(c, 21),
+         lambda: [s.update(x) for s in [streaming.EMA(21)] for x in cl]),
+        ("RSI 14", lambda: batch.rsi(c, 14),
+         lambda: [s.update(x) for s in [streaming.RSI(14)] for x in cl]),
+        ("MACD", lambda: batch.macd(c),
+         lambda: [s.update(x) for s in [streaming.MACD()] for x in cl]),
+        ("ATR 14", lambda: batch.atr(h, l, c, 14),
+         lambda: [s.update(a, b, x) for s in [streaming.ATR(14)] for a, b, x in zip(hl, ll, cl)]),
+        ("ADX 14", lambda: batch.adx(h, l, c, 14),
+         lambda: [s.update(a, b, x) for s in [streaming.ADX(14)] for a, b, x in zip(hl, ll, cl)]),
+        ("PSAR", lambda: batch.psar(h, l, c),
+         lambda: [s.update(a, b, x) for s in [streaming.PSAR()] for a, b, x in zip(hl, ll, cl)]),
+        ("VWAP", lambda: batch.vwap(h, l, c, v, sess),
+         lambda: [s.update(a, b, x, vo, se) for s in [streaming.VWAP()]
+                  for a, b, x, vo, se in zip(hl, ll, cl, vl, sl)]),
+    ]
+
+    print(f"{'indicator':10s} {'batch bars/s':>16s} {'stream updates/s':>18s} {'stream µs/bar':>14s}")
+    for name, batch_fn, stream_fn in cases:
+        b = _rate(batch_fn, n)
+        s = _rate(stream_fn, k)
+        print(f"{name:10s} {b:16,.0f} {s:18,.0f} {1e6 / s:14.2f}")
@@ -0,0 +1,61 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_mmap_archive.py
+# 🔹 BENCHMARK — CSV parse vs memmap open + date-range slice
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_mmap_archive --years 3
+# ==============================================================
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from System_1_Nifty_OI.data_loader import convert_csv, open_archive, synthetic_minutes
+
+
+def _timeit(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--slice-start", default="2021-03-01")
+    parser.add_argument("--slice-end", default="2021-04-01")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv = tmp / "nifty_1m.csv"
+        df = synthetic_minutes("NIFTY", start="2020-01-01", days=250 * args.years)
+        df.to_csv(csv, index=False)
+        print(f"rows={len(df):,}  csv={csv.stat().st_size / 1e6:.1f} MB")
+
+        t0 = time.perf_counter()
+        convert_csv(csv, tmp / "archive")
+        print(f"one-off conversion      : {time.perf_counter() - t0:8.3f} s")
+
+        def csv_path():
+            frame = pd.read_csv(csv, parse_dates=["datetime"])
+            mask = (frame["datetime"] >= args.slice_start) & (frame["datetime"] < args.slice_end)
+            return frame.loc[mask, "close"].to_numpy()
+
+        def mmap_path():
+            series = open_archive("NIFTY", tmp / "archive")
+            return np.asarray(series.slice(args.slice_start, args.slice_end)["close"])
+
+        t_csv, a = _timeit(csv_path)
+        t_mm, b = _timeit(mmap_path, repeat=20)
+        assert np.array_equal(a, b)
+        print(f"CSV parse + filter      : {t_csv * 1000:8.1f} ms")
+        print(f"mmap open + slice       : {t_mm * 1000:8.3f} ms  ({t_csv / t_mm:,.0f}x faster, "
+              f"{len(b):,} rows in range)")
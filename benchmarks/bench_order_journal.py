@@ -0,0 +1,67 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_order_journal.py
+# 🔹 BENCHMARK — order journal restore time for a full trading day
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_order_journal --orders 25000
+# Writes a day of lifecycle events (submitted → acked → partial fills →
+# filled, with rejects / cancels and a tail of in-flight orders), then
+# times a cold restore with snapshots vs replaying the whole log.
+# ==============================================================
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+
+from shared.state_engine.snapshot_engine import OrderJournal
+
+
+def write_day(root, orders, snapshot_every, rnd):
+    j = OrderJournal(root, fsync=False, snapshot_every=snapshot_every)
+    ts = 1_700_000_000.0
+    live = []
+    t0 = time.perf_counter()
+    for i in range(orders):
+        key = f"ord-{i:06d}"
+        qty = rnd.choice((25, 50, 75, 100, 500))
+        j.record(key, "submitted", ts, symbol=f"NSE:SYM{i % 300:03d}-EQ", side=rnd.choice(("BUY", "SELL")),
+                 qty=qty, price=round(rnd.uniform(100, 5000), 2), mode="Real")
+        live.append((key, qty))
+        # advance an older order each step so lifecycles interleave; ~200 stay in flight
+        for _ in range(max(0, len(live) - 200)):
+            k, q = live.pop(rnd.randrange(len(live)))
+            r = rnd.random()
+            if r < 0.05:
+                j.record(k, "rejected", ts, reason="RMS")
+                continue
+            j.record(k, "acked", ts, broker_id=f"FB{i:08d}")
+            if r < 0.10:
+                j.record(k, "cancelled", ts)
+                continue
+            part = q // 2
+            j.record(k, "partial", ts, fill_qty=part, fill_price=1000.0)
+            j.record(k, "filled", ts, fill_qty=q - part, fill_price=1001.0)
+        ts += 0.9
+    write_s = time.perf_counter() - t0
+    events = j.seq
+    j._fh.close()                       # simulate a crash: no closing snapshot
+    return events, write_s
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=25_000)
+    args = parser.parse_args()
+
+    for label, every in (("snapshots (default cadence)", 2000), ("no snapshots (full replay)", 10 ** 12)):
+        root = tempfile.mkdtemp(prefix="journal_bench_")
+        events, write_s = write_day(root, args.orders, every, random.Random(7))
+        t0 = time.perf_counter()
+        j = OrderJournal(root, fsync=False)
+        restore_s = time.perf_counter() - t0
+        print(f"{label:28s}: {events:,} events ({events / write_s:,.0f}/s written) → restore {restore_s * 1000:7.1f} ms,"
+              f" replayed {j.replayed:,}, {len(j.open_orders()):,} open orders")
+        j.close()
+        shutil.rmtree(root)
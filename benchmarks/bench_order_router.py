@@ -0,0 +1,71 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_order_router.py
+# 🔹 BENCHMARK — sustained orders/s and ack latency: sync place_order vs async router
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_order_router --orders 1000 --latency-ms 20 --rate 200
+# The fake broker enforces `--rate` over a sliding 1 s window; the router's
+# bucket runs at 90 % of it with a 10 % burst so burst + refill never exceed
+# the limit — any 429 counted below means the throttle leaked.
+# ==============================================================
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import requests
+
+from benchmarks.fake_broker import FakeBroker
+from shared.strategy_engine.order_router import HttpTransport, OrderRouter
+
+
+def _order(i):
+    return {"symbol": f"NSE:SYM{i % 50:03d}-EQ", "qty": 1 + i % 10, "side": 1 if i % 2 else -1,
+            "type": 2, "productType": "INTRADAY", "validity": "DAY"}
+
+
+async def _run_router(url, n, rate, burst, in_flight):
+    router = OrderRouter(HttpTransport(url, max_connections=in_flight, idempotent=True), rate=rate, burst=burst,
+                         max_in_flight=in_flight)
+    t0 = time.perf_counter()
+    tickets = await asyncio.gather(*(router.submit(_order(i), f"bench-{i}") for i in range(n)))
+    elapsed = time.perf_counter() - t0
+    await router.close()
+    return tickets, elapsed, router.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="broker ack time")
+    parser.add_argument("--rate", type=float, default=200.0, help="broker limit = router bucket (orders/s)")
+    parser.add_argument("--in-flight", type=int, default=32)
+    args = parser.parse_args()
+
+    with FakeBroker(latency_ms=args.latency_ms, rate_limit=args.rate) as broker:
+        # legacy: one blocking place_order call after another
+        n_sync = max(1, min(args.orders, 100))
+        session = requests.Session()
+        lat = []
+        t0 = time.perf_counter()
+        for i in range(n_sync):
+            t = time.perf_counter()
+            session.post(broker.url + "/api/v3/orders/sync", json=_order(i), timeout=5)
+            lat.append(time.perf_counter() - t)
+        sync_s = time.perf_counter() - t0
+        time.sleep(1.0)                                  # let the broker's rate window drain
+
+        tickets, elapsed, stats = asyncio.run(
+            _run_router(broker.url, args.orders, args.rate * 0.9, int(max(1, args.rate // 10)), args.in_flight))
+        acked = sum(t.state == "acked" for t in tickets)
+        broker_stats = broker.stats()
+
+    sync_lat = np.array(lat) * 1000
+    print(f"broker ack {args.latency_ms:.0f} ms, rate limit {args.rate:.0f}/s, {args.orders} orders")
+    print(f"sync place_order : {n_sync / sync_s:8.1f} orders/s   ack p50 {np.percentile(sync_lat, 50):6.2f} ms"
+          f"  p99 {np.percentile(sync_lat, 99):6.2f} ms")
+    print(f"async router     : {args.orders / elapsed:8.1f} orders/s   ack p50 {stats['ack_ms']['p50']:6.2f} ms"
+          f"  p99 {stats['ack_ms']['p99']:6.2f} ms")
+    print(f"router           : {acked}/{args.orders} acked, {stats['retries']} retries, "
+          f"{stats['throttled_s']:.2f} s throttled | broker: {broker_stats}")
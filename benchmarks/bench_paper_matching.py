@@ -0,0 +1,67 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_paper_matching.py
+# 🔹 BENCHMARK — paper matching engine order events / second
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_paper_matching --orders 100000 --symbols 200
+# Mixed MARKET / LIMIT / STOP / SL-M flow with cancels, random latency,
+# bps slippage and volume-limited partial fills, driven by synthetic ticks.
+# ==============================================================
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from shared.strategy_engine.execution_manager import BpsSlippage, PaperMatchingEngine, RandomLatency
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--orders-per-tick", type=int, default=200)
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    rng = np.random.default_rng(7)
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    prices = np.full(args.symbols, 1000.0)
+    eng = PaperMatchingEngine(latency=RandomLatency(20, 5, seed=7), slippage=BpsSlippage(2), participation=0.5)
+
+    t_sim = 1_700_000_000.0
+    submitted, ticks = 0, 0
+    t0 = time.perf_counter()
+    while submitted < args.orders:
+        for _ in range(args.orders_per_tick):
+            j = rnd.randrange(args.symbols)
+            p = float(prices[j])
+            side = "BUY" if rnd.random() < 0.5 else "SELL"
+            sign = 1 if side == "BUY" else -1
+            kind = rnd.random()
+            qty = rnd.choice((10, 50, 100, 500))
+            if kind < 0.3:
+                eng.submit(symbols[j], side, qty, "MARKET", ts=t_sim)
+            elif kind < 0.7:
+                eng.submit(symbols[j], side, qty, "LIMIT", price=round(p - sign * p * 0.002, 2), ts=t_sim)
+            elif kind < 0.85:
+                trig = round(p + sign * p * 0.002, 2)
+                eng.submit(symbols[j], side, qty, "STOP", price=round(trig + sign * 0.5, 2), trigger=trig, ts=t_sim)
+            else:
+                eng.submit(symbols[j], side, qty, "SL-M", trigger=round(p + sign * p * 0.003, 2), ts=t_sim)
+            submitted += 1
+            if rnd.random() < 0.1 and submitted > 10:
+                eng.cancel(rnd.randrange(1, submitted), ts=t_sim)
+        prices *= np.exp(rng.normal(0, 0.001, args.symbols))
+        vols = rng.integers(50, 1000, args.symbols)
+        t_sim += 0.25
+        eng.on_ticks(list(zip(symbols, prices.tolist(), vols.tolist())), t_sim)
+        ticks += args.symbols
+    dt = time.perf_counter() - t0
+
+    s = eng.stats
+    events = sum(s.values())
+    print(f"{args.orders:,} orders on {args.symbols} symbols, {ticks:,} ticks in {dt:.2f} s")
+    print(f"order events/s : {events / dt:,.0f}  ({events:,} events: {s})")
+    print(f"ticks/s        : {ticks / dt:,.0f}")
+    print(f"open orders    : {len(eng.open_orders()):,}")
@@ -0,0 +1,59 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_param_sweep.py
+# 🔹 BENCHMARK — parameter sweep scaling over worker processes
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_param_sweep --years 2 --max-workers 8
+# Bars go into shared memory once; each worker count runs the same grid.
+# The "pickled bars" row ships the bar arrays with every task instead
+# (what a plain pool.map(run_backtest, ...) would do) for comparison.
+# ==============================================================
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+
+from System_1_Nifty_OI.backtest.backtest_engine import prepare, run_backtest
+from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars
+from System_1_Nifty_OI.backtest.param_sweep import SharedBars, param_grid, run_sweep
+from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+
+def _run_copied(task):
+    ctx, params = task
+    return run_backtest(ctx, params)["stats"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    bars = frame_to_bars(synthetic_minutes("NIFTY", start="2019-01-01", days=250 * args.years))
+    grid = param_grid()
+    n = bars["close"].size
+    counts = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w <= args.max_workers], args.max_workers})
+    print(f"{n:,} bars, {len(grid)} parameter sets, {os.cpu_count()} CPU(s) visible")
+
+    with SharedBars(bars) as shared:
+        print(f"shared memory: {shared.nbytes / 1e6:.1f} MB in {len(shared.spec)} blocks")
+        base = None
+        for workers in counts:
+            t0 = time.perf_counter()
+            table = run_sweep(shared, grid, workers=workers)
+            dt = time.perf_counter() - t0
+            base = base or dt
+            speedup = base / dt
+            print(f"workers={workers:<3}: {dt:6.2f} s | {len(grid) / dt:7.1f} sets/s | "
+                  f"speedup {speedup:4.2f}x | efficiency {speedup / workers * 100:5.1f} %")
+
+    workers = counts[-1]
+    ctx = prepare(bars)
+    t0 = time.perf_counter()
+    with mp.get_context().Pool(workers) as pool:
+        list(pool.imap_unordered(_run_copied, ((ctx, p) for p in grid)))
+    dt = time.perf_counter() - t0
+    print(f"pickled bars, workers={workers}: {dt:6.2f} s | {len(grid) / dt:7.1f} sets/s")
+    print("best:", table.iloc[0][["trigger", "side", "entry_pct", "sl_pct", "target_pct", "net_pnl"]].to_dict())
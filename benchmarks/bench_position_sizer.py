@@ -0,0 +1,55 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_position_sizer.py
+# 🔹 BENCHMARK — batch position sizing latency vs candidate count
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_position_sizer --candidates 30 100 300 1000
+# Each solve: risk size, six sector caps (score-ranked), total capital,
+# mixed lot sizes. The per-signal loop is calculate_position_size's body
+# (no joint constraints) for reference.
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from shared.position_sizer import size_batch
+
+
+def single_size(entry, sl, capital, risk_pct):
+    if sl <= 0 or entry <= 0:
+        return 0
+    per_unit_risk = abs(entry - sl)
+    if per_unit_risk == 0:
+        return 0
+    return max(int((capital * risk_pct) / 100 // per_unit_risk), 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, nargs="+", default=[30, 100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    capital = 5_000_000
+    rng = np.random.default_rng(7)
+    for m in args.candidates:
+        entry = rng.uniform(100, 5000, m)
+        sl = entry * (1 - rng.uniform(0.005, 0.03, m))
+        kw = {"sector": rng.choice(["IT", "BANK", "AUTO", "FMCG", "METAL", "PHARMA"], m),
+              "score": rng.random(m), "lot_size": rng.choice([1, 25, 50], m), "sector_cap_pct": 25}
+        lat = np.empty(args.repeat)
+        for k in range(args.repeat):
+            t = time.perf_counter()
+            res = size_batch(entry, sl, capital, 0.5, **kw)
+            lat[k] = time.perf_counter() - t
+        lat *= 1e6
+        e_list, s_list = entry.tolist(), sl.tolist()
+        t = time.perf_counter()
+        naive = [single_size(e, s, capital, 0.5) for e, s in zip(e_list, s_list)]
+        loop_us = (time.perf_counter() - t) * 1e6
+        naive_notional = float(np.dot(naive, entry))
+        print(f"{m:>5} candidates: solve p50 {np.percentile(lat, 50):7.1f} µs  p99 {np.percentile(lat, 99):7.1f} µs"
+              f" | deployed {res['notional'].sum() / capital:5.1%} of capital"
+              f" (independent sizing: {loop_us:6.1f} µs, {naive_notional / capital:7.1%})")
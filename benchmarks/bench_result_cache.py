@@ -0,0 +1,60 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_result_cache.py
+# 🔹 BENCHMARK — backtest result cache: cold vs warm, entry size, eviction
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_result_cache --years 5
+# Single backtests go through cached_backtest() (full per-bar result);
+# the 288-set sweep goes through run_sweep(cache=...) (stats-only rows).
+# Cache lives in a temporary directory.
+# ==============================================================
+
+import argparse
+import tempfile
+import time
+
+from System_1_Nifty_OI.backtest.backtest_engine import prepare, run_backtest
+from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars
+from System_1_Nifty_OI.backtest.param_sweep import param_grid, run_sweep
+from System_1_Nifty_OI.backtest.result_cache import ResultCache, cached_backtest, data_fingerprint
+from System_1_Nifty_OI.data_loader import synthetic_minutes
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    bars = frame_to_bars(synthetic_minutes("NIFTY", start="2019-01-01", days=250 * args.years))
+    ctx = prepare(bars)
+    grid = param_grid()
+    print(f"{ctx['close'].size:,} bars, {len(grid)} parameter sets")
+
+    fp_s, fp = _timed(lambda: data_fingerprint(ctx))
+    run_s, _ = _timed(lambda: run_backtest(ctx, trigger="HA Body Cross"))
+    with tempfile.TemporaryDirectory() as root:
+        cache = ResultCache(root)
+        cold_s, _ = _timed(lambda: cached_backtest(ctx, trigger="HA Body Cross", cache=cache, fingerprint=fp))
+        warm_s, _ = _timed(lambda: cached_backtest(ctx, trigger="HA Body Cross", cache=cache, fingerprint=fp))
+        entry = cache.nbytes
+        sweep_cold, table = _timed(lambda: run_sweep(ctx, grid, workers=args.workers, cache=cache))
+        sweep_warm, again = _timed(lambda: run_sweep(ctx, grid, workers=args.workers, cache=cache))
+        assert again["net_pnl"].tolist() == table["net_pnl"].tolist()
+        rows = (cache.nbytes - entry) / len(grid)
+        cache.evict(cache.nbytes // 2)
+        left = len(cache)
+
+    print(f"data fingerprint            : {fp_s * 1000:8.1f} ms (once per dataset)")
+    print(f"run_backtest                : {run_s * 1000:8.1f} ms")
+    print(f"cached_backtest cold / warm : {cold_s * 1000:8.1f} ms / {warm_s * 1000:6.1f} ms | "
+          f"entry {entry / 1024:.0f} KB vs {sum(v.nbytes for v in ctx.values()) / 2 ** 20:.0f} MB of bars")
+    print(f"sweep cold / warm           : {sweep_cold:8.2f} s  / {sweep_warm * 1000:6.1f} ms → "
+          f"{sweep_cold / sweep_warm:5.0f}x | {rows:.0f} B per stats row")
+    print(f"evict to half size          : {left} of {len(grid) + 1} entries kept (least recently used dropped)")
@@ -0,0 +1,58 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_risk_controller.py
+# 🔹 MICROBENCHMARK — pre-trade risk check latency per order
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_risk_controller --orders 200000 --symbols 500
+# Every rule enabled (risk %, daily loss, order size, symbol + sector
+# exposure, open positions, per-second / per-minute rate), a position book
+# holding `--symbols` names across a synthetic sector universe.
+# ==============================================================
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from shared.position_book import PositionBook
+from shared.strategy_engine.risk_controller import RiskController
+from shared.universe import synthetic_universe
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    args = parser.parse_args()
+
+    universe = synthetic_universe(args.symbols)
+    book = PositionBook()
+    for sym, _ in universe:
+        book.on_fill(sym, "BUY", 10, 1000.0)
+    rules = {"capital": 10_000_000, "max_risk_pct": 2.0, "max_daily_loss": 200_000,
+             "max_order_qty": 5_000, "max_order_value": 2_000_000,
+             "max_symbol_exposure": 1_000_000, "max_sector_exposure": 20_000_000,
+             "max_open_positions": args.symbols + 50,
+             "max_orders_per_sec": 1e9, "max_orders_per_min": 1e9}
+    ctl = RiskController(rules, book=book, sectors=universe)
+
+    rnd = random.Random(7)
+    orders = [{"symbol": rnd.choice(universe)[0], "side": rnd.choice(("BUY", "SELL")),
+               "qty": rnd.randint(1, 200), "price": 1000.0, "sl": 990.0} for _ in range(10_000)]
+
+    check = ctl.check
+    lat = np.empty(args.orders)
+    clock = time.perf_counter_ns
+    t0 = time.perf_counter()
+    for i in range(args.orders):
+        o = orders[i % 10_000]
+        s = clock()
+        check(o)
+        lat[i] = clock() - s
+    elapsed = time.perf_counter() - t0
+    lat /= 1000.0
+
+    print(f"{len(ctl._checks)} compiled rules, {args.symbols} positions, {args.orders} orders")
+    print(f"check(): p50 {np.percentile(lat, 50):.2f} µs  p99 {np.percentile(lat, 99):.2f} µs"
+          f"  max {lat.max():.1f} µs  → {args.orders / elapsed:,.0f} checks/s")
+    print("stats:", ctl.stats)
@@ -0,0 +1,75 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_scanner.py
+# 🔹 BENCHMARK — vectorised universe scanner (symbols × timeframes)
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_scanner --symbols 500 --rounds 200
+# Target: a full bar-close + scan across 500 symbols × 5 TFs well under 100 ms.
+# ==============================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from shared.scanner_engine import ScannerEngine
+from shared.universe import synthetic_universe
+
+RULES = [
+    {"field": "pct_change", "op": ">", "value": 0.0, "lookback": 3},
+    {"field": "rsi", "op": "<", "value": 70},
+    {"field": "ha_flip", "value": "any"},
+    {"field": "gap_pct", "op": ">=", "value": -5.0},
+]
+
+
+def _bars(rng, prev_close, S):
+    close = prev_close * np.exp(rng.normal(0, 0.004, S))
+    open_ = prev_close * np.exp(rng.normal(0, 0.001, S))
+    high = np.maximum(open_, close) * 1.001
+    low = np.minimum(open_, close) * 0.999
+    return np.column_stack([open_, high, low, close, rng.integers(100, 5000, S)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=256)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    symbols = [s for s, _ in synthetic_universe(args.symbols)]
+    eng = ScannerEngine(symbols)
+    S = len(symbols)
+
+    prev = {tf: np.full(S, 1000.0) for tf in eng.frames}
+    for _ in range(args.warmup):
+        for tf, frame in eng.frames.items():
+            bars = _bars(rng, prev[tf], S)
+            frame.push(bars)
+            prev[tf] = bars[:, 3]
+    eng.set_rules(RULES)
+
+    push_ms, scan_ms, hits = [], [], 0
+    for _ in range(args.rounds):
+        staged = {}
+        for tf in eng.frames:
+            staged[tf] = _bars(rng, prev[tf], S)
+            prev[tf] = staged[tf][:, 3]
+        t0 = time.perf_counter()
+        for tf, bars in staged.items():
+            eng.frames[tf].push(bars)
+        t1 = time.perf_counter()
+        out = eng.scan_all(RULES)
+        t2 = time.perf_counter()
+        push_ms.append((t1 - t0) * 1000)
+        scan_ms.append((t2 - t1) * 1000)
+        hits += sum(len(v) for v in out.values())
+
+    total = np.add(push_ms, scan_ms)
+    print(f"universe: {S} symbols × {len(eng.frames)} TFs, window {args.warmup}, {args.rounds} rounds")
+    print(f"bar-close push : p50 {np.percentile(push_ms, 50):7.3f} ms   p99 {np.percentile(push_ms, 99):7.3f} ms")
+    print(f"scan_all       : p50 {np.percentile(scan_ms, 50):7.3f} ms   p99 {np.percentile(scan_ms, 99):7.3f} ms")
+    print(f"push + scan    : p50 {np.percentile(total, 50):7.3f} ms   p99 {np.percentile(total, 99):7.3f} ms")
+    print(f"avg hits/scan  : {hits / args.rounds:.0f}")
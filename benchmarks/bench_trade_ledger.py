@@ -0,0 +1,113 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_trade_ledger.py
+# 🔹 BENCHMARK — trade_logs.csv rewrite path vs append-only ledger
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_trade_ledger --appends 100000
+# The CSV path (risk_engine.sync_positions before the ledger) is O(n) per
+# order, so it is timed on --csv-appends rows and at a few file sizes.
+# ==============================================================
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from shared.trade_ledger import TradeLedger
+
+SYMBOLS = ["NIFTY", "BANKNIFTY", "RELIANCE", "INFY", "TCS", "HDFCBANK", "SBIN", "ITC"]
+
+
+def _trade(i):
+    return {"timestamp": f"2024-05-{1 + (i // 5000) % 28:02d} 10:{i % 60:02d}:00",
+            "symbol": SYMBOLS[i % len(SYMBOLS)], "side": "BUY" if i % 2 else "SELL",
+            "qty": 50, "entry": 22000.0 + i % 100, "sl": 21900.0, "target": 22100.0,
+            "charges": 12.5, "status": "Open"}
+
+
+# ---------- legacy CSV path (as in risk_engine before the ledger) ----------
+def csv_sync(path, trade):
+    df = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+    df = pd.concat([df, pd.DataFrame([trade])], ignore_index=True)
+    df.to_csv(path, index=False)
+
+
+def csv_snapshot(path, capital=1e7):
+    df = pd.read_csv(path)
+    open_trades = df[df["status"] == "Open"]
+    margin = (open_trades["qty"] * open_trades["entry"]).sum()
+    pnl = 0
+    if "exit" in df.columns:
+        pnl = ((df["exit"] - df["entry"]) * df["qty"] - df["charges"]).sum()
+    return len(open_trades), margin, round(margin / capital * 100, 2), pnl
+
+
+def ledger_snapshot(led, capital=1e7):
+    """Same numbers as risk_engine.get_risk_snapshot reads from the ledger."""
+    margin = led.open_notional
+    return led.count("Open"), margin, round(margin / capital * 100, 2), led.realized_pnl
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--appends", type=int, default=100_000)
+    parser.add_argument("--csv-appends", type=int, default=300)
+    parser.add_argument("--no-fsync", action="store_true")
+    args = parser.parse_args()
+    tmp = tempfile.mkdtemp(prefix="bench_ledger_")
+
+    # ledger: 100k durable appends, then close most trades
+    led = TradeLedger(os.path.join(tmp, "ledger"), fsync=not args.no_fsync)
+    lat = np.empty(args.appends)
+    t0 = time.perf_counter()
+    for i in range(args.appends):
+        t = time.perf_counter()
+        led.append(_trade(i))
+        lat[i] = time.perf_counter() - t
+    append_s = time.perf_counter() - t0
+    for tid in range(1, args.appends + 1, 2):
+        if tid % 100:
+            led.update(tid, status="Closed", exit=22050.0)
+    t = time.perf_counter()
+    snap = ledger_snapshot(led)
+    snap_ms = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    open_rows = len(led.query(status="Open"))
+    rows_ms = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    by_sym = len(led.ids(symbol="INFY", date="2024-05-02", status="Open"))
+    query_us = (time.perf_counter() - t) * 1e6
+    led.close()
+    t = time.perf_counter()
+    reopened = TradeLedger(os.path.join(tmp, "ledger"))
+    reopen_ms = (time.perf_counter() - t) * 1000
+
+    # CSV: per-order rewrite cost at a few file sizes
+    csv_path = os.path.join(tmp, "trade_logs.csv")
+    sizes = sorted({1_000, 10_000, args.appends})
+    csv_rows = []
+    for n in sizes:
+        pd.DataFrame([_trade(i) for i in range(n)]).to_csv(csv_path, index=False)
+        k = max(3, args.csv_appends // (n // 1000))
+        t = time.perf_counter()
+        for i in range(k):
+            csv_sync(csv_path, _trade(n + i))
+        per = (time.perf_counter() - t) / k
+        t = time.perf_counter()
+        csv_snapshot(csv_path)
+        csv_rows.append((n, per * 1000, (time.perf_counter() - t) * 1000))
+
+    print(f"ledger  : {args.appends:,} appends in {append_s:.2f} s "
+          f"({args.appends / append_s:,.0f}/s, fsync={'off' if args.no_fsync else 'on'}); "
+          f"append p50 {np.percentile(lat, 50) * 1e6:.0f} µs, p99 {np.percentile(lat, 99) * 1e6:.0f} µs")
+    print(f"          risk snapshot {snap_ms * 1000:.1f} µs ({snap[0]:,} open), "
+          f"read all open rows {rows_ms:.0f} ms ({open_rows:,}), "
+          f"symbol+date+status ids {query_us:.0f} µs ({by_sym} rows), reopen {reopen_ms:.0f} ms")
+    print(f"{'csv rows':>10s} {'ms / order (rewrite)':>22s} {'snapshot ms':>12s}")
+    for n, per_ms, sn_ms in csv_rows:
+        print(f"{n:10,d} {per_ms:22.2f} {sn_ms:12.1f}")
+    est = csv_rows[-1][1] * args.appends / 2 / 1000          # rewrite cost grows linearly with rows
+    print(f"CSV path for {args.appends:,} orders ≈ {est:,.0f} s (linear growth in rewrite cost)")
@@ -0,0 +1,42 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_trailing_stops.py
+# 🔹 BENCHMARK — trailing stop update latency per tick batch
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_trailing_stops --positions 1000 5000 20000 --ticks 300
+# Mixed Step % / ATR / Fixed % longs and shorts over 500 symbols; every
+# tick batch reprices all symbols (random walk) and runs one update.
+# ==============================================================
+
+import argparse
+
+import numpy as np
+
+from shared.trailing_stop_engine import TRAIL_MODES, TrailingStopManager
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=300)
+    args = parser.parse_args()
+
+    modes = list(TRAIL_MODES)
+    syms = [f"SYM{i:04d}" for i in range(args.symbols)]
+    print(f"{args.symbols} symbols, {args.ticks} tick batches")
+    for n in args.positions:
+        rng = np.random.default_rng(7)
+        mgr = TrailingStopManager()
+        for i in range(n):
+            long = i % 2 == 0
+            mgr.add(syms[i % args.symbols], "BUY" if long else "SELL", 1000.0, modes[i % 3], 1.0,
+                    stop=950.0 if long else 1050.0)
+        mgr.atr[:args.symbols] = 5.0
+        prices = np.full(args.symbols, 1000.0)
+        vol = [1] * args.symbols
+        for k in range(args.ticks):
+            prices *= 1 + rng.normal(0, 0.0005, args.symbols)
+            mgr.on_ticks(list(zip(syms, prices.tolist(), vol)), float(k))
+        st = mgr.stats()
+        print(f"{n:>7,} positions: update p50 {st['update_us']['p50']:8.1f} µs  p99 {st['update_us']['p99']:8.1f} µs"
+              f"  | {st['events'] / st['updates']:7.1f} events / update, {st['positions']:,} still live")
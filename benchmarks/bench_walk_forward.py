@@ -0,0 +1,75 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_walk_forward.py
+# 🔹 BENCHMARK — walk-forward optimisation: cold, cached, +1 month
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_walk_forward --years 3 --workers 4
+# Rolling 12-month IS / 1-month OOS folds over synthetic NIFTY bars with
+# the default 288-set grid. Rows: cold run (all folds computed), warm run
+# (all folds from cache), data extended by one month (one new fold), and
+# per-window prepare() vs slicing one shared context.
+# ==============================================================
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from System_1_Nifty_OI.backtest.backtest_engine import prepare, run_backtest, slice_context
+from System_1_Nifty_OI.backtest.backtest_utils import frame_to_bars
+from System_1_Nifty_OI.backtest.result_cache import ResultCache
+from System_1_Nifty_OI.backtest.walk_forward import plan_windows, run_walk_forward
+from System_1_Nifty_OI.data_loader import _to_epoch, synthetic_minutes
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def _window(bars, fold):
+    i, j = np.searchsorted(bars["time"], [_to_epoch(fold["is_start"]), _to_epoch(fold["oos_end"])])
+    return {k: v[i:j] for k, v in bars.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    full = frame_to_bars(synthetic_minutes("NIFTY", start="2019-01-01", days=250 * args.years + 21))
+    cut = np.searchsorted(full["time"], _to_epoch(plan_windows(full["time"])[-1]["oos_start"]))
+    bars = {k: v[:cut] for k, v in full.items()}                # history up to the last month
+    print(f"{bars['close'].size:,} bars, {len(plan_windows(bars['time']))} folds, "
+          f"{args.workers} worker(s), {os.cpu_count()} CPU(s) visible")
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = ResultCache(root)
+        single, res = _timed(lambda: run_walk_forward(bars, workers=1, cache=False))
+        cold, _ = _timed(lambda: run_walk_forward(bars, workers=args.workers, cache=cache))
+        warm, hit = _timed(lambda: run_walk_forward(bars, workers=args.workers, cache=cache))
+        grown, new = _timed(lambda: run_walk_forward(full, workers=args.workers, cache=cache))
+    n = len(res["folds"])
+    print(f"cold, 1 worker        : {single:7.2f} s | {single / n * 1000:7.0f} ms / fold")
+    print(f"cold, {args.workers} worker(s)     : {cold:7.2f} s | speedup {single / cold:4.2f}x")
+    print(f"warm (all cached)     : {warm * 1000:7.0f} ms | {hit['cached']} cached, {hit['computed']} computed")
+    print(f"+1 month of data      : {grown:7.2f} s | {new['cached']} cached, {new['computed']} computed")
+    assert hit["folds"]["oos_net_pnl"].tolist() == res["folds"]["oos_net_pnl"].tolist()
+
+    folds = plan_windows(full["time"])
+    ctx = prepare(full)
+    per_window, _ = _timed(lambda: [prepare(_window(full, f)) for f in folds])
+    sliced, _ = _timed(lambda: [slice_context(ctx, f["is_start"], f["oos_end"]) for f in folds])
+    print(f"indicators per fold   : prepare() {per_window * 1000:7.1f} ms vs slice_context {sliced * 1000:5.1f} ms")
+
+    f = folds[-1]
+    whole = run_backtest(ctx)["trades"]
+    part = run_backtest(slice_context(ctx, f["oos_start"], f["oos_end"]))["trades"]
+    lo, hi = _to_epoch(f["oos_start"]), _to_epoch(f["oos_end"])
+    keep = (whole["entry_time"] >= lo) & (whole["entry_time"] < hi)
+    print(f"slice parity (last OOS): trades match={np.array_equal(whole['net'][keep], part['net'])}")
+    print("oos:", new["oos_stats"])
@@ -0,0 +1,81 @@
+# ==============================================================
+# 📄 FILE: benchmarks/bench_ws_fanout.py
+# 🔹 BENCHMARK — /ws/market fan-out to N local WebSocket clients
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.bench_ws_fanout --clients 1000 --seconds 10
+# Reports client-observed tick latency and the hub's own fan-out stats.
+# ==============================================================
+
+import argparse
+import asyncio
+import http.client
+import json
+import time
+
+import numpy as np
+import websockets
+
+from benchmarks.bench_api_market_store import STORE_TARGET, _serve
+
+
+async def _client(port, deadline, latencies, symbols, batch):
+    query = f"?symbols={symbols}&batch={int(batch)}"
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws/market{query}",
+                                  max_queue=None) as ws:
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            try:
+                msg = await asyncio.wait_for(ws.recv(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            now = time.time()
+            packets = json.loads(msg)
+            for pkt in packets if batch else (packets,):
+                latencies.append(now - pkt["ts"])
+
+
+async def _run(port, clients, seconds, symbols, batch):
+    latencies = []
+    deadline = time.time() + seconds
+    tasks = []
+    for i in range(clients):
+        tasks.append(asyncio.create_task(_client(port, deadline, latencies, symbols, batch)))
+        if i % 100 == 99:
+            await asyncio.sleep(0.05)       # stagger connects
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    return np.array(latencies) * 1000.0, errors
+
+
+def _hub_stats(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("GET", "/api/ws_stats")
+    return json.loads(conn.getresponse().read())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--symbols", default="", help="comma list; empty = all")
+    parser.add_argument("--batch", action="store_true", help="one array frame per tick")
+    parser.add_argument("--port", type=int, default=9103)
+    args = parser.parse_args()
+
+    proc = _serve(STORE_TARGET, args.port)
+    try:
+        lat, errors = asyncio.run(_run(args.port, args.clients, args.seconds, args.symbols,
+                                    args.batch))
+        stats = _hub_stats(args.port)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+    print(f"clients={args.clients}  batch={args.batch}  errors={len(errors)}  packets={len(lat)}")
+    if len(lat):
+        print(f"client latency ms  p50={np.percentile(lat, 50):.2f}  "
+              f"p99={np.percentile(lat, 99):.2f}  max={lat.max():.2f}")
+    print("hub stats:", stats)
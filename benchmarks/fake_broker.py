@@ -0,0 +1,131 @@
+# ==============================================================
+# 📄 FILE: benchmarks/fake_broker.py
+# 🔹 LOCAL FAKE BROKER — order endpoint for router tests / benchmarks
+# ==============================================================
+# Mimics the fyers REST order call (POST /api/v3/orders/sync →
+# {"s": "ok", "code": 1101, "id": ...}) with:
+#   • fixed ack latency
+#   • a server-side rate limit (429 above `rate_limit` orders/s)
+#   • Idempotency-Key dedup (a repeated key gets the original order id)
+#   • optional random rejects
+# USAGE (from repo root):
+#   python -m benchmarks.fake_broker --port 8766 --latency-ms 20 --rate-limit 10
+# In-process:
+#   with FakeBroker(latency_ms=5) as broker: ... broker.url ...
+# ==============================================================
+
+import argparse
+import collections
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeBroker:
+    """Threaded HTTP order endpoint with latency, rate limit and key dedup."""
+
+    def __init__(self, port: int = 0, latency_ms: float = 0.0, rate_limit: float = 0,
+                 reject_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.rate_limit = rate_limit
+        self.reject_rate = reject_rate
+        self.orders = {}                        # idempotency key -> order id
+        self.requests = 0
+        self.duplicates = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._window = collections.deque()      # accept times in the last second
+        self._next_id = 1
+        self._lock = threading.Lock()
+        broker = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                order = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                key = self.headers.get("Idempotency-Key")
+                if broker.latency_ms:
+                    time.sleep(broker.latency_ms / 1000.0)
+                status, body = broker._accept(order, key)
+                self._reply(status, body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = None
+
+    def _accept(self, order: dict, key: str):
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if self.rate_limit:
+                while self._window and now - self._window[0] >= 1.0:
+                    self._window.popleft()
+                if len(self._window) >= self.rate_limit:
+                    self.throttled += 1
+                    return 429, {"s": "error", "code": 429, "message": "request limit reached"}
+                self._window.append(now)
+            if key and key in self.orders:
+                self.duplicates += 1
+                return 200, {"s": "ok", "code": 1101, "id": self.orders[key], "message": "duplicate"}
+            if random.random() < self.reject_rate:
+                self.rejected += 1
+                return 200, {"s": "error", "code": -50, "message": "rejected by RMS"}
+            order_id = f"FB{self._next_id:010d}"
+            self._next_id += 1
+            if key:
+                self.orders[key] = order_id
+            return 200, {"s": "ok", "code": 1101, "id": order_id, "message": "Order submitted"}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-broker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "orders": self._next_id - 1,
+                    "duplicates": self.duplicates, "throttled": self.throttled,
+                    "rejected": self.rejected}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rate-limit", type=float, default=10)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    broker = FakeBroker(args.port, args.latency_ms, args.rate_limit, args.reject_rate).start()
+    print(f"Fake broker on {broker.url}/api/v3/orders/sync (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(broker.stats())
+    except KeyboardInterrupt:
+        broker.stop()
@@ -0,0 +1,100 @@
+# ==============================================================
+# 📄 FILE: benchmarks/stub_webhook.py
+# 🔹 LOCAL STUB WEBHOOK — records alert posts for dispatcher tests
+# ==============================================================
+# USAGE (from repo root):
+#   python -m benchmarks.stub_webhook --port 8765 --delay 0.2 --fail-rate 0.1
+#   → point the alert webhook URL at http://127.0.0.1:8765/alert
+# In-process:
+#   with StubWebhook(fail_first=2) as stub: ... stub.url ...
+# ==============================================================
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubWebhook:
+    """Threaded HTTP server; answers 200 (or 503 on injected failures) and keeps payloads."""
+
+    def __init__(self, port: int = 0, delay: float = 0.0, fail_rate: float = 0.0, fail_first: int = 0):
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.payloads = []
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"       # keep-alive, so pooled sessions reuse sockets
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                with stub._lock:
+                    stub.requests += 1
+                    fail = stub.requests <= stub.fail_first or random.random() < stub.fail_rate
+                    if fail:
+                        stub.failures += 1
+                    else:
+                        stub.payloads.append(json.loads(body or b"null"))
+                self.send_response(503 if fail else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/alert"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stub-webhook", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def alert_count(self) -> int:
+        """Alerts received, counting every alert inside batch payloads."""
+        with self._lock:
+            return sum(len(p["alerts"]) if isinstance(p, dict) and "alerts" in p else 1
+                       for p in self.payloads)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "failures": self.failures,
+                    "payloads": len(self.payloads)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubWebhook(args.port, args.delay, args.fail_rate).start()
+    print(f"Stub webhook on {stub.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(stub.stats(), "alerts:", stub.alert_count())
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,210 @@
+"""
+Phase 26.8 — Background Alert Dispatcher
+File: shared/alert_dispatcher.py
+
+Render code only enqueues; one worker thread delivers webhooks over a
+pooled requests.Session. Alerts that fire within the same window are sent
+as one batch per URL, failed posts retry with exponential backoff, and
+delivery metrics are kept for the debug panels.
+
+Payloads:
+  single alert  → the alert dict (unchanged for existing receivers)
+  batch         → {"alerts": [...], "count": n}
+"""
+
+import collections
+import queue
+import threading
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_BATCH_WINDOW = 0.25     # seconds to wait for more alerts after the first
+DEFAULT_MAX_BATCH = 50
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5           # first retry delay; doubles each attempt
+DEFAULT_TIMEOUT = 3.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class AlertDispatcher:
+    """Bounded queue → batched, retried webhook delivery on a worker thread."""
+
+    def __init__(self, webhook_url: str = None, maxsize: int = DEFAULT_QUEUE_SIZE,
+                 batch_window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_MAX_BATCH,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                 timeout: float = DEFAULT_TIMEOUT, pool_size: int = 4, session=None):
+        self.webhook_url = webhook_url
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._session = session or self._make_session(pool_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._latency = collections.deque(maxlen=2048)     # enqueue → delivered, seconds
+        self.metrics = {"enqueued": 0, "dropped": 0, "delivered": 0, "batches": 0,
+                        "failed": 0, "retries": 0}
+
+    @staticmethod
+    def _make_session(pool_size: int):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    # ---------- producer side (render path) ----------
+    def enqueue(self, alert: dict, webhook_url: str = None) -> bool:
+        """Non-blocking; returns False when there is no URL or the queue is full."""
+        url = webhook_url or self.webhook_url
+        if not url:
+            return False
+        try:
+            self._queue.put_nowait((url, alert, time.perf_counter()))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        self.start()
+        return True
+
+    # ---------- worker ----------
+    def _collect(self):
+        try:
+            first = self._queue.get(timeout=0.2)
+        except queue.Empty:
+            return []
+        items = [first]
+        deadline = time.perf_counter() + self.batch_window
+        while len(items) < self.max_batch:
+            left = deadline - time.perf_counter()
+            if left <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=left))
+            except queue.Empty:
+                break
+        return items
+
+    def _post(self, url: str, payload) -> bool:
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                if self._stop.wait(self.backoff * 2 ** (attempt - 1)):
+                    break
+            try:
+                resp = self._session.post(url, json=payload, timeout=self.timeout)
+                if resp.status_code < 400:
+                    return True
+                if resp.status_code not in RETRY_STATUS:
+                    return False
+            except requests.RequestException:
+                pass
+        return False
+
+    def _deliver(self, items):
+        by_url = collections.defaultdict(list)
+        for url, alert, t0 in items:
+            by_url[url].append((alert, t0))
+        for url, group in by_url.items():
+            alerts = [a for a, _ in group]
+            payload = alerts[0] if len(alerts) == 1 else {"alerts": alerts, "count": len(alerts)}
+            ok = self._post(url, payload)
+            now = time.perf_counter()
+            with self._lock:
+                self.metrics["batches"] += 1
+                self.metrics["delivered" if ok else "failed"] += len(alerts)
+                if ok:
+                    self._latency.extend(now - t0 for _, t0 in group)
+        for _ in items:
+            self._queue.task_done()
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            items = self._collect()
+            if items:
+                self._deliver(items)
+
+    # ---------- lifecycle ----------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            with self._lock:
+                if not self.running:
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+                    self._thread.start()
+        return self
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued alert was delivered or gave up."""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    # ---------- metrics ----------
+    def _count(self, key: str):
+        with self._lock:
+            self.metrics[key] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self.metrics)
+            lat = np.array(self._latency) * 1000.0
+        out["queue"] = self._queue.qsize()
+        if lat.size:
+            out["latency_ms"] = {"p50": round(float(np.percentile(lat, 50)), 2),
+                                 "p99": round(float(np.percentile(lat, 99)), 2),
+                                 "max": round(float(lat.max()), 2)}
+        return out
+
+
+_DISPATCHER = None
+_DISPATCHER_LOCK = threading.Lock()
+
+
+def get_dispatcher(**kwargs) -> AlertDispatcher:
+    """Process-wide dispatcher (worker starts on the first enqueue)."""
+    global _DISPATCHER
+    with _DISPATCHER_LOCK:
+        if _DISPATCHER is None:
+            _DISPATCHER = AlertDispatcher(**kwargs)
+    return _DISPATCHER
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    from benchmarks.stub_webhook import StubWebhook
+
+    with StubWebhook(fail_first=2) as stub:
+        disp = AlertDispatcher(stub.url, batch_window=0.05, backoff=0.01)
+        t0 = time.perf_counter()
+        for i in range(20):
+            assert disp.enqueue({"symbol": "NIFTY", "line": "entry", "event": "cross", "price": 22000 + i})
+        enqueue_us = (time.perf_counter() - t0) * 1e6 / 20
+        assert disp.flush()
+        disp.stop()
+        assert stub.alert_count() == 20, stub.alert_count()
+        print(f"✅ Dispatcher OK: enqueue {enqueue_us:.1f} µs/alert,", disp.stats(),
+              "| stub requests:", stub.stats()["requests"])
@@ -0,0 +1,281 @@
+"""
+Phase 26.7 — Indexed Price Alerts
+File: shared/alert_index.py
+
+Keeps every symbol's alert levels in one sorted array so a bar or tick
+finds all levels crossed / touched with a couple of binary searches —
+O(log n + k) per symbol instead of one check per line.
+
+Semantics match shared/alert_logic.py:
+  price cross : prev_close < L < close   (or reverse)
+  price touch : low ≤ L ≤ high
+  HA cross    : prev_ha_close < L < max(ha_open, ha_close)   (or reverse, min)
+  HA touch    : L inside the current HA body (inclusive)
+  "Lenient"   : touches are reported only for levels that did not cross.
+"""
+
+import itertools
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+import numpy as np
+
+# ==========================================================
+# 🔎 RANGE MATCHING ON A SORTED LEVEL LIST
+# ==========================================================
+def _open(levels, lo, hi):
+    """Index range of lo < L < hi."""
+    if not hi > lo:
+        return 0, 0
+    return bisect_right(levels, lo), bisect_left(levels, hi)
+
+
+def _closed(levels, lo, hi):
+    """Index range of lo ≤ L ≤ hi."""
+    if not hi >= lo:
+        return 0, 0
+    return bisect_left(levels, lo), bisect_right(levels, hi)
+
+
+def _subtract(rng, cuts):
+    """[i, j) minus the (sorted, disjoint) cut ranges → list of ranges."""
+    i, j = rng
+    out = []
+    for a, b in sorted(cuts):
+        if b <= a:
+            continue
+        if a > i:
+            out.append((i, min(a, j)))
+        i = max(i, b)
+    if j > i:
+        out.append((i, j))
+    return [r for r in out if r[1] > r[0]]
+
+
+def level_ranges(levels, prev_close, open_, high, low, close,
+                 use_heikin_ashi: bool = True, sensitivity: str = "Strict"):
+    """
+    levels: sorted sequence. For HA mode pass HA open/close and the previous HA close
+    (prev_close=None on the first bar: touches only).
+    Returns (cross_ranges, touch_ranges) as [(i, j), ...] slices of `levels`.
+    """
+    if use_heikin_ashi:
+        body_lo, body_hi = min(open_, close), max(open_, close)
+        crosses = [] if prev_close is None else \
+            [_open(levels, prev_close, body_hi), _open(levels, body_lo, prev_close)]
+        touch = _closed(levels, body_lo, body_hi)
+    else:
+        crosses = [] if prev_close is None else \
+            [_open(levels, min(prev_close, close), max(prev_close, close))]
+        touch = _closed(levels, low, high)
+    crosses = [r for r in crosses if r[1] > r[0]]
+    if sensitivity != "Lenient" or touch[1] <= touch[0]:
+        return crosses, []
+    return crosses, _subtract(touch, crosses)
+
+
+def match_levels(levels, prev_close, open_, high, low, close,
+                 use_heikin_ashi: bool = True, sensitivity: str = "Strict"):
+    """level_ranges() as (cross_idx, touch_idx) index arrays."""
+    crosses, touches = level_ranges(levels, prev_close, open_, high, low, close,
+                                    use_heikin_ashi, sensitivity)
+    empty = [np.empty(0, dtype=np.int64)]
+    return (np.concatenate([np.arange(i, j) for i, j in crosses] + empty),
+            np.concatenate([np.arange(i, j) for i, j in touches] + empty))
+
+
+# ==========================================================
+# 🗂️ PER-SYMBOL BOOK
+# ==========================================================
+class SymbolAlerts:
+    """Sorted levels + parallel alert ids; inserts are batched into one re-sort."""
+
+    __slots__ = ("levels", "ids", "once", "_pending", "_removed")
+
+    def __init__(self):
+        self.levels = []            # plain lists: bisect beats NumPy on scalar lookups
+        self.ids = []
+        self.once = 0               # armed one-shot alerts (skip disarm bookkeeping when 0)
+        self._pending = []
+        self._removed = set()
+
+    def add(self, alert_id: int, level: float):
+        self._pending.append((level, alert_id))
+
+    def remove(self, alert_id: int):
+        self._removed.add(alert_id)
+
+    def compact(self):
+        if not self._pending and not self._removed:
+            return
+        rows = list(zip(self.levels, self.ids)) + self._pending
+        if self._removed:
+            rows = [r for r in rows if r[1] not in self._removed]
+        rows.sort()
+        self.levels = [r[0] for r in rows]
+        self.ids = [r[1] for r in rows]
+        self._pending.clear()
+        self._removed.clear()
+
+    def __len__(self):
+        return len(self.ids) + len(self._pending)
+
+
+# ==========================================================
+# 🏭 INDEX
+# ==========================================================
+class AlertIndex:
+    """Alert levels for the whole watchlist; evaluate per bar or per tick."""
+
+    def __init__(self):
+        self._books = {}            # symbol -> SymbolAlerts
+        self._meta = {}             # alert_id -> (symbol, line_key, level, once)
+        self._spent = {}            # fired once-alerts, kept until to_alerts() reads them
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, symbol: str, level: float, line_key: str = "level", once: bool = False) -> int:
+        with self._lock:
+            alert_id = next(self._ids)
+            book = self._books.setdefault(symbol, SymbolAlerts())
+            book.add(alert_id, float(level))
+            book.once += bool(once)
+            self._meta[alert_id] = (symbol, line_key, float(level), once)
+        return alert_id
+
+    def add_many(self, symbol: str, levels, line_key: str = "level", once: bool = False):
+        return [self.add(symbol, lv, line_key, once) for lv in levels]
+
+    def remove(self, alert_id: int):
+        with self._lock:
+            meta = self._meta.pop(alert_id, None)
+            if meta:
+                book = self._books[meta[0]]
+                book.remove(alert_id)
+                book.once -= bool(meta[3])
+
+    def clear(self, symbol: str):
+        with self._lock:
+            book = self._books.pop(symbol, None)
+            if book:
+                book.compact()
+                for alert_id in book.ids:
+                    self._meta.pop(alert_id, None)
+
+    def meta(self, alert_id: int):
+        return self._meta.get(alert_id)
+
+    def __len__(self):
+        return len(self._meta)
+
+    def symbols(self):
+        return list(self._books.keys())
+
+    def _book(self, symbol: str):
+        book = self._books.get(symbol)
+        if book is not None and (book._pending or book._removed):
+            book.compact()
+        return book
+
+    # ---------- evaluation ----------
+    def evaluate(self, symbol: str, prev_close: float, open_: float, high: float, low: float,
+                 close: float, use_heikin_ashi: bool = True, sensitivity: str = "Strict"):
+        """One closed/updated bar → [(alert_id, "cross"|"touch"), ...]."""
+        with self._lock:
+            book = self._book(symbol)
+            if book is None or not book.ids:
+                return []
+            crosses, touches = level_ranges(book.levels, prev_close, open_, high, low, close,
+                                            use_heikin_ashi, sensitivity)
+            ids = book.ids
+            hits = [(a, "cross") for i, j in crosses for a in ids[i:j]]
+            hits += [(a, "touch") for i, j in touches for a in ids[i:j]]
+            if hits and book.once:
+                self._disarm(book, hits)
+        return hits
+
+    def on_tick(self, symbol: str, prev_price: float, price: float):
+        """Tick path: levels strictly between the previous and current trade price."""
+        with self._lock:
+            book = self._book(symbol)
+            if book is None or not book.ids:
+                return []
+            i, j = _open(book.levels, min(prev_price, price), max(prev_price, price))
+            hits = [(a, "cross") for a in book.ids[i:j]]
+            if hits and book.once:
+                self._disarm(book, hits)
+        return hits
+
+    def evaluate_bars(self, bars: dict, use_heikin_ashi: bool = True, sensitivity: str = "Strict"):
+        """bars: {symbol: (prev_close, open, high, low, close)} → {symbol: hits}."""
+        out = {}
+        for symbol, (pc, o, h, l, c) in bars.items():
+            hits = self.evaluate(symbol, pc, o, h, l, c, use_heikin_ashi, sensitivity)
+            if hits:
+                out[symbol] = hits
+        return out
+
+    def _disarm(self, book, hits):
+        for alert_id, _ in hits:
+            meta = self._meta.get(alert_id)
+            if meta and meta[3]:
+                self._spent[alert_id] = self._meta.pop(alert_id)
+                book.remove(alert_id)
+                book.once -= 1
+
+    def to_alerts(self, hits, symbol: str = None):
+        """Hits → payloads in the alert_logic.generate_alert format."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        out = []
+        for alert_id, event in hits:
+            meta = self._meta.get(alert_id) or self._spent.pop(alert_id, None)
+            if meta is None:
+                continue
+            out.append({"timestamp": now, "event": event, "symbol": symbol or meta[0],
+                        "line": meta[1], "price": round(meta[2], 2)})
+        return out
+
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_alert_index() -> AlertIndex:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = AlertIndex()
+    return _INDEX
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    rng = np.random.default_rng(7)
+    levels = np.sort(rng.uniform(21800, 22200, 400))
+    levels[10:13] = levels[12]                                          # duplicate levels
+    for _ in range(2000):
+        pc, o, c = rng.uniform(21800, 22200, 3)
+        l, h = min(o, c) - rng.uniform(0, 40), max(o, c) + rng.uniform(0, 40)
+        for ha in (True, False):
+            for sens in ("Strict", "Lenient"):
+                cross, touch = match_levels(levels, pc, o, h, l, c, ha, sens)
+                if ha:
+                    ref_c = ((pc < levels) & ((o > levels) | (c > levels))) | \
+                            ((pc > levels) & ((o < levels) | (c < levels)))
+                    ref_t = ((o <= levels) & (levels <= c)) | ((c <= levels) & (levels <= o))
+                else:
+                    ref_c = ((pc < levels) & (c > levels)) | ((pc > levels) & (c < levels))
+                    ref_t = (l <= levels) & (levels <= h)
+                ref_t = ref_t & ~ref_c if sens == "Lenient" else np.zeros_like(ref_t)
+                assert np.array_equal(np.sort(cross), np.flatnonzero(ref_c))
+                assert np.array_equal(np.sort(touch), np.flatnonzero(ref_t))
+
+    idx = AlertIndex()
+    a = idx.add("NIFTY", 22000, "entry", once=True)
+    idx.add("NIFTY", 21900, "sl")
+    hit = idx.on_tick("NIFTY", 21990, 22010)
+    assert hit == [(a, "cross")] and idx.to_alerts(hit)[0]["line"] == "entry"
+    assert idx.on_tick("NIFTY", 22010, 21990) == []                  # once → disarmed
+    print("✅ Alert index OK:", len(idx), "armed;", idx.to_alerts(idx.on_tick("NIFTY", 21950, 21850)))
@@ -7,21 +7,20 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import time
-import requests
 from datetime import datetime
 
+from shared.alert_dispatcher import get_dispatcher
+from shared.alert_index import match_levels
+from shared.heikin_ashi import heikin_ashi_frame
+
 # ==========================================================
 # ⚙️ CORE ALERT FUNCTIONS
 # ==========================================================
 def heikin_ashi_transform(df: pd.DataFrame):
-    """Convert OHLC to Heikin-Ashi format."""
-    ha_df = df.copy()
-    ha_df["HA_Close"] = (df["open"] + df["high"] + df["low"] + df["close"]) / 4
-    ha_df["HA_Open"] = (df["open"].shift(1) + df["close"].shift(1)) / 2
-    ha_df["HA_High"] = ha_df[["high", "HA_Open", "HA_Close"]].max(axis=1)
-    ha_df["HA_Low"] = ha_df[["low", "HA_Open", "HA_Close"]].min(axis=1)
-    ha_df.dropna(inplace=True)
-    return ha_df
+    """Convert OHLC to Heikin-Ashi format (shared engine; reuses HA columns if present)."""
+    if "HA_Open" in df.columns:
+        return df
+    return heikin_ashi_frame(df)
 
 
 def check_ha_body_cross(df: pd.DataFrame, line_value: float):
@@ -84,10 +83,9 @@ def dispatch_alert(alert: dict, mode="popup", webhook_url=None):
     elif mode == "toast":
         st.toast(msg)
     elif mode == "webhook" and webhook_url:
-        try:
-            requests.post(webhook_url, json=alert, timeout=3)
-        except Exception:
-            st.error("❌ Webhook failed.")
+        # delivery (batching / retries) happens on the dispatcher thread
+        if not get_dispatcher().enqueue(alert, webhook_url):
+            st.error("❌ Webhook queue full — alert dropped.")
     else:
         st.info(msg)
 
@@ -104,22 +102,24 @@ def monitor_chart(df: pd.DataFrame, meta: dict, use_heikin_ashi=True, sensitivit
     if use_heikin_ashi:
         df = heikin_ashi_transform(df)
 
-    for line_key in ["entry", "sl", "target"]:
-        value = meta.get(line_key)
-        if not value or value <= 0:
-            continue
-
-        if use_heikin_ashi:
-            crossed = check_ha_body_cross(df, value)
-            touched = check_ha_body_touch(df, value)
-        else:
-            crossed = check_price_cross(df, value)
-            touched = check_price_touch(df, value)
-
-        if crossed:
-            alerts.append(generate_alert("cross", meta["symbol"], line_key, value))
-        elif sensitivity == "Lenient" and touched:
-            alerts.append(generate_alert("touch", meta["symbol"], line_key, value))
+    lines = [(k, meta.get(k)) for k in ["entry", "sl", "target"] if meta.get(k) and meta.get(k) > 0]
+    if not lines:
+        return alerts
+
+    # one binary-search pass over the sorted levels (shared with the watchlist AlertIndex)
+    order = sorted(range(len(lines)), key=lambda k: lines[k][1])
+    levels = np.array([lines[k][1] for k in order], dtype=np.float64)
+    o_col, c_col = ("HA_Open", "HA_Close") if use_heikin_ashi else ("open", "close")
+    curr = df.iloc[-1]
+    prev_close = df[c_col].iat[-2] if len(df) >= 2 else None
+    cross, touch = match_levels(levels, prev_close, curr[o_col], curr["high"], curr["low"], curr[c_col],
+                                use_heikin_ashi, sensitivity)
+    events = {order[i]: "touch" for i in touch.tolist()}
+    events.update({order[i]: "cross" for i in cross.tolist()})
+
+    for k, (line_key, value) in enumerate(lines):
+        if k in events:
+            alerts.append(generate_alert(events[k], meta["symbol"], line_key, value))
 
     for alert in alerts:
         dispatch_alert(alert, mode="toast")
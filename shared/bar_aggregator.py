@@ -0,0 +1,253 @@
+"""
+Phase 26.2 — Incremental Multi-Timeframe Bar Aggregator
+File: shared/bar_aggregator.py
+
+Keeps 1m … 1D bars for every subscribed symbol and updates all of them in
+O(1) per tick. Each (symbol, timeframe) series carries a version counter;
+consumers read "bars since version N" and redraw only the changed tail.
+"""
+
+import threading
+import numpy as np
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+TIMEFRAME_SECONDS = {
+    "1m": 60, "3m": 180, "5m": 300, "10m": 600, "15m": 900, "30m": 1800,
+    "1h": 3600, "4h": 14400, "1D": 86400,
+}
+DEFAULT_TIMEFRAMES = list(TIMEFRAME_SECONDS.keys())
+SESSION_ORIGIN = 13500          # 09:15 IST (03:45 UTC) — NSE bars start at the open
+DEFAULT_MAX_BARS = 5000
+FIELDS = ("time", "open", "high", "low", "close", "volume")
+
+
+def bucket_start(ts: float, seconds: int, origin: int = SESSION_ORIGIN) -> int:
+    """Start time of the bar that contains ts."""
+    return int((ts - origin) // seconds) * seconds + origin
+
+
+# ==========================================================
+# 🧱 ONE (SYMBOL, TIMEFRAME) SERIES
+# ==========================================================
+class BarSeries:
+    """Append-mostly OHLCV arrays; only the last bar is ever mutated."""
+
+    __slots__ = ("seconds", "origin", "max_bars", "time", "ohlcv", "changed",
+                 "n", "base", "version")
+
+    def __init__(self, seconds: int, max_bars: int = DEFAULT_MAX_BARS, origin: int = SESSION_ORIGIN):
+        self.seconds = seconds
+        self.origin = origin
+        self.max_bars = max_bars
+        cap = max(16, max_bars * 2)
+        self.time = np.zeros(cap, dtype=np.int64)
+        self.ohlcv = np.zeros((cap, 5), dtype=np.float64)
+        self.changed = np.zeros(cap, dtype=np.int64)   # version that last touched each bar
+        self.n = 0
+        self.base = 0           # absolute index of self.time[0]
+        self.version = 0
+
+    def _trim(self):
+        # amortised O(1): shift once every max_bars appends
+        drop = self.n - self.max_bars
+        self.time[:self.max_bars] = self.time[drop:self.n]
+        self.ohlcv[:self.max_bars] = self.ohlcv[drop:self.n]
+        self.changed[:self.max_bars] = self.changed[drop:self.n]
+        self.n = self.max_bars
+        self.base += drop
+
+    def update(self, ts: float, price: float, volume: float = 0.0) -> bool:
+        """Apply one tick. Returns True when it opened a new bar (previous one closed)."""
+        start = bucket_start(ts, self.seconds, self.origin)
+        self.version += 1
+        i = self.n - 1
+        if i >= 0 and start <= self.time[i]:
+            row = self.ohlcv[i]
+            if price > row[1]:
+                row[1] = price
+            if price < row[2]:
+                row[2] = price
+            row[3] = price
+            row[4] += volume
+            self.changed[i] = self.version
+            return False
+        if self.n == len(self.time):
+            self._trim()
+        i = self.n
+        self.time[i] = start
+        self.ohlcv[i] = (price, price, price, price, volume)
+        self.changed[i] = self.version
+        self.n += 1
+        return i > 0
+
+    def since(self, version: int) -> dict:
+        """Bars changed after `version` (always a suffix) with their absolute start index."""
+        k = int(np.searchsorted(self.changed[:self.n], version, side="right"))
+        sl = slice(k, self.n)
+        out = {"version": self.version, "start": self.base + k, "time": self.time[sl].copy()}
+        for j, name in enumerate(FIELDS[1:]):
+            out[name] = self.ohlcv[sl, j].copy()
+        return out
+
+    def last(self, count: int) -> dict:
+        k = max(0, self.n - count)
+        out = {"version": self.version, "start": self.base + k, "time": self.time[k:self.n].copy()}
+        for j, name in enumerate(FIELDS[1:]):
+            out[name] = self.ohlcv[k:self.n, j].copy()
+        return out
+
+
+# ==========================================================
+# 🔀 AGGREGATOR
+# ==========================================================
+class BarAggregator:
+    """Tick → bars for every (symbol, timeframe); feed-listener compatible."""
+
+    def __init__(self, timeframes=None, max_bars: int = DEFAULT_MAX_BARS, origin: int = SESSION_ORIGIN):
+        self.timeframes = list(timeframes or DEFAULT_TIMEFRAMES)
+        self.max_bars = max_bars
+        self.origin = origin
+        self._series = {}           # symbol -> {tf: BarSeries}
+        self._close_listeners = []
+        self._feeds = set()         # id() of feeds already feeding on_ticks
+        self._lock = threading.Lock()
+
+    def subscribe(self, symbol: str):
+        if symbol not in self._series:
+            with self._lock:
+                self._series.setdefault(symbol, {
+                    tf: BarSeries(TIMEFRAME_SECONDS[tf], self.max_bars, self.origin)
+                    for tf in self.timeframes
+                })
+        return self._series[symbol]
+
+    def attach(self, feed) -> bool:
+        """Listen to a feed's ticks once; repeat calls for the same feed are no-ops."""
+        with self._lock:
+            if id(feed) in self._feeds:
+                return False
+            self._feeds.add(id(feed))
+        feed.add_listener(self.on_ticks)
+        return True
+
+    def has(self, symbol: str) -> bool:
+        return symbol in self._series
+
+    def symbols(self):
+        return list(self._series.keys())
+
+    def add_close_listener(self, callback):
+        """callback(symbol, timeframe, series) fires when a bar closes."""
+        self._close_listeners.append(callback)
+
+    # ---------- writes ----------
+    def on_tick(self, symbol: str, price: float, volume: float, ts: float):
+        series = self.subscribe(symbol)
+        closed = []
+        with self._lock:
+            for tf, s in series.items():
+                if s.update(ts, price, volume):
+                    closed.append((tf, s))
+        for tf, s in closed:
+            for callback in self._close_listeners:
+                callback(symbol, tf, s)
+
+    def on_ticks(self, ticks, ts: float):
+        """MockTickFeed listener signature: ticks = [(symbol, price, volume), ...]."""
+        for symbol, price, volume in ticks:
+            self.on_tick(symbol, price, volume, ts)
+
+    # ---------- reads ----------
+    def series(self, symbol: str, timeframe: str):
+        return self._series.get(symbol, {}).get(timeframe)
+
+    def version(self, symbol: str, timeframe: str) -> int:
+        s = self.series(symbol, timeframe)
+        return s.version if s else -1
+
+    def since(self, symbol: str, timeframe: str, version: int = 0) -> dict:
+        s = self.series(symbol, timeframe)
+        if s is None:
+            return None
+        with self._lock:
+            return s.since(version)
+
+    def last(self, symbol: str, timeframe: str, count: int = 200) -> dict:
+        s = self.series(symbol, timeframe)
+        if s is None:
+            return None
+        with self._lock:
+            return s.last(count)
+
+
+def to_frame(delta: dict):
+    """Bars dict → DataFrame indexed by absolute bar number."""
+    import pandas as pd
+    idx = pd.RangeIndex(delta["start"], delta["start"] + len(delta["time"]))
+    df = pd.DataFrame({k: delta[k] for k in FIELDS[1:]}, index=idx)
+    df.insert(0, "time", pd.to_datetime(delta["time"], unit="s"))
+    return df
+
+
+def merge_delta(df, delta: dict, max_rows: int = None):
+    """Replace the changed tail of a cached frame with the delta rows."""
+    import pandas as pd
+    tail = to_frame(delta)
+    df = pd.concat([df[df.index < delta["start"]], tail]) if df is not None else tail
+    return df.iloc[-max_rows:] if max_rows else df
+
+
+_AGG = None
+_AGG_LOCK = threading.Lock()
+
+
+def get_bar_aggregator(feed=None) -> BarAggregator:
+    """Process-wide aggregator; attaches to the feed the first time one is given."""
+    global _AGG
+    with _AGG_LOCK:
+        if _AGG is None:
+            _AGG = BarAggregator()
+        if feed is not None:
+            _AGG.attach(feed)
+    return _AGG
+
+
+def start_live_bars(backfill_minutes: int = 400) -> BarAggregator:
+    """Attach the aggregator to the process-wide feed and start it once."""
+    from shared.strategy_engine.data_feed_bridge import get_feed
+    feed = get_feed()
+    agg = get_bar_aggregator(feed)
+    with _AGG_LOCK:
+        if not feed.running:
+            feed.backfill(backfill_minutes)
+            feed.start()
+    return agg
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    agg = BarAggregator()
+    t0 = 1_700_000_000 - (1_700_000_000 - SESSION_ORIGIN) % 86400
+    rng = np.random.default_rng(7)
+    prices = 22500 + np.cumsum(rng.standard_normal(6 * 3600))
+    for k, p in enumerate(prices):
+        agg.on_tick("NIFTY", float(p), 1.0, t0 + k)
+    one = agg.last("NIFTY", "1m", 10_000)
+    hour = agg.last("NIFTY", "1h", 10)
+    assert len(one["time"]) == 360 and len(hour["time"]) == 6
+    assert np.isclose(hour["high"][0], one["high"][:60].max())
+    assert hour["volume"].sum() == len(prices)
+    v = agg.version("NIFTY", "5m")
+    agg.on_tick("NIFTY", 22600.0, 1.0, t0 + len(prices))
+    tail = agg.since("NIFTY", "5m", v)
+    assert len(tail["time"]) == 1
+    class _Feed:
+        def __init__(self): self.listeners = []
+        def add_listener(self, cb): self.listeners.append(cb)
+    feed = _Feed()
+    assert agg.attach(feed) and not agg.attach(feed) and len(feed.listeners) == 1
+    print("✅ Bar aggregator OK:", {tf: agg.version("NIFTY", tf) for tf in agg.timeframes})
@@ -0,0 +1,124 @@
+"""
+Phase 28.1 — Vectorised Charges Engine
+File: shared/charges_engine.py
+
+Brokerage, STT, exchange fee, SEBI fee, GST, stamp duty and slippage for
+arrays of fills (qty / price / side / segment) in one NumPy pass. One row
+of SCHEDULE_TABLE per segment; a fill gathers its row by segment code.
+
+  EQ_INTRADAY   the terminal's original calculate_charges schedule
+  EQ_DELIVERY   zero brokerage, STT both sides
+  FUTURES       STT on sell, 0.03 % / ₹20 brokerage cap
+  OPTIONS       flat ₹20 per order, STT on sell premium
+
+risk_engine.calculate_charges is a scalar wrapper over charges().
+"""
+
+import numpy as np
+
+# ==========================================================
+# ⚙️ SCHEDULES (rates are fractions of turnover)
+# ==========================================================
+SEGMENTS = ("EQ_INTRADAY", "EQ_DELIVERY", "FUTURES", "OPTIONS")
+FIELDS = ("brokerage_pct", "brokerage_cap", "brokerage_flat", "stt_buy", "stt_sell",
+          "exchange", "sebi", "stamp_buy", "gst", "slippage")
+SCHEDULES = {
+    "EQ_INTRADAY": {"brokerage_pct": 0.0003, "brokerage_cap": 20.0, "brokerage_flat": 0.0,
+                    "stt_buy": 0.00025, "stt_sell": 0.00025, "exchange": 0.0000345, "sebi": 0.0,
+                    "stamp_buy": 0.00015, "gst": 0.18, "slippage": 0.0005},
+    "EQ_DELIVERY": {"brokerage_pct": 0.0, "brokerage_cap": 0.0, "brokerage_flat": 0.0,
+                    "stt_buy": 0.001, "stt_sell": 0.001, "exchange": 0.0000345, "sebi": 0.000001,
+                    "stamp_buy": 0.00015, "gst": 0.18, "slippage": 0.0005},
+    "FUTURES": {"brokerage_pct": 0.0003, "brokerage_cap": 20.0, "brokerage_flat": 0.0,
+                "stt_buy": 0.0, "stt_sell": 0.0002, "exchange": 0.0000183, "sebi": 0.000001,
+                "stamp_buy": 0.00002, "gst": 0.18, "slippage": 0.0002},
+    "OPTIONS": {"brokerage_pct": 0.0, "brokerage_cap": 0.0, "brokerage_flat": 20.0,
+                "stt_buy": 0.0, "stt_sell": 0.001, "exchange": 0.0003503, "sebi": 0.000001,
+                "stamp_buy": 0.00003, "gst": 0.18, "slippage": 0.001},
+}
+SEGMENT_CODE = {name: i for i, name in enumerate(SEGMENTS)}
+SCHEDULE_TABLE = np.array([[SCHEDULES[s][f] for f in FIELDS] for s in SEGMENTS])
+_COL = {f: SCHEDULE_TABLE[:, i].copy() for i, f in enumerate(FIELDS)}
+
+
+def segment_codes(segment, n: int) -> np.ndarray:
+    """Segment name / code (scalar or array) → int code array of length n."""
+    if isinstance(segment, str):
+        return np.full(n, SEGMENT_CODE[segment.upper()], dtype=np.intp)
+    seg = np.asarray(segment)
+    if seg.ndim == 0:
+        return np.full(n, int(seg), dtype=np.intp)
+    if seg.dtype.kind in "iu":
+        return seg.astype(np.intp, copy=False)
+    names, inverse = np.unique(seg.astype(str), return_inverse=True)
+    lookup = np.array([SEGMENT_CODE[name.upper()] for name in names], dtype=np.intp)
+    return lookup[inverse]
+
+
+def buy_mask(side, n: int) -> np.ndarray:
+    """"BUY"/"SELL" strings, ±1 or booleans (scalar or array) → bool array (True = buy)."""
+    side = np.asarray(side)
+    if side.dtype.kind in "UO":
+        side = side.astype(str, copy=False)
+        mask = (side == "BUY") | (side == "buy") | (side == "Buy")
+    elif side.dtype.kind == "b":
+        mask = side
+    else:
+        mask = side > 0
+    return np.broadcast_to(mask, (n,))
+
+
+def charges(qty, price, side="BUY", segment="EQ_INTRADAY", breakdown: bool = False, decimals: int = 2):
+    """Total charges per fill (rounded like calculate_charges); breakdown=True → dict of components."""
+    qty = np.asarray(qty, dtype=np.float64)
+    price = np.asarray(price, dtype=np.float64)
+    turnover = qty * price
+    n = turnover.size if turnover.ndim else 1
+    turnover = turnover.reshape(n)
+    seg = segment_codes(segment, n)
+    is_buy = buy_mask(side, n)
+
+    pct_brokerage = np.minimum(_COL["brokerage_cap"][seg], _COL["brokerage_pct"][seg] * turnover)
+    flat = _COL["brokerage_flat"][seg]
+    brokerage = np.where(flat > 0, flat, pct_brokerage)
+    stt = np.where(is_buy, _COL["stt_buy"][seg], _COL["stt_sell"][seg]) * turnover
+    exchange = _COL["exchange"][seg] * turnover
+    sebi = _COL["sebi"][seg] * turnover
+    gst = _COL["gst"][seg] * (brokerage + exchange + sebi)
+    stamp = np.where(is_buy, _COL["stamp_buy"][seg] * turnover, 0.0)
+    slippage = _COL["slippage"][seg] * turnover
+    total = brokerage + stt + exchange + sebi + gst + stamp + slippage
+    if decimals is not None:
+        total = np.round(total, decimals)
+    if breakdown:
+        return {"brokerage": brokerage, "stt": stt, "exchange": exchange, "sebi": sebi,
+                "gst": gst, "stamp": stamp, "slippage": slippage, "total": total}
+    return total
+
+
+def round_trip_charges(qty, entry, exit_price, side="BUY", segment="EQ_INTRADAY") -> np.ndarray:
+    """Entry + exit leg charges for arrays of trades (exit leg takes the opposite side)."""
+    n = np.size(qty)
+    is_buy = buy_mask(side, n)
+    return charges(qty, entry, is_buy, segment) + charges(qty, exit_price, ~is_buy, segment)
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    one = charges(50, 22000.0, "BUY")
+    turnover = 50 * 22000.0
+    legacy = round(20 + 0.00025 * turnover + 0.0000345 * turnover + 0.18 * (20 + 0.0000345 * turnover)
+                   + 0.00015 * turnover + 0.0005 * turnover, 2)
+    assert float(one[0]) == legacy, (one, legacy)
+
+    qty = np.array([50, 50, 75, 75, 100])
+    px = np.array([22000.0, 22000.0, 22500.0, 120.0, 1500.0])
+    side = np.array(["BUY", "SELL", "SELL", "BUY", "SELL"])
+    seg = np.array(["EQ_INTRADAY", "EQ_INTRADAY", "FUTURES", "OPTIONS", "EQ_DELIVERY"])
+    parts = charges(qty, px, side, seg, breakdown=True)
+    assert parts["stamp"][1] == 0.0 and parts["brokerage"][3] == 20.0 and parts["brokerage"][4] == 0.0
+    assert parts["stt"][3] == 0.0 and np.isclose(parts["stt"][2], 0.0002 * 75 * 22500.0)
+    print("✅ Charges engine OK:", list(zip(seg.tolist(), parts["total"].tolist())),
+          "| round trip:", round_trip_charges(qty, px, px * 1.01, side, seg).round(2).tolist())
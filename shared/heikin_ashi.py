@@ -0,0 +1,146 @@
+"""
+Phase 26.3 — Heikin-Ashi Engine (Batch + Streaming)
+File: shared/heikin_ashi.py
+
+Single HA implementation for alerts and charts.
+  HA_Close[i] = (O + H + L + C) / 4
+  HA_Open[i]  = (HA_Open[i-1] + HA_Close[i-1]) / 2      (recursive, seeded (O0 + C0) / 2)
+  HA_High[i]  = max(H, HA_Open, HA_Close)
+  HA_Low[i]   = min(L, HA_Open, HA_Close)
+
+Batch mode solves the HA_Open recursion without a Python loop: it is a
+first-order filter with weight 0.5, so HA_Open[i] is a convolution of past
+HA_Close values with 0.5^m. Terms older than 64 bars are below float64
+resolution (0.5^64 ≈ 5e-20) and are dropped. Streaming mode keeps the
+last HA open/close and appends a bar in O(1).
+"""
+
+import numpy as np
+import pandas as pd
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+HA_COLUMNS = ("HA_Open", "HA_High", "HA_Low", "HA_Close")
+_HORIZON = 64
+_WEIGHTS = 0.5 ** np.arange(_HORIZON + 1)          # w[m] = 0.5^m
+_WEIGHTS[0] = 0.0                                   # HA_Open[i] uses bars < i only
+
+
+# ==========================================================
+# ⚡ BATCH MODE
+# ==========================================================
+def heikin_ashi(open_, high, low, close, seed=None):
+    """
+    Vectorised HA for whole arrays.
+    seed = (prev_ha_open, prev_ha_close) continues an existing series;
+    None seeds the first bar with (O0 + C0) / 2.
+    Returns (ha_open, ha_high, ha_low, ha_close) as float64 arrays.
+    """
+    o = np.asarray(open_, dtype=np.float64)
+    h = np.asarray(high, dtype=np.float64)
+    l = np.asarray(low, dtype=np.float64)
+    c = np.asarray(close, dtype=np.float64)
+    n = o.size
+    ha_close = (o + h + l + c) * 0.25
+    if n == 0:
+        return ha_close.copy(), ha_close.copy(), ha_close.copy(), ha_close
+
+    # x0 is the "virtual" HA_Open[0]; HA_Open[i] = 0.5^i x0 + Σ_{m=1..i} 0.5^m HA_Close[i-m]
+    if seed is None:
+        x0 = (o[0] + c[0]) * 0.5
+        ha_open = np.convolve(ha_close, _WEIGHTS)[:n]
+        k = min(n, _HORIZON + 1)                    # seed weight is negligible beyond the horizon
+        ha_open[:k] += x0 * 0.5 ** np.arange(k)
+    else:
+        prev_open, prev_close = seed
+        # prepend the previous bar so the recursion continues from it
+        ext = np.concatenate(([prev_close], ha_close))
+        ha_open = np.convolve(ext, _WEIGHTS)[1:n + 1]
+        k = min(n, _HORIZON + 1)
+        ha_open[:k] += prev_open * 0.5 ** np.arange(1, k + 1)
+
+    ha_high = np.maximum(np.maximum(h, ha_open), ha_close)
+    ha_low = np.minimum(np.minimum(l, ha_open), ha_close)
+    return ha_open, ha_high, ha_low, ha_close
+
+
+def heikin_ashi_frame(df: pd.DataFrame, seed=None) -> pd.DataFrame:
+    """OHLC frame → same rows plus HA_Open/HA_High/HA_Low/HA_Close (shallow copy)."""
+    out = df.copy(deep=False)
+    ha = heikin_ashi(df["open"].to_numpy(), df["high"].to_numpy(),
+                     df["low"].to_numpy(), df["close"].to_numpy(), seed)
+    for name, values in zip(HA_COLUMNS, ha):
+        out[name] = values
+    return out
+
+
+def extend_frame(ha_df: pd.DataFrame, df: pd.DataFrame, start) -> pd.DataFrame:
+    """
+    Recompute HA only for rows of df with index >= start (the changed tail),
+    seeding from ha_df's row just before start. Both frames share an index.
+    """
+    tail = df[df.index >= start]
+    head = ha_df[ha_df.index < start] if ha_df is not None else None
+    if head is None or head.empty:
+        return heikin_ashi_frame(df)
+    seed = (head["HA_Open"].iloc[-1], head["HA_Close"].iloc[-1])
+    head = head[head.index >= df.index[0]]
+    return pd.concat([head, heikin_ashi_frame(tail, seed)])
+
+
+# ==========================================================
+# 🔄 STREAMING MODE
+# ==========================================================
+class HeikinAshiState:
+    """O(1) per-bar HA. update() commits a closed bar; peek() previews the live bar."""
+
+    __slots__ = ("ha_open", "ha_close")
+
+    def __init__(self, ha_open: float = None, ha_close: float = None):
+        self.ha_open = ha_open
+        self.ha_close = ha_close
+
+    @classmethod
+    def from_frame(cls, ha_df: pd.DataFrame):
+        if ha_df.empty:
+            return cls()
+        return cls(float(ha_df["HA_Open"].iloc[-1]), float(ha_df["HA_Close"].iloc[-1]))
+
+    def peek(self, o: float, h: float, l: float, c: float):
+        ha_c = (o + h + l + c) * 0.25
+        ha_o = (o + c) * 0.5 if self.ha_open is None else (self.ha_open + self.ha_close) * 0.5
+        return ha_o, max(h, ha_o, ha_c), min(l, ha_o, ha_c), ha_c
+
+    def update(self, o: float, h: float, l: float, c: float):
+        bar = self.peek(o, h, l, c)
+        self.ha_open, self.ha_close = bar[0], bar[3]
+        return bar
+
+    @property
+    def seed(self):
+        return None if self.ha_open is None else (self.ha_open, self.ha_close)
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    rng = np.random.default_rng(7)
+    n = 5000
+    c = 22000 + np.cumsum(rng.standard_normal(n))
+    o = np.concatenate([[22000.0], c[:-1]])
+    h = np.maximum(o, c) + rng.random(n) * 5
+    l = np.minimum(o, c) - rng.random(n) * 5
+
+    state = HeikinAshiState()
+    ref = np.array([state.update(*bar) for bar in zip(o, h, l, c)])
+    batch = np.column_stack(heikin_ashi(o, h, l, c))
+    assert np.allclose(ref, batch, rtol=0, atol=1e-8)
+
+    # continuing from a seed equals computing the whole series at once
+    cut = 3000
+    first = heikin_ashi(o[:cut], h[:cut], l[:cut], c[:cut])
+    rest = heikin_ashi(o[cut:], h[cut:], l[cut:], c[cut:], seed=(first[0][-1], first[3][-1]))
+    assert np.allclose(np.concatenate([first[0], rest[0]]), batch[:, 0], atol=1e-8)
+    print("✅ Heikin-Ashi batch == streaming on", n, "bars")
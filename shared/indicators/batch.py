@@ -0,0 +1,142 @@
+"""
+Phase 26.4 — Indicator Library (Batch API)
+File: shared/indicators/batch.py
+
+Vectorised indicators over whole NumPy arrays (history, scanners, backtests).
+Every function has an O(1)-per-bar twin in shared/indicators/streaming.py
+that produces the same numbers bar by bar.
+
+Conventions shared with the streaming API:
+  • EMA seeds with the first value (pandas ewm adjust=False).
+  • Wilder smoothing (RSI / ATR / ADX) is an EMA with alpha = 1/n.
+  • Warm-up bars are NaN.
+"""
+
+import numpy as np
+import pandas as pd
+
+IST_OFFSET = 19800      # seconds; NSE sessions are IST calendar days
+
+
+# ==========================================================
+# 🔧 HELPERS
+# ==========================================================
+def _f64(x):
+    return np.asarray(x, dtype=np.float64)
+
+
+def _ewm(x, alpha: float):
+    """Recursive EMA (C loop via pandas); leading NaNs are skipped, first value seeds."""
+    return pd.Series(x).ewm(alpha=alpha, adjust=False).mean().to_numpy(copy=True)
+
+
+def _warmup(x, n: int):
+    x[:max(0, min(n, x.size))] = np.nan
+    return x
+
+
+def session_ids(times, offset: int = IST_OFFSET):
+    """Epoch seconds → integer trading-day id (for VWAP resets)."""
+    return (np.asarray(times, dtype=np.int64) + offset) // 86400
+
+
+def _session_cumsum(x, session):
+    cs = np.cumsum(x)
+    if session is None:
+        return cs
+    session = np.asarray(session)
+    starts = np.flatnonzero(session[1:] != session[:-1]) + 1
+    base = np.zeros(x.size)
+    if starts.size:
+        gid = np.zeros(x.size, dtype=np.int64)
+        gid[starts] = 1
+        gid = np.cumsum(gid)
+        base = np.concatenate(([0.0], cs[starts - 1]))[gid]
+    return cs - base
+
+
+# ==========================================================
+# 📈 MOVING AVERAGES
+# ==========================================================
+def sma(x, n: int):
+    return pd.Series(_f64(x)).rolling(n).mean().to_numpy(copy=True)
+
+
+def ema(x, n: int):
+    return _ewm(_f64(x), 2.0 / (n + 1))
+
+
+# ==========================================================
+# ⚡ MOMENTUM
+# ==========================================================
+def rsi(close, n: int = 14):
+    c = _f64(close)
+    d = np.diff(c, prepend=np.nan)
+    gain = _ewm(np.where(d > 0, d, 0.0) + d * 0, 1.0 / n)      # d*0 keeps the leading NaN
+    loss = _ewm(np.where(d < 0, -d, 0.0) + d * 0, 1.0 / n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gain / loss)
+    out = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), out)
+    return _warmup(out, n)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    """Returns (macd_line, signal_line, histogram)."""
+    c = _f64(close)
+    line = ema(c, fast) - ema(c, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+# ==========================================================
+# 📏 VOLATILITY / TREND
+# ==========================================================
+def true_range(high, low, close):
+    h, l, c = _f64(high), _f64(low), _f64(close)
+    prev = np.concatenate(([np.nan], c[:-1]))
+    tr = np.fmax(h - l, np.fmax(np.abs(h - prev), np.abs(l - prev)))
+    return tr
+
+
+def atr(high, low, close, n: int = 14):
+    return _warmup(_ewm(true_range(high, low, close), 1.0 / n), n - 1)
+
+
+def adx(high, low, close, n: int = 14):
+    """Returns (adx, plus_di, minus_di)."""
+    h, l = _f64(high), _f64(low)
+    up = np.diff(h, prepend=np.nan)
+    dn = -np.diff(l, prepend=np.nan)
+    plus_dm = np.where((up > dn) & (up > 0), up, 0.0) + up * 0
+    minus_dm = np.where((dn > up) & (dn > 0), dn, 0.0) + dn * 0
+    tr = true_range(h, l, close)
+    tr[0] = np.nan
+    a = 1.0 / n
+    s_tr = _ewm(tr, a)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = np.where(s_tr > 0, 100.0 * _ewm(plus_dm, a) / s_tr, 0.0)
+        minus_di = np.where(s_tr > 0, 100.0 * _ewm(minus_dm, a) / s_tr, 0.0)
+        total = plus_di + minus_di
+        dx = np.where(total > 0, 100.0 * np.abs(plus_di - minus_di) / total, 0.0)
+    dx[0] = np.nan
+    out = _ewm(dx, a)
+    return _warmup(out, 2 * n - 1), _warmup(plus_di, n), _warmup(minus_di, n)
+
+
+def psar(high, low, close, step: float = 0.02, max_step: float = 0.2):
+    """Parabolic SAR. Path-dependent reversals → tight loop over the streaming state."""
+    from shared.indicators.streaming import PSAR
+    state = PSAR(step, max_step)
+    h, l, c = _f64(high).tolist(), _f64(low).tolist(), _f64(close).tolist()
+    return np.fromiter((state.update(hi, lo, cl) for hi, lo, cl in zip(h, l, c)),
+                       dtype=np.float64, count=len(h))
+
+
+def vwap(high, low, close, volume, session=None):
+    """Session VWAP; `session` is a per-bar id (see session_ids) or None for cumulative."""
+    tp = (_f64(high) + _f64(low) + _f64(close)) / 3.0
+    v = _f64(volume)
+    pv = _session_cumsum(tp * v, session)
+    cv = _session_cumsum(v, session)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cv > 0, pv / cv, tp)
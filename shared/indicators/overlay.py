@@ -0,0 +1,53 @@
+"""
+Phase 26.4 — Indicator Library (Chart Overlay Registry)
+File: shared/indicators/overlay.py
+
+Maps the overlay names offered by chart_layout_panel's Indicators panel
+to batch computations on an OHLCV frame.
+"""
+
+import numpy as np
+
+from shared.indicators import batch
+
+# ==========================================================
+# 📋 REGISTRY
+# ==========================================================
+OVERLAY_NAMES = ["SMA 10", "SMA 21", "SMA 50", "SMA 200", "RSI", "MACD", "PSAR", "ADX", "VWAP"]
+PRICE_OVERLAYS = {"SMA 10", "SMA 21", "SMA 50", "SMA 200", "PSAR", "VWAP"}   # drawn on the price pane
+OVERLAY_COLORS = {
+    "SMA 10": "#ffb300", "SMA 21": "#8e24aa", "SMA 50": "#1e88e5",
+    "SMA 200": "#6d4c41", "PSAR": "#00897b", "VWAP": "#f4511e",
+}
+
+
+def compute_overlay(df, name: str) -> dict:
+    """Return {series_name: ndarray} for one overlay on an OHLCV frame."""
+    h, l, c = df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy()
+    if name.startswith("SMA"):
+        return {name: batch.sma(c, int(name.split()[1]))}
+    if name == "RSI":
+        return {"RSI": batch.rsi(c, 14)}
+    if name == "MACD":
+        line, sig, hist = batch.macd(c)
+        return {"MACD": line, "Signal": sig, "Hist": hist}
+    if name == "PSAR":
+        return {"PSAR": batch.psar(h, l, c)}
+    if name == "ADX":
+        adx, pdi, mdi = batch.adx(h, l, c, 14)
+        return {"ADX": adx, "+DI": pdi, "-DI": mdi}
+    if name == "VWAP":
+        vol = df["volume"].to_numpy() if "volume" in df else np.ones(len(df))
+        session = None
+        if "time" in df:
+            epoch = df["time"].to_numpy().astype("datetime64[s]").astype(np.int64)
+            session = batch.session_ids(epoch)
+        return {"VWAP": batch.vwap(h, l, c, vol, session)}
+    raise KeyError(f"Unknown overlay: {name}")
+
+
+def compute_overlays(df, names) -> dict:
+    out = {}
+    for name in names:
+        out[name] = compute_overlay(df, name)
+    return out
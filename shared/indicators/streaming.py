@@ -0,0 +1,246 @@
+"""
+Phase 26.4 — Indicator Library (Streaming API)
+File: shared/indicators/streaming.py
+
+Incremental state objects: update() consumes one closed bar in O(1) and
+returns the current value (NaN during warm-up). Numbers match
+shared/indicators/batch.py bar for bar — see the smoke test below.
+"""
+
+import math
+from collections import deque
+
+NAN = float("nan")
+
+
+# ==========================================================
+# 📈 MOVING AVERAGES
+# ==========================================================
+class SMA:
+    __slots__ = ("n", "window", "total")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.window = deque(maxlen=n)
+        self.total = 0.0
+
+    def update(self, x: float) -> float:
+        if len(self.window) == self.n:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        return self.total / self.n if len(self.window) == self.n else NAN
+
+
+class EMA:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, n: int = None, alpha: float = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (n + 1)
+        self.value = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+def Wilder(n: int) -> EMA:
+    return EMA(alpha=1.0 / n)
+
+
+# ==========================================================
+# ⚡ MOMENTUM
+# ==========================================================
+class RSI:
+    __slots__ = ("n", "gain", "loss", "prev", "count")
+
+    def __init__(self, n: int = 14):
+        self.n = n
+        self.gain = Wilder(n)
+        self.loss = Wilder(n)
+        self.prev = None
+        self.count = 0
+
+    def update(self, close: float) -> float:
+        self.count += 1
+        if self.prev is None:
+            self.prev = close
+            return NAN
+        d = close - self.prev
+        self.prev = close
+        g = self.gain.update(d if d > 0 else 0.0)
+        l = self.loss.update(-d if d < 0 else 0.0)
+        if self.count <= self.n:
+            return NAN
+        if l == 0:
+            return 50.0 if g == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + g / l)
+
+
+class MACD:
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast, self.slow, self.signal = EMA(fast), EMA(slow), EMA(signal)
+
+    def update(self, close: float):
+        line = self.fast.update(close) - self.slow.update(close)
+        sig = self.signal.update(line)
+        return line, sig, line - sig
+
+
+# ==========================================================
+# 📏 VOLATILITY / TREND
+# ==========================================================
+class ATR:
+    __slots__ = ("n", "avg", "prev_close", "count")
+
+    def __init__(self, n: int = 14):
+        self.n = n
+        self.avg = Wilder(n)
+        self.prev_close = None
+        self.count = 0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self.prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.count += 1
+        value = self.avg.update(tr)
+        return value if self.count >= self.n else NAN
+
+
+class ADX:
+    __slots__ = ("n", "tr", "pdm", "mdm", "adx", "prev", "count")
+
+    def __init__(self, n: int = 14):
+        self.n = n
+        self.tr, self.pdm, self.mdm, self.adx = Wilder(n), Wilder(n), Wilder(n), Wilder(n)
+        self.prev = None
+        self.count = 0
+
+    def update(self, high: float, low: float, close: float):
+        """Returns (adx, plus_di, minus_di)."""
+        self.count += 1
+        if self.prev is None:
+            self.prev = (high, low, close)
+            return NAN, NAN, NAN
+        ph, pl, pc = self.prev
+        self.prev = (high, low, close)
+        up, dn = high - ph, pl - low
+        tr = self.tr.update(max(high - low, abs(high - pc), abs(low - pc)))
+        pdm = self.pdm.update(up if (up > dn and up > 0) else 0.0)
+        mdm = self.mdm.update(dn if (dn > up and dn > 0) else 0.0)
+        plus_di = 100.0 * pdm / tr if tr > 0 else 0.0
+        minus_di = 100.0 * mdm / tr if tr > 0 else 0.0
+        total = plus_di + minus_di
+        value = self.adx.update(100.0 * abs(plus_di - minus_di) / total if total > 0 else 0.0)
+        if self.count <= self.n:
+            return NAN, NAN, NAN
+        return (value if self.count >= 2 * self.n else NAN), plus_di, minus_di
+
+
+class PSAR:
+    __slots__ = ("step", "max_step", "trend", "sar", "ep", "af", "bars")
+
+    def __init__(self, step: float = 0.02, max_step: float = 0.2):
+        self.step, self.max_step = step, max_step
+        self.trend = 0
+        self.sar = self.ep = NAN
+        self.af = step
+        self.bars = deque(maxlen=2)     # (high, low, close) of the last two bars
+
+    def update(self, high: float, low: float, close: float) -> float:
+        bars = self.bars
+        if not bars:
+            bars.append((high, low, close))
+            return NAN
+        if self.trend == 0:
+            h0, l0, c0 = bars[-1]
+            self.trend = 1 if close >= c0 else -1
+            self.sar = l0 if self.trend == 1 else h0
+            self.ep = high if self.trend == 1 else low
+            bars.append((high, low, close))
+            return self.sar
+
+        sar = self.sar + self.af * (self.ep - self.sar)
+        if self.trend == 1:
+            sar = min(sar, *(b[1] for b in bars))
+            if low < sar:
+                self.trend, sar, self.ep, self.af = -1, self.ep, low, self.step
+            elif high > self.ep:
+                self.ep, self.af = high, min(self.af + self.step, self.max_step)
+        else:
+            sar = max(sar, *(b[0] for b in bars))
+            if high > sar:
+                self.trend, sar, self.ep, self.af = 1, self.ep, high, self.step
+            elif low < self.ep:
+                self.ep, self.af = low, min(self.af + self.step, self.max_step)
+        self.sar = sar
+        bars.append((high, low, close))
+        return sar
+
+
+class VWAP:
+    __slots__ = ("session", "pv", "v")
+
+    def __init__(self):
+        self.session = None
+        self.pv = 0.0
+        self.v = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float, session=None) -> float:
+        if session != self.session:
+            self.session, self.pv, self.v = session, 0.0, 0.0
+        tp = (high + low + close) / 3.0
+        self.pv += tp * volume
+        self.v += volume
+        return self.pv / self.v if self.v > 0 else tp
+
+
+# ==========================================================
+# 🧪 SMOKE TEST — streaming == batch
+# ==========================================================
+if __name__ == "__main__":
+    import numpy as np
+    from shared.indicators import batch
+
+    rng = np.random.default_rng(7)
+    n = 20_000
+    c = 22000 + np.cumsum(rng.standard_normal(n) * 5)
+    o = np.concatenate([[22000.0], c[:-1]])
+    h = np.maximum(o, c) + rng.random(n) * 8
+    l = np.minimum(o, c) - rng.random(n) * 8
+    v = rng.integers(100, 5000, n).astype(float)
+    t = 1_700_000_000 + np.arange(n) * 60
+    sess = batch.session_ids(t)
+    bars = list(zip(h.tolist(), l.tolist(), c.tolist(), v.tolist(), sess.tolist()))
+
+    def check(name, streamed, expected):
+        ok = np.allclose(np.asarray(streamed, dtype=float), expected, rtol=1e-9, atol=1e-6, equal_nan=True)
+        print(("✅" if ok else "❌"), name)
+        assert ok, name
+
+    for period in (10, 21, 50, 200):
+        s = SMA(period)
+        check(f"SMA {period}", [s.update(x) for x in c.tolist()], batch.sma(c, period))
+    e = EMA(21)
+    check("EMA 21", [e.update(x) for x in c.tolist()], batch.ema(c, 21))
+    r = RSI(14)
+    check("RSI 14", [r.update(x) for x in c.tolist()], batch.rsi(c, 14))
+    m = MACD()
+    check("MACD", [m.update(x) for x in c.tolist()], np.column_stack(batch.macd(c)))
+    a = ATR(14)
+    check("ATR 14", [a.update(hi, lo, cl) for hi, lo, cl, _, _ in bars], batch.atr(h, l, c, 14))
+    d = ADX(14)
+    check("ADX 14", [d.update(hi, lo, cl) for hi, lo, cl, _, _ in bars], np.column_stack(batch.adx(h, l, c, 14)))
+    w = VWAP()
+    check("VWAP", [w.update(hi, lo, cl, vo, se) for hi, lo, cl, vo, se in bars], batch.vwap(h, l, c, v, sess))
+    p = PSAR()
+    check("PSAR", [p.update(hi, lo, cl) for hi, lo, cl, _, _ in bars], batch.psar(h, l, c))
+    assert not math.isnan(batch.psar(h, l, c)[-1])
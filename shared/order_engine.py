@@ -4,58 +4,99 @@
 # ==============================================================
 
 import streamlit as st
-import pandas as pd
-import json
 import time
 from datetime import datetime
 import os
+import threading
+import uuid
+
+from shared.strategy_engine.execution_manager import get_paper_engine
+from shared.strategy_engine.order_router import (FINAL_STATES, build_order, fyers_payload, get_order_router,
+                                                 idempotency_key)
+from shared.strategy_engine.risk_controller import get_risk_controller
+from shared.state_engine.snapshot_engine import get_order_journal
+from shared.trade_ledger import DEFAULT_TRADE_LOG, get_ledger
 
 # ==============================================================
 # ⚙️ ORDER VALIDATION
 # ==============================================================
 def validate_order(order, risk_limits):
-    """Validate quantity, risk, and daily loss before order execution."""
+    """Pre-trade checks via the compiled risk controller (rules from risk_rules.json, risk_limits per call)."""
     if not risk_limits:
         return True, "OK"
 
-    if order["risk_pct"] > risk_limits.get("max_risk_pct", 2):
-        return False, "❌ Exceeds max risk %"
-
-    if risk_limits.get("daily_loss", 0) + order["expected_loss"] > risk_limits.get("max_daily_loss", 10000):
-        return False, "❌ Exceeds daily loss limit"
-
-    if order["qty"] <= 0:
-        return False, "❌ Invalid quantity"
-
-    return True, "OK"
+    return get_risk_controller().check(order, daily_loss=risk_limits.get("daily_loss"), limits=risk_limits)
 
 
 # ==============================================================
 # 🧾 PAPER TRADE EXECUTION
 # ==============================================================
 def execute_paper_trade(order):
-    """Simulate paper trade for testing (instant execution)."""
+    """Send a paper order to the tick-driven matcher; the matcher logs each fill to the ledger."""
+    engine = get_paper_engine()
+
+    order_type = order.get("order_type", "MARKET")
+    order_id = engine.submit(
+        order["symbol"], order["side"], order["qty"], order_type,
+        price=order.get("price") if order_type in ("LIMIT", "STOP") else None,
+        trigger=order.get("trigger"),
+        tag={"symbol": order["symbol"], "sl": order.get("sl", 0.0), "target": order.get("target", 0.0)},
+    )
     trade = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "order_id": order_id,
         "symbol": order["symbol"],
         "side": order["side"],
         "qty": order["qty"],
+        "order_type": order_type,
         "entry": order["price"],
         "sl": order.get("sl", 0.0),
         "target": order.get("target", 0.0),
         "mode": "Paper",
-        "status": "Executed",
+        "status": engine.orders[order_id].status,
     }
-    _log_trade(trade)
-    st.success(f"🧾 Paper Trade Executed → {order['side']} {order['symbol']} @ {order['price']}")
+    if trade["status"] == "REJECTED":
+        st.error(f"❌ Paper order rejected → {order['side']} {order['symbol']}")
+    else:
+        st.success(f"🧾 Paper Order #{order_id} Sent → {order['side']} {order['symbol']} ({order_type})")
     return trade
 
 
 # ==============================================================
-# 🚀 REAL TRADE EXECUTION (WITH SAFETY + SNAPSHOT)
+# 🚀 REAL TRADE EXECUTION (WITH SAFETY + ORDER JOURNAL)
 # ==============================================================
+# In-flight real orders: order digest (content + session) → idempotency key.
+# A rerun for the same order re-joins its ticket; the ack listener drops the
+# entry, so the next order — even an identical one — gets a fresh key.
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+_ACK_ROUTERS = set()            # id() of routers that already have _on_real_ack
+
+
+def _order_digest(order):
+    session = st.session_state.setdefault("order_session", uuid.uuid4().hex)
+    fields = {k: order.get(k) for k in ("symbol", "side", "qty", "price", "sl", "target")}
+    return idempotency_key({**fields, "session": session})
+
+
+def _report_settled(router):
+    """Show each of this session's finished real orders once, then release its ticket."""
+    pending = st.session_state.setdefault("real_order_keys", [])
+    for key in list(pending):
+        ticket = router.ticket(key)
+        if ticket is None or ticket.state not in FINAL_STATES:
+            continue
+        order = ticket.tag or {}
+        if ticket.state == "acked":
+            st.success(f"✅ Real Trade Placed → {order.get('side')} {order.get('symbol')} ({ticket.response})")
+        else:
+            st.error(f"❌ Order Failed: {ticket.response}")
+        pending.remove(key)
+        router.forget(key)
+
+
 def execute_real_trade(order, fyers=None):
-    """Execute real trade via FYERS API with confirmation & snapshot."""
+    """Queue a real trade on the async order router (confirmation, idempotency key, journalled lifecycle)."""
     if fyers is None:
         st.error("❌ Fyers API not connected.")
         return None
@@ -68,46 +109,59 @@ def execute_real_trade(order, fyers=None):
         st.info("⚠️ Trade cancelled — user confirmation required.")
         return None
 
-    try:
-        order_payload = {
-            "symbol": order["symbol"],
-            "qty": order["qty"],
-            "type": 2 if order["side"] == "BUY" else 3,
-            "side": 1 if order["side"] == "BUY" else -1,
-            "limitPrice": order.get("price", 0),
-            "stopPrice": order.get("sl", 0),
-            "validity": "DAY",
-            "offlineOrder": "false",
-        }
-
-        response = fyers.place_order(order_payload)
-
-        # Log trade
-        trade_data = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "symbol": order["symbol"],
-            "side": order["side"],
-            "qty": order["qty"],
-            "entry": order.get("price", 0),
-            "sl": order.get("sl", 0),
-            "target": order.get("target", 0),
-            "mode": "Real",
-            "status": "Executed",
-        }
-        _log_trade(trade_data)
-
-        # Save safety snapshot
-        snapshot_path = "Streamlit_TradingSystems/System_2_TradingTerminal/snapshots/phase_5_3_0_order_freeze.json"
-        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
-        with open(snapshot_path, "w", encoding="utf-8") as f:
-            json.dump({"last_real_trade": trade_data}, f, indent=2)
-
-        st.success(f"✅ Real Trade Placed → {order['side']} {order['symbol']} ({response})")
-        return response
-    except Exception as e:
-        _log_error(f"Real order failed: {e}")
-        st.error(f"❌ Order Failed: {e}")
-        return None
+    order_payload = fyers_payload(order)
+
+    router = get_order_router(fyers)
+    with _INFLIGHT_LOCK:
+        if id(router) not in _ACK_ROUTERS:
+            router.add_listener(_on_real_ack)
+            _ACK_ROUTERS.add(id(router))
+    _report_settled(router)
+
+    # One idempotency key per order until its ack: reruns re-join the same ticket
+    digest = _order_digest(order)
+    with _INFLIGHT_LOCK:
+        key = _INFLIGHT.get(digest)
+        fresh = key is None
+        if fresh:
+            key = _INFLIGHT[digest] = f"{order['symbol']}-{uuid.uuid4().hex}"
+    if fresh:
+        get_order_journal().record(key, "submitted", symbol=order["symbol"], side=order["side"],
+                                   qty=order["qty"], price=order.get("price", 0), sl=order.get("sl", 0),
+                                   target=order.get("target", 0), mode="Real")
+        st.session_state.setdefault("real_order_keys", []).append(key)
+        router.submit_threadsafe(order_payload, key, tag=order)
+        st.info(f"📨 Real order queued → {order['side']} {order['symbol']} (key {key[-8:]})")
+        return {"key": key, "state": "queued"}
+
+    ticket = router.ticket(key)
+    st.info(f"⏳ Awaiting broker ack → {order['side']} {order['symbol']} ({ticket.state if ticket else 'queued'})")
+    return ticket.as_dict() if ticket else {"key": key, "state": "queued"}
+
+
+def _on_real_ack(ticket):
+    """Router listener (router thread): release the key, journal the outcome, log acked trades / failures."""
+    with _INFLIGHT_LOCK:
+        for digest in [d for d, k in _INFLIGHT.items() if k == ticket.key]:
+            del _INFLIGHT[digest]
+    get_order_journal().record(ticket.key, ticket.state, broker_id=ticket.broker_id,
+                               attempts=ticket.attempts, response=ticket.response)
+    order = ticket.tag or {}
+    if ticket.state != "acked":
+        _log_error(f"Real order failed: {ticket.response}")
+        return
+    _log_trade({
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "symbol": order.get("symbol"),
+        "side": order.get("side"),
+        "qty": order.get("qty"),
+        "entry": order.get("price", 0),
+        "sl": order.get("sl", 0),
+        "target": order.get("target", 0),
+        "mode": "Real",
+        "status": "Executed",
+        "order_id": ticket.broker_id,
+    })
 
 
 # ==============================================================
@@ -115,16 +169,7 @@ def execute_real_trade(order, fyers=None):
 # ==============================================================
 def place_order(symbol, side, qty, price, sl, target, mode="Paper", fyers=None, risk_limits=None):
     """Unified handler for both Paper and Real trades."""
-    order = {
-        "symbol": symbol,
-        "side": side.upper(),
-        "qty": qty,
-        "price": price,
-        "sl": sl,
-        "target": target,
-        "risk_pct": 1.0,
-        "expected_loss": abs(price - sl) * qty,
-    }
+    order = build_order(symbol, side, qty, price, sl, target)
 
     valid, msg = validate_order(order, risk_limits)
     if not valid:
@@ -148,13 +193,8 @@ def place_order(symbol, side, qty, price, sl, target, mode="Paper", fyers=None,
 # 🧮 LOGGING UTILITIES
 # ==============================================================
 def _log_trade(trade):
-    log_path = "Streamlit_TradingSystems/System_2_TradingTerminal/logs/trade_logs.csv"
-    os.makedirs(os.path.dirname(log_path), exist_ok=True)
-    df = pd.DataFrame([trade])
-    if os.path.exists(log_path):
-        df.to_csv(log_path, mode="a", header=False, index=False)
-    else:
-        df.to_csv(log_path, index=False)
+    """Durable O(1) append to the trade ledger (legacy CSV is imported on first use)."""
+    return get_ledger(DEFAULT_TRADE_LOG).append(trade)
 
 
 def _log_error(message):
@@ -0,0 +1,255 @@
+"""
+Phase 27.2 — Incremental Position Book
+File: shared/position_book.py
+
+Per-symbol net qty / average price / realised and unrealised P&L, updated
+on every fill and marked to market from the tick feed. Portfolio totals
+(exposure, realised, unrealised, daily loss) are adjusted by each event's
+delta, so risk reads are O(1) instead of a trade-log parse per rerun.
+
+Fills come from the trade ledger listener (open row → entry fill, exit
+written → closing fill); marks come from the MockTickFeed listener.
+Daily figures cover the current session only: a replay counts earlier
+days' rows toward positions but not toward the day's P&L, and the live
+book (roll_daily=True) resets them when the date changes.
+"""
+
+import threading
+from datetime import date
+
+from shared.strategy_engine.data_feed_bridge import feed_symbol
+
+SIDE_SIGN = {"BUY": 1, "SELL": -1}
+
+
+# ==========================================================
+# 📦 ONE SYMBOL
+# ==========================================================
+class Position:
+    __slots__ = ("symbol", "qty", "avg_price", "realized", "last_price", "charges")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.qty = 0                # signed: long > 0, short < 0
+        self.avg_price = 0.0
+        self.realized = 0.0
+        self.last_price = 0.0
+        self.charges = 0.0
+
+    @property
+    def unrealized(self) -> float:
+        return (self.last_price - self.avg_price) * self.qty if self.qty else 0.0
+
+    @property
+    def exposure(self) -> float:
+        return abs(self.qty) * self.last_price
+
+    def as_dict(self) -> dict:
+        return {"symbol": self.symbol, "net_qty": self.qty, "avg_price": round(self.avg_price, 2),
+                "last_price": self.last_price, "realized": round(self.realized, 2),
+                "unrealized": round(self.unrealized, 2), "charges": round(self.charges, 2)}
+
+
+# ==========================================================
+# 📚 BOOK
+# ==========================================================
+class PositionBook:
+    """Fill- and tick-driven positions with O(1) portfolio totals."""
+
+    def __init__(self, roll_daily: bool = False):
+        self.roll_daily = roll_daily            # reset day figures when the wall-clock date changes
+        self.session = date.today().isoformat()
+        self.positions = {}
+        self.realized = 0.0
+        self.unrealized = 0.0
+        self.exposure = 0.0
+        self.charges = 0.0
+        self.open_count = 0
+        self.version = 0
+        self._lock = threading.Lock()
+
+    # ---------- delta bookkeeping ----------
+    def _detach(self, pos: Position):
+        self.unrealized -= pos.unrealized
+        self.exposure -= pos.exposure
+        self.open_count -= pos.qty != 0
+
+    def _attach(self, pos: Position):
+        self.unrealized += pos.unrealized
+        self.exposure += pos.exposure
+        self.open_count += pos.qty != 0
+        self.version += 1
+
+    # ---------- events ----------
+    def on_fill(self, symbol: str, side: str, qty: float, price: float, charges: float = 0.0):
+        """Average-cost accounting; closing quantity realises (price − avg) · qty. Zero-qty fills are ignored."""
+        if not qty:
+            return
+        self._roll()
+        key = feed_symbol(symbol)
+        fill = SIDE_SIGN[side.upper()] * qty
+        with self._lock:
+            pos = self.positions.get(key)
+            if pos is None:
+                pos = self.positions[key] = Position(key)
+            self._detach(pos)
+            q, avg = pos.qty, pos.avg_price
+            if q == 0 or (q > 0) == (fill > 0):
+                pos.avg_price = (avg * abs(q) + price * abs(fill)) / abs(q + fill)
+            else:
+                closed = min(abs(q), abs(fill))
+                pnl = (price - avg) * closed * (1 if q > 0 else -1)
+                pos.realized += pnl
+                self.realized += pnl
+                if q + fill == 0:
+                    pos.avg_price = 0.0
+                elif (q + fill > 0) != (q > 0):
+                    pos.avg_price = price                 # flipped through flat
+            pos.qty = q + fill
+            pos.last_price = pos.last_price or price
+            pos.charges += charges
+            self.charges += charges
+            self._attach(pos)
+
+    def mark(self, symbol: str, price: float):
+        pos = self.positions.get(symbol)
+        if pos is None:
+            return
+        with self._lock:
+            self._detach(pos)
+            pos.last_price = price
+            self._attach(pos)
+
+    def on_ticks(self, ticks, ts: float):
+        """MockTickFeed listener: marks only symbols we hold."""
+        for symbol, price, _ in ticks:
+            if symbol in self.positions:
+                self.mark(symbol, price)
+
+    def on_ledger(self, row: dict, prev: dict = None):
+        """TradeLedger listener: new row → entry fill; exit written → closing fill."""
+        if prev is None:
+            self.on_fill(row["symbol"], row["side"], row["qty"], row["entry"], row.get("charges", 0.0))
+        if row.get("exit") is not None and (prev is None or prev.get("exit") is None):
+            close_side = "SELL" if row["side"].upper() == "BUY" else "BUY"
+            self.on_fill(row["symbol"], close_side, row["qty"], row["exit"])
+
+    def replay(self, ledger, today: str = None):
+        """Rebuild from the ledger: earlier days set the carried positions, only today's rows count as day P&L."""
+        today = today or date.today().isoformat()
+        todays = set(ledger.ids(date=today))
+        for row in ledger.rows([tid for tid in ledger.ids() if tid not in todays]):
+            self.on_ledger(row)
+        self.reset_day(today)
+        for row in ledger.rows(sorted(todays)):
+            self.on_ledger(row)
+        return self
+
+    def reset_day(self, session: str = None):
+        """Start a new session: keep positions, zero the day's realised P&L and charges."""
+        with self._lock:
+            for pos in self.positions.values():
+                pos.realized = pos.charges = 0.0
+            self.realized = self.charges = 0.0
+            self.session = session or date.today().isoformat()
+            self.version += 1
+
+    def _roll(self):
+        if self.roll_daily and date.today().isoformat() != self.session:
+            self.reset_day()
+
+    # ---------- reads (O(1)) ----------
+    @property
+    def daily_pnl(self) -> float:
+        self._roll()
+        return self.realized + self.unrealized - self.charges
+
+    @property
+    def daily_loss(self) -> float:
+        return max(0.0, -self.daily_pnl)
+
+    def snapshot(self, capital: float = 0.0, max_daily_loss: float = None) -> dict:
+        snap = {
+            "open_positions": self.open_count,
+            "margin_used": round(self.exposure, 2),
+            "exposure_pct": round(self.exposure / capital * 100, 2) if capital > 0 else 0,
+            "realized": round(self.realized, 2),
+            "unrealized": round(self.unrealized, 2),
+            "charges": round(self.charges, 2),
+            "daily_pnl": round(self.daily_pnl, 2),
+            "daily_loss": round(self.daily_loss, 2),
+            "version": self.version,
+        }
+        if max_daily_loss is not None:
+            snap["trade_allowed"] = self.daily_loss < max_daily_loss
+        return snap
+
+    def rows(self) -> list:
+        return [p.as_dict() for p in self.positions.values() if p.qty or p.realized]
+
+
+_BOOKS = {}
+_BOOKS_LOCK = threading.Lock()
+
+
+def get_position_book(trade_logs_path: str = None) -> PositionBook:
+    """Process-wide book for a trade ledger: replayed once, then fed by ledger + tick listeners."""
+    from shared.trade_ledger import DEFAULT_TRADE_LOG, get_ledger
+    from shared.strategy_engine.data_feed_bridge import get_feed
+    path = trade_logs_path or DEFAULT_TRADE_LOG
+    with _BOOKS_LOCK:
+        book = _BOOKS.get(path)
+        if book is None:
+            ledger = get_ledger(path)
+            book = _BOOKS[path] = PositionBook(roll_daily=True).replay(ledger)
+            ledger.add_listener(book.on_ledger)
+            get_feed().add_listener(book.on_ticks)
+    return book
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    import time
+
+    book = PositionBook()
+    book.on_fill("NSE:NIFTY50", "BUY", 50, 22000.0, charges=20.0)
+    book.on_fill("NIFTY", "BUY", 50, 22100.0)
+    assert book.positions["NIFTY"].avg_price == 22050.0
+    book.on_fill("NIFTY", "SELL", 60, 22150.0)                      # close 60 → realise 100·60
+    assert book.realized == 6000.0 and book.positions["NIFTY"].qty == 40
+    book.on_fill("NIFTY", "SELL", 70, 22200.0)                      # close 40, flip short 30
+    assert book.positions["NIFTY"].qty == -30 and book.positions["NIFTY"].avg_price == 22200.0
+    book.on_fill("TCS", "BUY", 0, 3800.0)                           # zero-qty fill on a flat symbol
+    assert "TCS" not in book.positions
+    book.on_ticks([("NIFTY", 22250.0, 1)], 0)
+    assert book.unrealized == -1500.0 and book.exposure == 30 * 22250.0
+    assert book.daily_pnl == 6000.0 + 150 * 40 - 1500.0 - 20.0
+
+    import tempfile
+    from shared.trade_ledger import TradeLedger
+    led = TradeLedger(tempfile.mkdtemp(prefix="book_"), fsync=False)
+    led.append({"timestamp": "2024-05-01 10:00:00", "symbol": "INFY", "side": "BUY", "qty": 10, "entry": 100.0})
+    led.update(1, exit=90.0, status="Closed")                       # yesterday's loss
+    led.append({"timestamp": "2024-05-01 11:00:00", "symbol": "TCS", "side": "BUY", "qty": 5, "entry": 50.0})
+    led.append({"timestamp": "2024-05-02 10:00:00", "symbol": "TCS", "side": "BUY", "qty": 5, "entry": 60.0})
+    led.update(3, exit=70.0, status="Closed")
+    day = PositionBook().replay(led, today="2024-05-02")
+    assert day.realized == 75.0 and day.positions["TCS"].qty == 5 and day.positions["INFY"].qty == 0
+
+    n = 200_000
+    t0 = time.perf_counter()
+    for i in range(n):
+        book.on_fill(f"S{i % 500}", "BUY" if i % 3 else "SELL", 10, 100.0 + i % 7)
+    t1 = time.perf_counter()
+    ticks = [(f"S{i}", 101.0 + (i % 5), 1) for i in range(500)]
+    for _ in range(200):
+        book.on_ticks(ticks, 0)
+    t2 = time.perf_counter()
+    book.snapshot(1e7, 5e4)
+    t3 = time.perf_counter()
+    total_unreal = sum(p.unrealized for p in book.positions.values())
+    assert abs(total_unreal - book.unrealized) < 1e-3 * max(1.0, abs(total_unreal))
+    print(f"✅ Position book OK: fill {1e6 * (t1 - t0) / n:.2f} µs, mark {1e6 * (t2 - t1) / (200 * 500):.2f} µs,"
+          f" snapshot {1e6 * (t3 - t2):.1f} µs →", book.snapshot(1e7, 5e4))
@@ -0,0 +1,158 @@
+"""
+Phase 28.3 — Portfolio Batch Position Sizer
+File: shared/position_sizer.py
+
+Sizes every pending signal of a bar close together instead of one
+calculate_position_size call per trade (which lets 30 signals each take
+the full risk budget and overrun capital). One vectorised solve:
+
+  1. risk size     qty = capital · risk% / |entry − sl|
+  2. sector caps   within each sector, signals in score order take notional
+                   until the sector cap (less what is already held) is used
+  3. capital       across sectors, signals in score order take notional
+                   until available capital (× max_capital_pct) is used
+  4. lots          quantities are floored to whole lots
+
+Without scores every signal ranks equally and steps 2–3 scale
+proportionally instead. Binding constraint per signal is reported.
+"""
+
+import numpy as np
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+LOT_SIZES = {"NIFTY": 75, "BANKNIFTY": 35, "FINNIFTY": 65, "MIDCPNIFTY": 140}
+BINDING = np.array(["risk", "sector cap", "capital", "below one lot", "invalid"], dtype=object)
+
+
+def position_size(entry: float, sl: float, capital: float, risk_pct: float) -> int:
+    """Single-trade size: capital · risk% / |entry − sl|, at least 1 (risk_engine.calculate_position_size)."""
+    if sl <= 0 or entry <= 0:
+        return 0
+    per_unit_risk = abs(entry - sl)
+    if per_unit_risk == 0:
+        return 0
+    return max(int((capital * risk_pct) / 100 // per_unit_risk), 1)
+
+
+def _take_in_order(want, avail, order, groups=None):
+    """Prefix allocation: in `order`, each item takes min(want, what is left of its group's avail)."""
+    if groups is not None:
+        order = order[np.argsort(groups[order], kind="stable")]   # (group, score order) → contiguous runs
+    w = want[order]
+    if groups is None:
+        before = np.cumsum(w) - w
+        left = avail - before
+    else:
+        g = groups[order]
+        cs = np.cumsum(w)
+        starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+        offset = np.repeat(cs[starts] - w[starts], np.diff(np.r_[starts, len(g)]))
+        left = avail[g] - (cs - w - offset)
+    out = np.empty_like(want)
+    out[order] = np.clip(left, 0.0, w)
+    return out
+
+
+def _scale(want, avail, groups=None):
+    """Proportional allocation: shrink each group (or the whole set) to fit avail."""
+    if groups is None:
+        total = want.sum()
+        return want * (min(1.0, avail / total) if total > 0 else 1.0)
+    total = np.bincount(groups, weights=want, minlength=len(avail))
+    factor = np.minimum(1.0, np.divide(avail, total, out=np.ones_like(total), where=total > 0))
+    return want * factor[groups]
+
+
+def size_batch(entry, sl, capital: float, risk_pct: float = 1.0, sector=None, lot_size=1,
+               score=None, sector_cap_pct: float = None, max_capital_pct: float = 100.0,
+               margin=1.0, used_capital: float = 0.0, sector_used: dict = None) -> dict:
+    """Allocate qty across all candidates at once.
+
+    entry / sl / lot_size / margin / score are arrays (or scalars); sector is
+    an array of labels. margin is the fraction of notional blocked (1 = cash).
+    Returns arrays qty, notional, risk and binding (BINDING labels).
+    """
+    entry = np.asarray(entry, dtype=np.float64)
+    n = entry.size
+    sl = np.broadcast_to(np.asarray(sl, dtype=np.float64), (n,))
+    lot = np.broadcast_to(np.asarray(lot_size, dtype=np.float64), (n,))
+    margin = np.broadcast_to(np.asarray(margin, dtype=np.float64), (n,))
+    per_unit = np.abs(entry - sl)
+    valid = (entry > 0) & (sl > 0) & (per_unit > 0) & (lot > 0)
+    unit_cost = entry * margin
+
+    risk_qty = np.where(valid, capital * risk_pct / 100.0 / np.where(valid, per_unit, 1.0), 0.0)
+    want = risk_qty * unit_cost
+    order = np.argsort(-np.asarray(score, dtype=np.float64), kind="stable") if score is not None else None
+
+    alloc = want
+    if sector is not None and sector_cap_pct is not None:
+        labels, groups = np.unique(np.asarray(sector).astype(str), return_inverse=True)
+        used = sector_used or {}
+        avail = np.array([max(0.0, capital * sector_cap_pct / 100.0 - used.get(s, 0.0)) for s in labels])
+        alloc = _take_in_order(alloc, avail, order, groups) if order is not None else _scale(alloc, avail, groups)
+    after_sector = alloc
+    budget = max(0.0, capital * max_capital_pct / 100.0 - used_capital)
+    alloc = _take_in_order(alloc, budget, order) if order is not None else _scale(alloc, budget)
+
+    qty = np.floor(np.where(valid, alloc / np.where(valid, unit_cost, 1.0), 0.0) / lot + 1e-9) * lot
+    binding = np.zeros(n, dtype=np.int8)
+    binding[after_sector < want * (1 - 1e-12)] = 1
+    binding[(binding == 0) & (alloc < after_sector * (1 - 1e-12))] = 2
+    binding[valid & (qty == 0) & (binding == 0)] = 3
+    binding[~valid] = 4
+    return {"qty": qty.astype(np.int64), "notional": qty * entry, "margin": qty * unit_cost,
+            "risk": qty * per_unit, "binding": BINDING[binding]}
+
+
+def size_signals(signals: list, capital: float, risk_pct: float = 1.0, **kwargs) -> list:
+    """List-of-dicts front end: each signal {symbol, entry, sl, sector?, score?, lot_size?}."""
+    if not signals:
+        return []
+    col = lambda k, d=None: [s.get(k, d) for s in signals]
+    lots = [s.get("lot_size") or LOT_SIZES.get(s["symbol"], 1) for s in signals]
+    scores = col("score")
+    res = size_batch(col("entry"), col("sl"), capital, risk_pct,
+                     sector=col("sector", "") if any(col("sector")) else None, lot_size=lots,
+                     score=scores if all(v is not None for v in scores) else None, **kwargs)
+    return [{**s, "qty": int(q), "notional": round(float(v), 2), "risk": round(float(r), 2), "binding": b}
+            for s, q, v, r, b in zip(signals, res["qty"], res["notional"], res["risk"], res["binding"])]
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    import time
+
+    # 30 signals, each asking for 1 % risk on ₹10L with a 1 % stop → ₹10L notional each
+    n = 30
+    entry = np.full(n, 1000.0)
+    sectors = np.array(["IT", "BANK", "AUTO"])[np.arange(n) % 3]
+    res = size_batch(entry, entry * 0.99, 1_000_000, 1.0, sector=sectors, score=np.arange(n, 0, -1),
+                     sector_cap_pct=40)
+    assert res["notional"].sum() <= 1_000_000 and res["qty"][0] == 400 and res["qty"][3:].sum() == 0
+    for s in ("IT", "BANK", "AUTO"):
+        assert res["notional"][sectors == s].sum() <= 400_000
+    mixed = size_batch(np.full(3, 1000.0), 990.0, 1_000_000, 0.3, sector=["IT", "BANK", "IT"],
+                       score=[3, 2, 1], sector_cap_pct=40)             # interleaved sectors, 300k each
+    assert mixed["notional"].tolist() == [300_000, 300_000, 100_000], mixed
+    assert mixed["binding"].tolist() == ["risk", "risk", "sector cap"]
+    prop = size_batch(entry, entry * 0.99, 1_000_000, 1.0, lot_size=7)
+    assert (prop["qty"] % 7 == 0).all() and prop["notional"].sum() <= 1_000_000
+    nifty = size_signals([{"symbol": "NIFTY", "entry": 22000.0, "sl": 21950.0}], 2_000_000, 1.0, margin=0.12)
+    assert nifty[0]["qty"] % 75 == 0
+
+    rng = np.random.default_rng(7)
+    m = 500
+    e = rng.uniform(100, 5000, m)
+    args = (e, e * (1 - rng.uniform(0.005, 0.03, m)), 5_000_000, 0.5)
+    kw = {"sector": rng.choice(["IT", "BANK", "AUTO", "FMCG", "METAL", "PHARMA"], m),
+          "score": rng.random(m), "lot_size": rng.choice([1, 25, 50], m), "sector_cap_pct": 25}
+    t0 = time.perf_counter()
+    for _ in range(100):
+        size_batch(*args, **kw)
+    print(f"✅ Position sizer OK: {m} candidates in {(time.perf_counter() - t0) * 10:.2f} ms |",
+          dict(zip(*(x.tolist() for x in np.unique(res["binding"].astype(str), return_counts=True)))))
@@ -5,39 +5,35 @@ File: shared/risk_engine.py
 
 import streamlit as st
 import pandas as pd
-import os
 from datetime import datetime
 
+from shared.charges_engine import charges
+from shared.position_book import get_position_book
+from shared.position_sizer import position_size, size_signals
+from shared.trade_ledger import get_ledger
+
 # ==========================================================
 # ⚙️ CORE RISK CALCULATIONS
 # ==========================================================
 def calculate_position_size(entry, sl, capital, risk_pct):
     """Auto-calculate position size based on capital and SL distance."""
-    if sl <= 0 or entry <= 0:
-        return 0
-    risk_amount = (capital * risk_pct) / 100
-    per_unit_risk = abs(entry - sl)
-    if per_unit_risk == 0:
-        return 0
-    qty = max(int(risk_amount // per_unit_risk), 1)
-    return qty
-
-
-def calculate_charges(qty, price, side="BUY"):
-    """Estimate brokerage, taxes, and slippage for paper & real P&L."""
-    turnover = qty * price
-    brokerage = min(20, 0.0003 * turnover)
-    stt = 0.00025 * turnover
-    exchange_fee = 0.0000345 * turnover
-    gst = 0.18 * (brokerage + exchange_fee)
-    stamp = 0.00015 * turnover if side == "BUY" else 0
-    slippage = 0.0005 * turnover  # 0.05% assumed
-    total = brokerage + stt + exchange_fee + gst + stamp + slippage
-    return round(total, 2)
-
-
-def validate_daily_loss(current_loss, max_daily_loss):
-    """Block trading if max daily loss reached."""
+    return position_size(entry, sl, capital, risk_pct)
+
+
+def calculate_position_sizes(signals, capital, risk_pct, **limits):
+    """Size all concurrent signals together (capital, sector caps, lot sizes) — see position_sizer."""
+    return size_signals(signals, capital, risk_pct, **limits)
+
+
+def calculate_charges(qty, price, side="BUY", segment="EQ_INTRADAY"):
+    """Estimate brokerage, taxes, and slippage for paper & real P&L (one fill of charges_engine.charges)."""
+    return float(charges(qty, price, side, segment)[0])
+
+
+def validate_daily_loss(current_loss=None, max_daily_loss=10000):
+    """Block trading if max daily loss reached (current_loss=None → live position book)."""
+    if current_loss is None:
+        current_loss = get_position_book().daily_loss
     if current_loss >= max_daily_loss:
         st.error("🚫 Max daily loss reached — trading blocked for the day.")
         return False
@@ -48,11 +44,9 @@ def validate_daily_loss(current_loss, max_daily_loss):
 # 🔄 POSITION SYNC + P&L TRACKER
 # ==========================================================
 def sync_positions(order, trade_logs_path):
-    """Sync open positions & update P&L."""
-    os.makedirs(os.path.dirname(trade_logs_path), exist_ok=True)
-    df = pd.read_csv(trade_logs_path) if os.path.exists(trade_logs_path) else pd.DataFrame()
-
-    new_entry = {
+    """Append the order to the trade ledger; returns the position book rows."""
+    book = get_position_book(trade_logs_path)           # subscribes to the ledger before the append
+    get_ledger(trade_logs_path).append({
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "symbol": order["symbol"],
         "side": order["side"],
@@ -62,11 +56,8 @@ def sync_positions(order, trade_logs_path):
         "target": order.get("target", 0.0),
         "charges": calculate_charges(order["qty"], order["price"], order["side"]),
         "status": "Open",
-    }
-
-    df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
-    df.to_csv(trade_logs_path, index=False)
-    return df
+    })
+    return pd.DataFrame(book.rows())
 
 
 def calculate_pnl(entry, exit_price, qty, charges):
@@ -80,33 +71,12 @@ def calculate_pnl(entry, exit_price, qty, charges):
 # 📦 RISK SNAPSHOT
 # ==========================================================
 def get_risk_snapshot(trade_logs_path, capital, max_daily_loss):
-    """Return real-time portfolio exposure and losses."""
-    if not os.path.exists(trade_logs_path):
-        return {"open_positions": 0, "daily_loss": 0, "margin_used": 0}
-
-    df = pd.read_csv(trade_logs_path)
-
-    # ✅ Fix: ensure 'status' column exists
-    if "status" not in df.columns:
-        df["status"] = "Open"
-
-    open_trades = df[df["status"] == "Open"]
-    margin_used = (open_trades["qty"] * open_trades["entry"]).sum()
-    pnl_today = 0
-
-    if "exit" in df.columns:
-        df["pnl"] = (df["exit"] - df["entry"]) * df["qty"] - df["charges"]
-        pnl_today = df["pnl"].sum()
-
-    exposure = round((margin_used / capital) * 100, 2) if capital > 0 else 0
-    valid = validate_daily_loss(abs(pnl_today), max_daily_loss)
-    return {
-        "open_positions": len(open_trades),
-        "margin_used": margin_used,
-        "exposure_pct": exposure,
-        "daily_loss": round(pnl_today, 2),
-        "trade_allowed": valid,
-    }
+    """Return real-time portfolio exposure and losses (O(1) read of the position book)."""
+    book = get_position_book(trade_logs_path)
+    snap = book.snapshot(capital)
+    snap["daily_loss"] = snap["daily_pnl"]          # legacy key: signed P&L for the day
+    snap["trade_allowed"] = validate_daily_loss(book.daily_loss, max_daily_loss)
+    return snap
 
 
 # ==========================================================
@@ -0,0 +1,285 @@
+"""
+Phase 26.5 — Vectorised Universe Scanner
+File: shared/scanner_engine.py
+
+Holds the universe as 2-D (symbols × bars) ring arrays per timeframe and
+evaluates filter rules for every symbol in one NumPy pass per bar close.
+RSI (Wilder) and Heikin-Ashi are kept as per-symbol state vectors, so a
+bar close costs O(symbols) regardless of history length.
+
+Rule format (all rules ANDed):
+    {"field": "pct_change", "op": ">", "value": 1.0, "lookback": 1}
+    {"field": "rsi", "op": "<", "value": 30}
+    {"field": "ha_flip", "value": "bull"}          # bull | bear | any
+    {"field": "gap_pct", "op": ">=", "value": 0.5}
+"""
+
+import operator
+import threading
+import time
+import numpy as np
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+DEFAULT_WINDOW = 256
+DEFAULT_RSI_PERIOD = 14
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq}
+O, H, L, C, V = range(5)
+
+
+# ==========================================================
+# 🧱 ONE TIMEFRAME OF THE UNIVERSE
+# ==========================================================
+class UniverseFrame:
+    """(S × window) OHLCV ring plus vectorised RSI / HA state."""
+
+    def __init__(self, n_symbols: int, window: int = DEFAULT_WINDOW, rsi_period: int = DEFAULT_RSI_PERIOD):
+        self.S = n_symbols
+        self.window = window
+        self.rsi_period = rsi_period
+        self.bars = np.full((5, n_symbols, window), np.nan)
+        self.head = -1
+        self.count = 0
+        self.bar_time = 0
+        # Wilder RSI state
+        self.avg_gain = np.zeros(n_symbols)
+        self.avg_loss = np.zeros(n_symbols)
+        # Heikin-Ashi state
+        self.ha_open = np.full(n_symbols, np.nan)
+        self.ha_close = np.full(n_symbols, np.nan)
+        self.ha_color = np.zeros(n_symbols, dtype=np.int8)
+        self.prev_ha_color = np.zeros(n_symbols, dtype=np.int8)
+
+    def _col(self, back: int = 0) -> int:
+        return (self.head - back) % self.window
+
+    def push(self, ohlcv: np.ndarray, bar_time: int = 0):
+        """Append one closed bar for every symbol. ohlcv: (S, 5); NaN rows carry the last close."""
+        ohlcv = np.asarray(ohlcv, dtype=np.float64)
+        o, h, l, c, v = ohlcv.T
+        if self.count:
+            prev_close = self.bars[C, :, self.head]
+            missing = np.isnan(c)
+            if missing.any():
+                o, h, l, c = (np.where(missing, prev_close, x) for x in (o, h, l, c))
+                v = np.where(missing, 0.0, v)
+        self.head = (self.head + 1) % self.window
+        col = self.head
+        self.bars[O, :, col], self.bars[H, :, col], self.bars[L, :, col] = o, h, l
+        self.bars[C, :, col], self.bars[V, :, col] = c, v
+        self.count += 1
+        self.bar_time = bar_time
+
+        # RSI — same seeding as shared.indicators (first diff seeds the average)
+        if self.count >= 2:
+            d = np.nan_to_num(c - self.bars[C, :, self._col(1)])     # no-data symbols contribute 0
+            gain, loss = np.maximum(d, 0.0), np.maximum(-d, 0.0)
+            if self.count == 2:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                a = 1.0 / self.rsi_period
+                self.avg_gain = self.avg_gain + a * (gain - self.avg_gain)
+                self.avg_loss = self.avg_loss + a * (loss - self.avg_loss)
+
+        # Heikin-Ashi — recursive open
+        ha_c = (o + h + l + c) * 0.25
+        ha_o = np.where(np.isnan(self.ha_open), (o + c) * 0.5, (self.ha_open + self.ha_close) * 0.5)
+        self.ha_open, self.ha_close = ha_o, ha_c
+        self.prev_ha_color = self.ha_color
+        self.ha_color = np.where(ha_c > ha_o, 1, np.where(ha_c < ha_o, -1, 0)).astype(np.int8)
+
+    def load_history(self, ohlcv: np.ndarray, times=None):
+        """Warm up from history shaped (S, B, 5), oldest bar first."""
+        for k in range(ohlcv.shape[1]):
+            self.push(ohlcv[:, k, :], int(times[k]) if times is not None else 0)
+
+    # ---------- metrics (all O(S)) ----------
+    def close(self, back: int = 0):
+        return self.bars[C, :, self._col(back)]
+
+    def pct_change(self, lookback: int = 1):
+        if self.count <= lookback:
+            return np.full(self.S, np.nan)
+        prev = self.close(lookback)
+        return (self.close() - prev) / prev * 100.0
+
+    def gap_pct(self):
+        if self.count < 2:
+            return np.full(self.S, np.nan)
+        prev = self.close(1)
+        return (self.bars[O, :, self.head] - prev) / prev * 100.0
+
+    def rsi(self):
+        if self.count <= self.rsi_period:
+            return np.full(self.S, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        return np.where(self.avg_loss == 0, np.where(self.avg_gain == 0, 50.0, 100.0), out)
+
+    def ha_flip(self):
+        """+1 red→green, -1 green→red, 0 otherwise."""
+        flip = (self.ha_color != self.prev_ha_color) & (self.prev_ha_color != 0) & (self.count >= 2)
+        return np.where(flip, self.ha_color, 0).astype(np.int8)
+
+
+# ==========================================================
+# 🔍 SCANNER ENGINE
+# ==========================================================
+class ScannerEngine:
+    def __init__(self, symbols, timeframes=("3m", "5m", "15m", "1h", "1D"),
+                 window: int = DEFAULT_WINDOW, rsi_period: int = DEFAULT_RSI_PERIOD):
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.frames = {tf: UniverseFrame(len(self.symbols), window, rsi_period) for tf in timeframes}
+        self.rules = {}             # tf -> rule list (None → scan skipped)
+        self.results = {}           # tf -> latest hit table
+        self.last_scan_ms = 0.0
+        self._staging = {}          # tf -> [bar_time, (S,5) array, seen]
+        self._lock = threading.Lock()
+
+    def set_rules(self, rules, timeframes=None):
+        for tf in timeframes or self.frames:
+            self.rules[tf] = list(rules)
+
+    # ---------- vectorised evaluation ----------
+    def evaluate(self, tf: str, rules=None):
+        """Return (mask, metrics) for every symbol of one timeframe in one pass."""
+        frame = self.frames[tf]
+        metrics = {
+            "pct_change": frame.pct_change(1),
+            "rsi": frame.rsi(),
+            "ha_flip": frame.ha_flip(),
+            "gap_pct": frame.gap_pct(),
+        }
+        mask = ~np.isnan(frame.close())          # symbols that have printed at least one bar
+        for rule in rules if rules is not None else self.rules.get(tf, []):
+            field = rule["field"]
+            if field == "ha_flip":
+                want = rule.get("value", "any")
+                flip = metrics["ha_flip"]
+                mask &= (flip != 0) if want == "any" else (flip == (1 if want == "bull" else -1))
+                continue
+            if field == "pct_change" and rule.get("lookback", 1) != 1:
+                values = frame.pct_change(rule["lookback"])
+            else:
+                values = metrics[field]
+            with np.errstate(invalid="ignore"):
+                mask &= OPS[rule.get("op", ">")](values, rule["value"])
+        return mask, metrics
+
+    def scan(self, tf: str, rules=None, limit: int = None):
+        mask, m = self.evaluate(tf, rules)
+        idx = np.flatnonzero(mask)
+        order = idx[np.argsort(-np.abs(np.nan_to_num(m["pct_change"][idx])))]
+        if limit:
+            order = order[:limit]
+        return [
+            {"symbol": self.symbols[i], "tf": tf,
+             "pct_change": round(float(m["pct_change"][i]), 2),
+             "rsi": round(float(m["rsi"][i]), 1),
+             "ha_flip": int(m["ha_flip"][i]),
+             "gap_pct": round(float(m["gap_pct"][i]), 2)}
+            for i in order
+        ]
+
+    def scan_all(self, rules=None, limit: int = None):
+        t0 = time.perf_counter()
+        out = {tf: self.scan(tf, rules, limit) for tf in self.frames}
+        self.last_scan_ms = (time.perf_counter() - t0) * 1000.0
+        return out
+
+    # ---------- bar-close ingestion ----------
+    def on_bar_close(self, tf: str, ohlcv: np.ndarray, bar_time: int = 0):
+        """Whole-universe closed bar → push + rescan that timeframe."""
+        with self._lock:
+            self.frames[tf].push(ohlcv, bar_time)
+            if self.rules.get(tf) is not None:
+                self.results[tf] = self.scan(tf)
+
+    def on_symbol_close(self, symbol: str, tf: str, series):
+        """BarAggregator close-listener: stage per-symbol closes, flush once per bar time."""
+        i = self.index.get(symbol)
+        if i is None or tf not in self.frames or series.n < 2:
+            return
+        bar_time = int(series.time[series.n - 2])
+        stage = self._staging.get(tf)
+        if stage is None or stage[0] != bar_time:
+            if stage is not None:
+                self.on_bar_close(tf, stage[1], stage[0])
+            stage = self._staging[tf] = [bar_time, np.full((len(self.symbols), 5), np.nan), 0]
+        stage[1][i] = series.ohlcv[series.n - 2]
+        stage[2] += 1
+        if stage[2] == len(self.symbols):
+            self.on_bar_close(tf, stage[1], bar_time)
+            del self._staging[tf]
+
+    def attach(self, aggregator):
+        aggregator.add_close_listener(self.on_symbol_close)
+        return self
+
+    def warm_from(self, aggregator):
+        """Load closed-bar history already held by a BarAggregator (aligned on the shortest series)."""
+        for tf, frame in self.frames.items():
+            closed = {}
+            for sym in self.symbols:
+                bars = aggregator.last(sym, tf, frame.window + 1)
+                if bars is not None and len(bars["time"]) > 1:
+                    closed[sym] = bars
+            if not closed:
+                continue
+            depth = min(len(b["time"]) for b in closed.values()) - 1      # drop the live bar
+            hist = np.full((len(self.symbols), depth, 5), np.nan)
+            for sym, b in closed.items():
+                cols = [b[k][-depth - 1:-1] for k in ("open", "high", "low", "close", "volume")]
+                hist[self.index[sym]] = np.column_stack(cols)
+            times = next(iter(closed.values()))["time"][-depth - 1:-1]
+            frame.load_history(hist, times)
+        return self
+
+    def latest(self, tf: str = None, limit: int = 10):
+        rows = self.results.get(tf) if tf else [r for tf_rows in self.results.values() for r in tf_rows]
+        return (rows or [])[:limit]
+
+
+_SCANNER = None
+_SCANNER_LOCK = threading.Lock()
+
+
+def get_scanner(symbols=None, rules=None):
+    """Process-wide scanner on the live bar aggregator (top movers when no rules)."""
+    global _SCANNER
+    with _SCANNER_LOCK:
+        if _SCANNER is None:
+            from shared.bar_aggregator import get_bar_aggregator
+            from shared.universe import load_universe
+            from shared.strategy_engine.data_feed_bridge import DEFAULT_SYMBOLS
+            agg = get_bar_aggregator()
+            symbols = symbols or list(DEFAULT_SYMBOLS) + [s for s, _ in load_universe()]
+            _SCANNER = ScannerEngine(dict.fromkeys(symbols))
+            _SCANNER.set_rules(rules or [])
+            _SCANNER.warm_from(agg).attach(agg)
+            for tf in _SCANNER.frames:
+                _SCANNER.results[tf] = _SCANNER.scan(tf)
+    return _SCANNER
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    from shared.indicators import batch
+
+    rng = np.random.default_rng(7)
+    S, B = 50, 120
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, (S, B)), axis=1))
+    open_ = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    high = np.maximum(open_, close) * 1.002
+    low = np.minimum(open_, close) * 0.998
+    hist = np.stack([open_, high, low, close, np.ones((S, B))], axis=2)
+
+    eng = ScannerEngine([f"S{i}" for i in range(S)], timeframes=("5m",))
+    eng.frames["5m"].load_history(hist)
+    assert np.allclose(eng.frames["5m"].rsi(), [batch.rsi(close[i], 14)[-1] for i in range(S)])
+    hits = eng.scan("5m", [{"field": "rsi", "op": ">", "value": 50}])
+    print("✅ Scanner OK:", len(hits), "hits; top:", hits[:2])
@@ -0,0 +1,200 @@
+"""
+Phase 26.6 — Sector Bias Engine
+File: shared/sector_engine.py
+
+Scores every sector of a universe from its constituents' bars:
+RSI (Wilder) and trend (close vs SMA) are computed for all constituents
+in one pass over a (bars × symbols) matrix, then reduced per sector with
+bincount. Results are cached per (universe, timeframe, rsi_period) and
+only recomputed after a constituent bar closes on that timeframe.
+
+Output columns match what sector_rotation_panel renders:
+    Sector, BiasScore, Bias, ForecastScore, Heat, Breadth, Constituents, BiasCode
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+BIAS_LABELS = np.array(["Strong Bear", "Bear", "Neutral", "Bull", "Strong Bull"])
+BIAS_EDGES = np.array([25, 45, 60, 75])          # BiasScore → code 0..4
+PANEL_TIMEFRAMES = {"Daily": "1D"}               # panel label → aggregator timeframe
+RSI_WEIGHT = 0.7                                 # BiasScore = 0.7·RSI + 0.3·(% above trend SMA)
+FORECAST_LOOKBACK = 3                            # bars used for the RSI slope
+FORECAST_GAIN = 2.0
+
+
+def bias_codes(scores) -> np.ndarray:
+    return np.searchsorted(BIAS_EDGES, np.asarray(scores), side="right").astype(np.int8)
+
+
+def bias_flips(prev_codes, codes) -> np.ndarray:
+    """Indices whose bias code changed (arrays aligned on the same sector order)."""
+    return np.flatnonzero(np.asarray(prev_codes) != np.asarray(codes))
+
+
+# ==========================================================
+# 🧮 VECTORISED SCORING
+# ==========================================================
+def rsi_matrix(closes: np.ndarray, n: int) -> np.ndarray:
+    """Wilder RSI for a (bars × symbols) matrix; left NaN padding is skipped per column."""
+    d = np.diff(closes, axis=0, prepend=np.nan)
+    a = 1.0 / n
+    gain = pd.DataFrame(np.where(d > 0, d, 0.0) + d * 0).ewm(alpha=a, adjust=False).mean().to_numpy()
+    loss = pd.DataFrame(np.where(d < 0, -d, 0.0) + d * 0).ewm(alpha=a, adjust=False).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gain / loss)
+    out = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), out)
+    # warm-up: first n bars of every column's own history
+    seen = np.cumsum(~np.isnan(closes), axis=0)
+    out[(seen <= n) | np.isnan(d)] = np.nan
+    return out
+
+
+def score_sectors(closes: np.ndarray, sector_ids: np.ndarray, n_sectors: int, rsi_period: int = 14):
+    """closes: (bars × symbols). Returns per-sector dict of arrays (NaN where no data)."""
+    rsi = rsi_matrix(closes, rsi_period)
+    trend_n = 2 * rsi_period
+    sma = pd.DataFrame(closes).rolling(trend_n).mean().to_numpy()
+
+    last = closes[-1]
+    rsi_now = rsi[-1]
+    rsi_then = rsi[-1 - FORECAST_LOOKBACK] if len(rsi) > FORECAST_LOOKBACK else np.full_like(rsi_now, np.nan)
+    above = np.where(np.isnan(sma[-1]), np.nan, (last > sma[-1]) * 100.0)
+    ref = closes[-1 - rsi_period] if len(closes) > rsi_period else np.full_like(last, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (last / ref - 1.0) * 100.0
+
+    def _mean(x):
+        ok = ~np.isnan(x)
+        total = np.bincount(sector_ids[ok], weights=x[ok], minlength=n_sectors)
+        count = np.bincount(sector_ids[ok], minlength=n_sectors)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return total / count, count
+
+    rsi_mean, count = _mean(rsi_now)
+    breadth, _ = _mean(above)
+    slope, _ = _mean(rsi_now - rsi_then)
+    heat, _ = _mean(change)
+    bias = RSI_WEIGHT * rsi_mean + (1.0 - RSI_WEIGHT) * np.where(np.isnan(breadth), 50.0, breadth)
+    forecast = bias + FORECAST_GAIN * np.nan_to_num(slope)
+    return {"bias": bias, "forecast": forecast, "heat": heat, "breadth": breadth, "count": count}
+
+
+# ==========================================================
+# 🏭 ENGINE
+# ==========================================================
+class SectorEngine:
+    """Per-(universe, tf, rsi_period) cached sector scores on top of a BarAggregator."""
+
+    def __init__(self, aggregator, history: int = 120):
+        self.agg = aggregator
+        self.history = history
+        self._closes = {}           # tf -> constituent bar-close counter
+        self._cache = {}            # (universe, tf, rsi_period) -> (close counter, DataFrame)
+        self._universes = {}        # name -> (symbols, sector names, sector ids)
+        self._tracked = set()
+        self._lock = threading.Lock()
+        aggregator.add_close_listener(self.on_bar_close)
+
+    def on_bar_close(self, symbol: str, tf: str, series):
+        if symbol in self._tracked:
+            self._closes[tf] = self._closes.get(tf, 0) + 1
+
+    def universe(self, name: str):
+        if name not in self._universes:
+            from shared.universe import load_universe
+            pairs = load_universe(name)
+            symbols = [s for s, _ in pairs]
+            sectors = list(dict.fromkeys(sec for _, sec in pairs))     # keep the universe's sector order
+            code = {sec: k for k, sec in enumerate(sectors)}
+            ids = np.array([code[sec] for _, sec in pairs], dtype=np.int64)
+            self._universes[name] = (symbols, sectors, ids)
+            self._tracked.update(symbols)
+        return self._universes[name]
+
+    def _close_matrix(self, symbols, tf: str) -> np.ndarray:
+        closes = np.full((self.history, len(symbols)), np.nan)
+        for j, sym in enumerate(symbols):
+            bars = self.agg.last(sym, tf, self.history + 1)
+            if bars is None or len(bars["close"]) < 2:
+                continue
+            c = bars["close"][:-1]                                     # closed bars only
+            closes[self.history - len(c):, j] = c
+        return closes
+
+    def snapshot(self, universe: str = "Nifty F&O", timeframe: str = "15m", rsi_period: int = 14):
+        tf = PANEL_TIMEFRAMES.get(timeframe, timeframe)
+        key = (universe, tf, int(rsi_period))
+        with self._lock:
+            symbols, sectors, ids = self.universe(universe)
+            stamp = self._closes.get(tf, 0)
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] == stamp:
+                return hit[1]
+            res = score_sectors(self._close_matrix(symbols, tf), ids, len(sectors), int(rsi_period))
+            bias = np.where(np.isnan(res["bias"]), 50.0, res["bias"])
+            codes = bias_codes(np.rint(bias))
+            df = pd.DataFrame({
+                "Sector": sectors,
+                "BiasScore": np.rint(bias).astype(int),
+                "Bias": BIAS_LABELS[codes],
+                "ForecastScore": np.clip(np.rint(np.where(np.isnan(res["forecast"]), bias, res["forecast"])), 0, 100).astype(int),
+                "Heat": np.round(np.nan_to_num(res["heat"]), 2),
+                "Breadth": np.round(np.nan_to_num(res["breadth"], nan=50.0), 1),
+                "Constituents": res["count"],
+                "BiasCode": codes,
+            })
+            self._cache[key] = (stamp, df)
+            return df
+
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_sector_engine(aggregator=None) -> SectorEngine:
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            from shared.bar_aggregator import get_bar_aggregator
+            _ENGINE = SectorEngine(aggregator or get_bar_aggregator())
+    return _ENGINE
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    import time
+    from shared.bar_aggregator import BarAggregator
+    from shared.indicators import batch
+    from shared.strategy_engine.data_feed_bridge import MockTickFeed, default_feed_symbols
+
+    rng = np.random.default_rng(7)
+    m = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, (80, 3)), axis=0))
+    m[:30, 1] = np.nan
+    r = rsi_matrix(m, 14)
+    for j in range(3):
+        col = m[:, j][~np.isnan(m[:, j])]
+        assert np.allclose(r[-len(col):, j], batch.rsi(col, 14), equal_nan=True)
+
+    agg = BarAggregator()
+    feed = MockTickFeed(store=None, symbols=default_feed_symbols(), seed=7)
+    feed.add_listener(agg.on_ticks)
+    feed.backfill(240)
+    eng = SectorEngine(agg)
+    t0 = time.perf_counter()
+    df = eng.snapshot("Nifty F&O", "5m", 14)
+    t1 = time.perf_counter()
+    assert eng.snapshot("Nifty F&O", "5m", 14) is df                 # cached until a bar closes
+    t2 = time.perf_counter()
+    feed.step(ts=time.time() + 600)
+    assert eng.snapshot("Nifty F&O", "5m", 14) is not df
+    prev = df["BiasCode"].to_numpy()
+    print(df.drop(columns="BiasCode").to_string(index=False))
+    print(f"✅ Sector engine OK: compute {1e3 * (t1 - t0):.2f} ms, cached {1e6 * (t2 - t1):.1f} µs,"
+          f" flips {bias_flips(prev, eng.snapshot('Nifty F&O', '5m', 14)['BiasCode']).tolist()}")
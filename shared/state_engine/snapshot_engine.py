@@ -0,0 +1,221 @@
+"""
+Phase 28.4 — Event-Sourced Order Journal
+File: shared/state_engine/snapshot_engine.py
+
+Replaces the single phase_5_3_0_order_freeze.json overwrite with an
+append-only log of order lifecycle events plus compact snapshots, one
+directory per trading day:
+
+  <root>/journal.log    "<crc32> <json event>\\n" (trade_ledger framing)
+  <root>/journal.snap   folded order state + the log offset / seq it covers
+
+Events: submitted → sent → acked → partial / filled, or rejected /
+cancelled / failed. Each event is folded into per-order state (keyed by the
+router idempotency key). Real (broker) orders are only journalled up to
+the broker ack — fills live in the broker's order book — so for them
+"acked" is final. Startup loads the snapshot and replays only the
+events after it; a torn tail is truncated. Snapshots are spaced
+geometrically (like the ledger checkpoint), so the replayed tail never
+exceeds the number of orders and the log write stays amortised O(1).
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from shared.trade_ledger import _decode, _encode
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+LOG_NAME = "journal.log"
+SNAPSHOT_NAME = "journal.snap"
+SNAPSHOT_EVERY = 2000           # min events between snapshots (grows with the order count)
+JOURNAL_DIR = "Streamlit_TradingSystems/System_2_TradingTerminal/snapshots/journal"
+LIFECYCLE = ("submitted", "sent", "acked", "partial", "filled", "rejected", "cancelled", "failed")
+FINAL_STATUSES = {"filled", "rejected", "cancelled", "failed"}
+REAL_FINAL_STATUSES = FINAL_STATUSES | {"acked"}     # Real orders: fills are tracked by the broker
+_META = ("seq", "key", "type", "ts")
+
+
+class OrderJournal:
+    """Durable order lifecycle log with snapshot + tail replay."""
+
+    def __init__(self, root: str, fsync: bool = True, snapshot_every: int = SNAPSHOT_EVERY):
+        self.root = root
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        os.makedirs(root, exist_ok=True)
+        self.log_path = os.path.join(root, LOG_NAME)
+        self.snap_path = os.path.join(root, SNAPSHOT_NAME)
+        self._lock = threading.RLock()
+        self.orders = {}                # key -> folded state
+        self.seq = 0
+        self.size = 0                   # log bytes folded into self.orders
+        self.replayed = 0               # events replayed from the tail at open
+        self._load()
+        self._fh = open(self.log_path, "ab")
+        self._since_snapshot = self.replayed
+
+    # ---------- fold ----------
+    def _apply(self, ev: dict):
+        key = ev["key"]
+        state = self.orders.get(key)
+        if state is None:
+            state = self.orders[key] = {"key": key, "created": ev["ts"], "filled": 0, "avg_fill": 0.0}
+        kind = ev["type"]
+        for k, v in ev.items():
+            if k not in _META and k not in ("fill_qty", "fill_price"):
+                state[k] = v
+        if kind in ("partial", "filled") and ev.get("fill_qty"):
+            done = state["filled"]
+            qty = ev["fill_qty"]
+            state["avg_fill"] = (state["avg_fill"] * done + ev["fill_price"] * qty) / (done + qty)
+            state["filled"] = done + qty
+        state["status"] = kind
+        state["updated"] = ev["ts"]
+        self.seq = ev["seq"]
+
+    def _load(self):
+        if os.path.exists(self.snap_path):
+            try:
+                with open(self.snap_path, "r", encoding="utf-8") as f:
+                    snap = json.load(f)
+                log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+                if snap["size"] <= log_size:
+                    self.orders, self.seq, self.size = snap["orders"], snap["seq"], snap["size"]
+            except (ValueError, KeyError, OSError):
+                self.orders, self.seq, self.size = {}, 0, 0
+        if not os.path.exists(self.log_path):
+            return
+        good = self.size
+        with open(self.log_path, "rb") as f:
+            f.seek(self.size)
+            for line in f:
+                ev = _decode(line)
+                if ev is None:
+                    break
+                self._apply(ev)
+                good += len(line)
+                self.replayed += 1
+        if good != os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(good)
+        self.size = good
+
+    # ---------- writes ----------
+    def record(self, key: str, kind: str, ts: float = None, **fields) -> int:
+        """Durably append one lifecycle event and fold it; returns its seq."""
+        if kind not in LIFECYCLE:
+            raise ValueError(f"unknown order event {kind!r}")
+        with self._lock:
+            ev = {"seq": self.seq + 1, "key": key, "type": kind, "ts": time.time() if ts is None else ts, **fields}
+            data = _encode(ev)
+            self._fh.write(data)
+            self._fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+            self._apply(ev)
+            self.size += len(data)
+            self._since_snapshot += 1
+            if self._since_snapshot >= max(self.snapshot_every, len(self.orders)):
+                self.snapshot()
+            return ev["seq"]
+
+    def snapshot(self):
+        """Atomically persist the folded state (tmp file + fsync + rename)."""
+        with self._lock:
+            tmp = self.snap_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"seq": self.seq, "size": self.size, "orders": self.orders}, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snap_path)
+            self._since_snapshot = 0
+
+    # ---------- reads ----------
+    def get(self, key: str):
+        return self.orders.get(key)
+
+    def open_orders(self) -> list:
+        """Orders not yet in a final state — the in-flight book to reconcile after a restart."""
+        return [s for s in self.orders.values()
+                if s["status"] not in (REAL_FINAL_STATUSES if s.get("mode") == "Real" else FINAL_STATUSES)]
+
+    def unacked(self) -> list:
+        """
+        Submitted / sent but never acknowledged. The broker may still have
+        received them: reconcile against its order book before resending —
+        a resend is only deduplicated by brokers that honour the idempotency key
+        (fyers does not).
+        """
+        return [s for s in self.orders.values() if s["status"] in ("submitted", "sent")]
+
+    def last(self, status: str = None):
+        rows = [s for s in self.orders.values() if status is None or s["status"] == status]
+        return max(rows, key=lambda s: s["updated"]) if rows else None
+
+    def events(self, after_seq: int = 0):
+        """Iterate logged events with seq > after_seq (audit / debugging)."""
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                ev = _decode(line)
+                if ev is None:
+                    return
+                if ev["seq"] > after_seq:
+                    yield ev
+
+    def close(self):
+        with self._lock:
+            if self._since_snapshot:
+                self.snapshot()
+            self._fh.close()
+
+
+_JOURNALS = {}
+_JOURNALS_LOCK = threading.Lock()
+
+
+def journal_root(day: str = None, base: str = JOURNAL_DIR) -> str:
+    return os.path.join(base, day or datetime.now().strftime("%Y-%m-%d"))
+
+
+def get_order_journal(day: str = None) -> OrderJournal:
+    """Process-wide journal for a trading day (default: today), restored on first use."""
+    root = os.path.abspath(journal_root(day))
+    with _JOURNALS_LOCK:
+        journal = _JOURNALS.get(root)
+        if journal is None:
+            journal = _JOURNALS[root] = OrderJournal(root)
+    return journal
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    import tempfile
+
+    root = tempfile.mkdtemp(prefix="journal_")
+    j = OrderJournal(root, snapshot_every=4)
+    j.record("a", "submitted", symbol="NSE:SBIN-EQ", side="BUY", qty=100, price=800.0)
+    j.record("a", "acked", broker_id="FB1")
+    j.record("a", "partial", fill_qty=40, fill_price=800.0)
+    j.record("b", "submitted", symbol="NSE:TCS-EQ", side="SELL", qty=10, price=3800.0)   # → snapshot
+    j.record("a", "filled", fill_qty=60, fill_price=801.0)
+    j.record("c", "submitted", symbol="NSE:INFY-EQ", side="BUY", qty=5, price=1500.0)
+    j.record("b", "rejected", reason="RMS")
+    j.record("d", "submitted", symbol="NSE:ITC-EQ", side="BUY", qty=1, price=450.0, mode="Real")
+    j.record("d", "acked", broker_id="FB2")
+    size = j.size
+    j._fh.write(b"0badc0de {\"seq\": 8, \"ke")                             # torn write
+    j._fh.flush()
+
+    j2 = OrderJournal(root)
+    assert j2.size == size and j2.replayed == 1 and j2.seq == 9
+    assert j2.get("a")["filled"] == 100 and abs(j2.get("a")["avg_fill"] - 800.6) < 1e-9
+    assert [s["key"] for s in j2.open_orders()] == ["c"] and j2.unacked()[0]["key"] == "c"
+    assert j2.get("b")["status"] == "rejected" and j2.last()["key"] == "d"
+    print("✅ Order journal OK:", len(j2.orders), "orders, seq", j2.seq, "| replayed tail:", j2.replayed, "—", root)
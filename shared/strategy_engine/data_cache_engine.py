@@ -0,0 +1,234 @@
+"""
+Phase 26 — Market Data Cache Engine (Columnar Ring Buffers)
+File: shared/strategy_engine/data_cache_engine.py
+
+One process-wide store of per-symbol NumPy ring buffers holding the
+last quote and 1-minute OHLCV history. A single producer writes ticks;
+REST routes, charts and scanners only read.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+DEFAULT_CAPACITY = 1440          # one trading day+ of 1m bars
+DEFAULT_BAR_SECONDS = 60
+MAX_CACHED_VIEWS = 256           # LRU bound on cached quote / candle views
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+O, H, L, C, V = range(5)
+
+
+# ==========================================================
+# 🧱 PER-SYMBOL RING BUFFER
+# ==========================================================
+class SymbolRing:
+    """Fixed-size OHLCV ring + last quote for one symbol."""
+
+    __slots__ = (
+        "symbol", "capacity", "bar_seconds", "times", "ohlcv",
+        "head", "count", "price", "prev_close", "last_ts", "version",
+    )
+
+    def __init__(self, symbol: str, capacity: int = DEFAULT_CAPACITY,
+                 bar_seconds: int = DEFAULT_BAR_SECONDS):
+        self.symbol = symbol
+        self.capacity = capacity
+        self.bar_seconds = bar_seconds
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.ohlcv = np.zeros((capacity, 5), dtype=np.float64)
+        self.head = -1          # index of the bar currently being built
+        self.count = 0
+        self.price = 0.0
+        self.prev_close = 0.0
+        self.last_ts = 0.0
+        self.version = 0
+
+    def update(self, price: float, volume: float, ts: float):
+        """Apply one tick: O(1) update of the live bar or roll a new one."""
+        price = float(price)
+        bucket = int(ts // self.bar_seconds) * self.bar_seconds
+        if self.count == 0 or bucket > self.times[self.head]:
+            self.head = (self.head + 1) % self.capacity
+            self.times[self.head] = bucket
+            row = self.ohlcv[self.head]
+            row[O] = row[H] = row[L] = row[C] = price
+            row[V] = volume
+            self.count = min(self.count + 1, self.capacity)
+        else:
+            row = self.ohlcv[self.head]
+            if price > row[H]:
+                row[H] = price
+            if price < row[L]:
+                row[L] = price
+            row[C] = price
+            row[V] += volume
+        if self.prev_close == 0.0:
+            self.prev_close = price
+        self.price = price
+        self.last_ts = ts
+        self.version += 1
+
+    def last_n(self, n: int):
+        """Return (times, ohlcv) of the last n bars in chronological order."""
+        n = min(n, self.count)
+        if n <= 0:
+            return self.times[:0].copy(), self.ohlcv[:0].copy()
+        idx = (np.arange(self.head - n + 1, self.head + 1)) % self.capacity
+        return self.times[idx], self.ohlcv[idx]
+
+    def quote(self) -> dict:
+        change = self.price - self.prev_close
+        return {
+            "symbol": self.symbol,
+            "price": round(self.price, 2),
+            "change": round(change, 2),
+            "percent": round((change / self.price) * 100, 2) if self.price else 0.0,
+            "timestamp": time.strftime("%H:%M:%S", time.localtime(self.last_ts)),
+        }
+
+
+# ==========================================================
+# 📦 PROCESS-WIDE STORE
+# ==========================================================
+class MarketStore:
+    """Thread-safe registry of SymbolRing buffers with cached read views."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY,
+                 bar_seconds: int = DEFAULT_BAR_SECONDS):
+        self.capacity = capacity
+        self.bar_seconds = bar_seconds
+        self._rings = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self._quote_cache = OrderedDict()    # symbols tuple -> (version, list), LRU
+        self._candle_cache = OrderedDict()   # (symbol, n) -> (version, list), LRU
+        self._view_lock = threading.Lock()
+
+    # ---------- writes (single producer) ----------
+    def ensure(self, symbol: str, prev_close: float = 0.0) -> SymbolRing:
+        ring = self._rings.get(symbol)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(
+                    symbol, SymbolRing(symbol, self.capacity, self.bar_seconds))
+                if prev_close:
+                    ring.prev_close = prev_close
+        return ring
+
+    def update_tick(self, symbol: str, price: float, volume: float = 0.0, ts: float = None):
+        ring = self.ensure(symbol)
+        with self._lock:
+            ring.update(price, volume, ts if ts is not None else time.time())
+            self._version += 1
+
+    def update_ticks(self, ticks, ts: float = None):
+        """Apply a batch of (symbol, price, volume) under one lock acquisition."""
+        ts = ts if ts is not None else time.time()
+        rings = [(self.ensure(sym), price, vol) for sym, price, vol in ticks]
+        with self._lock:
+            for ring, price, vol in rings:
+                ring.update(price, vol, ts)
+            self._version += 1
+
+    # ---------- cached views (LRU, at most MAX_CACHED_VIEWS each) ----------
+    def _recall(self, cache: OrderedDict, key, version: int):
+        with self._view_lock:
+            hit = cache.get(key)
+            if hit is None or hit[0] != version:
+                return None
+            cache.move_to_end(key)
+            return hit[1]
+
+    def _remember(self, cache: OrderedDict, key, version: int, data):
+        with self._view_lock:
+            cache[key] = (version, data)
+            cache.move_to_end(key)
+            while len(cache) > MAX_CACHED_VIEWS:
+                cache.popitem(last=False)
+
+    # ---------- reads ----------
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def symbols(self):
+        return list(self._rings.keys())
+
+    def get_ring(self, symbol: str):
+        return self._rings.get(symbol)
+
+    def quotes(self, symbols) -> list:
+        """Last quotes for symbols; rebuilt only when the store version moves."""
+        key = tuple(symbols)
+        cached = self._recall(self._quote_cache, key, self._version)
+        if cached is not None:
+            return cached
+        with self._lock:
+            version = self._version
+            data = [self._rings[s].quote() for s in key if s in self._rings]
+        self._remember(self._quote_cache, key, version, data)
+        return data
+
+    def candles(self, symbol: str, n: int = 30) -> list:
+        """Last n OHLCV bars as dicts; cached per symbol version."""
+        ring = self._rings.get(symbol)
+        if ring is None:
+            return []
+        key = (symbol, max(0, min(n, ring.capacity)))
+        cached = self._recall(self._candle_cache, key, ring.version)
+        if cached is not None:
+            return cached
+        with self._lock:
+            version = ring.version
+            times, ohlcv = ring.last_n(key[1])
+        data = [
+            {"time": int(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for t, (o, h, l, c, v) in zip(times.tolist(), ohlcv.tolist())
+        ]
+        self._remember(self._candle_cache, key, version, data)
+        return data
+
+    def arrays(self, symbol: str, n: int = None):
+        """Raw (times, ohlcv) copy for NumPy consumers."""
+        ring = self._rings.get(symbol)
+        if ring is None:
+            return None, None
+        with self._lock:
+            return ring.last_n(n if n is not None else ring.count)
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_market_store() -> MarketStore:
+    """Return the process-wide MarketStore singleton."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = MarketStore()
+    return _STORE
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    store = MarketStore(capacity=5, bar_seconds=60)
+    t0 = 1_700_000_000
+    for i in range(600):
+        store.update_tick("NIFTY", 22500 + i % 7, 10, ts=t0 + i)
+    times, ohlcv = store.arrays("NIFTY")
+    assert len(times) == 5 and np.all(np.diff(times) == 60)
+    assert store.candles("NIFTY", 3) is store.candles("NIFTY", 3)
+    assert store.candles("NIFTY", 10 ** 9) is store.candles("NIFTY", 5)
+    for n in range(MAX_CACHED_VIEWS * 2):
+        store.quotes(["NIFTY", f"X{n}"])
+    assert len(store._quote_cache) == MAX_CACHED_VIEWS and len(store._candle_cache) <= MAX_CACHED_VIEWS
+    print("✅ ring OK:", store.quotes(["NIFTY"]), store.candles("NIFTY", 2))
@@ -0,0 +1,140 @@
+"""
+Phase 26 — Data Feed Bridge (Single Producer)
+File: shared/strategy_engine/data_feed_bridge.py
+
+One background producer that writes ticks into the shared MarketStore.
+Mock random-walk for now; swap `_next_prices` for the Fyers socket later.
+"""
+
+import threading
+import time
+import numpy as np
+
+from shared.strategy_engine.data_cache_engine import get_market_store
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+DEFAULT_SYMBOLS = {
+    "NIFTY": 22500.0,
+    "BANKNIFTY": 48500.0,
+    "RELIANCE": 2850.0,
+    "INFY": 1520.0,
+    "TCS": 3900.0,
+}
+CONSTITUENT_BASE_PRICE = 1000.0     # mock start price for sector constituents
+SYMBOL_ALIASES = {"NSE:NIFTY50": "NIFTY", "NSE:NIFTYBANK": "BANKNIFTY"}
+
+
+def feed_symbol(symbol: str) -> str:
+    """Map a chart/broker symbol (NSE:NIFTY50, NSE:INFY-EQ) to the feed key."""
+    if symbol in SYMBOL_ALIASES:
+        return SYMBOL_ALIASES[symbol]
+    return symbol.split(":")[-1].replace("-EQ", "").replace("-INDEX", "")
+
+
+def default_feed_symbols() -> dict:
+    """Index / watch symbols plus the built-in sector constituents (scanner, sector engine)."""
+    from shared.universe import builtin_universe
+    symbols = dict(DEFAULT_SYMBOLS)
+    for sym, _ in builtin_universe():
+        symbols.setdefault(sym, CONSTITUENT_BASE_PRICE)
+    return symbols
+
+
+# ==========================================================
+# 🔄 MOCK TICK PRODUCER
+# ==========================================================
+class MockTickFeed:
+    """Random-walk producer; one thread feeds every reader in the process."""
+
+    def __init__(self, store=None, symbols: dict = None, interval: float = 1.0,
+                 volatility: float = 0.0005, seed: int = None):
+        self.store = store or get_market_store()
+        self.symbols = dict(symbols or DEFAULT_SYMBOLS)
+        self.interval = interval
+        self.volatility = volatility
+        self._names = list(self.symbols.keys())
+        self._prices = np.array(list(self.symbols.values()), dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+        for sym, base in self.symbols.items():
+            self.store.ensure(sym, prev_close=base)
+
+    def add_listener(self, callback):
+        """callback(ticks, ts) runs on the producer thread after each batch."""
+        self._listeners.append(callback)
+
+    def _next_prices(self):
+        shocks = self._rng.standard_normal(len(self._prices)) * self.volatility
+        self._prices = np.round(self._prices * (1.0 + shocks), 2)
+        volumes = self._rng.integers(1, 500, len(self._prices))
+        return list(zip(self._names, self._prices.tolist(), volumes.tolist()))
+
+    def step(self, ts: float = None):
+        """Produce one batch of ticks (also usable without the thread)."""
+        ts = ts if ts is not None else time.time()
+        ticks = self._next_prices()
+        self.store.update_ticks(ticks, ts)
+        for callback in self._listeners:
+            try:
+                callback(ticks, ts)
+            except Exception as e:
+                print("Feed listener error:", e)
+        return ticks
+
+    def backfill(self, minutes: int = 200, ticks_per_bar: int = 4, end: float = None):
+        """Replay synthetic history through the store and listeners up to `end`."""
+        end = end if end is not None else time.time()
+        step = 60.0 / ticks_per_bar
+        start = end - minutes * 60
+        for k in range(minutes * ticks_per_bar):
+            self.step(ts=start + k * step)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.step()
+            self._stop.wait(self.interval)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="mock-tick-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+
+_FEED = None
+_FEED_LOCK = threading.Lock()
+
+
+def get_feed(**kwargs) -> MockTickFeed:
+    """Return the process-wide feed (created, not started, on first call)."""
+    global _FEED
+    if _FEED is None:
+        with _FEED_LOCK:
+            if _FEED is None:
+                kwargs.setdefault("symbols", default_feed_symbols())
+                _FEED = MockTickFeed(**kwargs)
+    return _FEED
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    feed = get_feed(seed=7)
+    for i in range(5):
+        feed.step(ts=1_700_000_000 + i)
+    print("✅ Feed OK:", feed.store.quotes(list(DEFAULT_SYMBOLS)))
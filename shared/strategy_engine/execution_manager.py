@@ -0,0 +1,423 @@
+"""
+Phase 27.3 — Paper Matching Engine (Tick-Driven)
+File: shared/strategy_engine/execution_manager.py
+
+Local exchange simulator for paper trading and OMS stress tests.
+
+  MARKET  fills on the first tick after the order reaches the "exchange"
+  LIMIT   buy fills when tick ≤ limit, sell when tick ≥ limit (at the better price)
+  STOP    stop-limit (NSE "SL"): trigger arms a LIMIT at `price`
+  SL-M    stop-market: trigger arms a MARKET order
+
+Orders go live after a latency model delay; marketable fills pay a
+slippage model; each tick offers volume × participation, so large orders
+fill partially across ticks. Per symbol, resting orders sit in heaps keyed
+by limit / trigger price, so a tick only touches orders that can match.
+
+Events (listener callback(event: dict)):
+  {"type": "ack" | "trigger" | "fill" | "cancel" | "reject", "order_id", ...}
+"""
+
+import collections
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from shared.strategy_engine.data_feed_bridge import feed_symbol
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+ORDER_TYPES = ("MARKET", "LIMIT", "STOP", "SL-M")
+SIDE_SIGN = {"BUY": 1, "SELL": -1}
+OPEN_STATES = {"PENDING", "OPEN", "TRIGGER_PENDING", "PARTIAL"}
+PAPER_LATENCY_MS = (30.0, 10.0)     # live paper matcher: mean, jitter
+PAPER_SLIPPAGE_BPS = 2.0
+
+
+# ==========================================================
+# ⏱️ LATENCY / SLIPPAGE MODELS
+# ==========================================================
+class FixedLatency:
+    def __init__(self, ms: float = 0.0):
+        self.seconds = ms / 1000.0
+
+    def __call__(self, order) -> float:
+        return self.seconds
+
+
+class RandomLatency:
+    """Gaussian latency (ms) clipped at zero."""
+
+    def __init__(self, mean_ms: float = 30.0, jitter_ms: float = 10.0, seed: int = None):
+        self.mean, self.jitter = mean_ms / 1000.0, jitter_ms / 1000.0
+        self._rng = random.Random(seed)
+
+    def __call__(self, order) -> float:
+        return max(0.0, self._rng.gauss(self.mean, self.jitter))
+
+
+class BpsSlippage:
+    """Marketable fills pay `bps` basis points against the order side."""
+
+    def __init__(self, bps: float = 0.0):
+        self.bps = bps
+
+    def __call__(self, side: str, price: float, qty: float) -> float:
+        return price * (1.0 + SIDE_SIGN[side] * self.bps / 10_000.0)
+
+
+class TickSlippage:
+    """Marketable fills pay `ticks` exchange ticks against the order side."""
+
+    def __init__(self, ticks: int = 1, tick_size: float = 0.05):
+        self.offset = ticks * tick_size
+
+    def __call__(self, side: str, price: float, qty: float) -> float:
+        return round(price + SIDE_SIGN[side] * self.offset, 2)
+
+
+# ==========================================================
+# 🧾 ORDER
+# ==========================================================
+def _whole(qty):
+    """Integral qty → int; anything else is kept as given (and rejected)."""
+    try:
+        return int(qty) if float(qty).is_integer() else qty
+    except (TypeError, ValueError):
+        return qty
+
+
+class Order:
+    __slots__ = ("order_id", "symbol", "side", "qty", "order_type", "price", "trigger",
+                 "filled", "avg_price", "status", "submitted", "active_at", "tag")
+
+    def __init__(self, order_id, symbol, side, qty, order_type, price, trigger, submitted, active_at, tag):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.order_type = order_type
+        self.price = price
+        self.trigger = trigger
+        self.filled = 0
+        self.avg_price = 0.0
+        self.status = "PENDING"
+        self.submitted = submitted
+        self.active_at = active_at
+        self.tag = tag
+
+    @property
+    def remaining(self):
+        return self.qty - self.filled
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class _SymbolBook:
+    """Resting orders for one symbol: four heaps with lazy deletion."""
+
+    __slots__ = ("buy_limits", "sell_limits", "buy_stops", "sell_stops", "market")
+
+    def __init__(self):
+        self.buy_limits = []        # (-limit, seq, order)  highest bid first
+        self.sell_limits = []       # (limit, seq, order)   lowest ask first
+        self.buy_stops = []         # (trigger, seq, order) buy stop fires when price ≥ trigger
+        self.sell_stops = []        # (-trigger, seq, order)
+        self.market = collections.deque()       # live market orders (FIFO)
+
+
+# ==========================================================
+# 🏭 MATCHING ENGINE
+# ==========================================================
+class PaperMatchingEngine:
+    """Tick-driven matcher; attach with feed.add_listener(engine.on_ticks)."""
+
+    def __init__(self, latency=None, slippage=None, participation: float = 1.0,
+                 min_fill: int = 1, clock=time.time, universe=None):
+        self.latency = latency or FixedLatency(0.0)
+        self.universe = universe        # container of tradable feed symbols; None → any symbol
+        self.slippage = slippage or BpsSlippage(0.0)
+        self.participation = participation
+        self.min_fill = min_fill
+        self.clock = clock
+        self.orders = {}
+        self.last_price = {}
+        self._books = {}
+        self._pending = []          # (active_at, seq, order) — in flight to the exchange
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._listeners = []
+        self._lock = threading.RLock()
+        self.stats = {"submitted": 0, "acks": 0, "fills": 0, "cancels": 0, "rejects": 0, "triggers": 0}
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def _emit(self, event: dict):
+        self.stats[event["type"] + "s"] += 1
+        for callback in self._listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                print("Matching listener error:", e)
+
+    # ---------- order entry ----------
+    def submit(self, symbol: str, side: str, qty: int, order_type: str = "MARKET",
+               price: float = None, trigger: float = None, ts: float = None, tag=None) -> int:
+        side, order_type = side.upper(), order_type.upper()
+        ts = self.clock() if ts is None else ts
+        with self._lock:
+            oid = next(self._ids)
+            order = Order(oid, feed_symbol(symbol), side, _whole(qty), order_type,
+                          price, trigger, ts, ts, tag)
+            self.orders[oid] = order
+            self.stats["submitted"] += 1
+            reason = self._validate(order)
+            if reason:
+                order.status = "REJECTED"
+                self._emit({"type": "reject", "order_id": oid, "reason": reason, "ts": ts})
+                return oid
+            order.active_at = ts + self.latency(order)
+            heapq.heappush(self._pending, (order.active_at, next(self._seq), order))
+        return oid
+
+    def _validate(self, order) -> str:
+        if self.universe is not None and order.symbol not in self.universe:
+            return "unknown symbol"                 # never ticks → would stay PENDING forever
+        if order.side not in SIDE_SIGN:
+            return "bad side"
+        if order.order_type not in ORDER_TYPES:
+            return "bad order type"
+        if not isinstance(order.qty, int):
+            return "qty must be a whole number"
+        if order.qty <= 0:
+            return "qty must be positive"
+        if order.order_type in ("LIMIT", "STOP") and not order.price:
+            return "limit price required"
+        if order.order_type in ("STOP", "SL-M") and not order.trigger:
+            return "trigger price required"
+        return ""
+
+    def cancel(self, order_id: int, ts: float = None) -> bool:
+        with self._lock:
+            order = self.orders.get(order_id)
+            if order is None or order.status not in OPEN_STATES:
+                return False
+            order.status = "CANCELLED"              # heaps drop it lazily
+            self._emit({"type": "cancel", "order_id": order_id, "filled": order.filled,
+                        "ts": self.clock() if ts is None else ts})
+            return True
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook()
+        return book
+
+    def _rest(self, order, ts):
+        """Order reached the exchange: ack and park it in its heap."""
+        book = self._book(order.symbol)
+        seq = next(self._seq)
+        t = order.order_type
+        if t == "MARKET":
+            book.market.append(order)
+            order.status = "OPEN"
+        elif t == "LIMIT":
+            heap, key = (book.buy_limits, -order.price) if order.side == "BUY" else (book.sell_limits, order.price)
+            heapq.heappush(heap, (key, seq, order))
+            order.status = "OPEN"
+        else:
+            heap, key = (book.buy_stops, order.trigger) if order.side == "BUY" else (book.sell_stops, -order.trigger)
+            heapq.heappush(heap, (key, seq, order))
+            order.status = "TRIGGER_PENDING"
+        self._emit({"type": "ack", "order_id": order.order_id, "status": order.status, "ts": ts,
+                    "latency": ts - order.submitted})
+
+    # ---------- matching ----------
+    def _fill(self, order, price: float, available: float, ts: float) -> float:
+        qty = min(order.remaining, max(self.min_fill, int(available)))
+        if qty <= 0:
+            return available
+        order.avg_price = (order.avg_price * order.filled + price * qty) / (order.filled + qty)
+        order.filled += qty
+        order.status = "FILLED" if order.remaining == 0 else "PARTIAL"
+        self._emit({"type": "fill", "order_id": order.order_id, "symbol": order.symbol,
+                    "side": order.side, "qty": qty, "price": round(price, 2),
+                    "filled": order.filled, "remaining": order.remaining,
+                    "status": order.status, "ts": ts, "tag": order.tag})
+        return available - qty
+
+    def _match_symbol(self, symbol: str, price: float, volume: float, ts: float):
+        book = self._books.get(symbol)
+        if book is None:
+            return
+        available = max(volume * self.participation, self.min_fill)
+
+        # stops → arm as market / limit (re-entered through the same heaps)
+        while book.buy_stops and (book.buy_stops[0][2].status != "TRIGGER_PENDING" or price >= book.buy_stops[0][0]):
+            self._trigger(heapq.heappop(book.buy_stops)[2], book, ts)
+        while book.sell_stops and (book.sell_stops[0][2].status != "TRIGGER_PENDING" or price <= -book.sell_stops[0][0]):
+            self._trigger(heapq.heappop(book.sell_stops)[2], book, ts)
+
+        # market orders: FIFO, pay slippage
+        while book.market and available > 0:
+            order = book.market[0]
+            if order.status in OPEN_STATES:
+                available = self._fill(order, self.slippage(order.side, price, order.remaining), available, ts)
+            if order.status not in OPEN_STATES:
+                book.market.popleft()
+            elif available <= 0:
+                break
+
+        # limits: best-priced first, fill at the better of limit / tick
+        for heap, sign in ((book.buy_limits, 1), (book.sell_limits, -1)):
+            while heap and available > 0:
+                key, _, order = heap[0]
+                if order.status not in OPEN_STATES:
+                    heapq.heappop(heap)
+                    continue
+                limit = -key if sign == 1 else key
+                if (sign == 1 and price > limit) or (sign == -1 and price < limit):
+                    break
+                available = self._fill(order, price, available, ts)
+                if order.status not in OPEN_STATES:
+                    heapq.heappop(heap)
+
+    def _trigger(self, order, book, ts):
+        if order.status != "TRIGGER_PENDING":
+            return
+        self._emit({"type": "trigger", "order_id": order.order_id, "ts": ts})
+        order.order_type = "MARKET" if order.order_type == "SL-M" else "LIMIT"
+        order.status = "OPEN"
+        if order.order_type == "MARKET":
+            book.market.append(order)
+        else:
+            heap, key = (book.buy_limits, -order.price) if order.side == "BUY" else (book.sell_limits, order.price)
+            heapq.heappush(heap, (key, next(self._seq), order))
+
+    def on_tick(self, symbol: str, price: float, volume: float = 1.0, ts: float = None):
+        ts = self.clock() if ts is None else ts
+        with self._lock:
+            self._activate(ts)
+            self.last_price[symbol] = price
+            self._match_symbol(symbol, price, volume, ts)
+
+    def on_ticks(self, ticks, ts: float):
+        """MockTickFeed listener: ticks = [(symbol, price, volume), ...]."""
+        with self._lock:
+            self._activate(ts)
+            for symbol, price, volume in ticks:
+                self.last_price[symbol] = price
+                if symbol in self._books:
+                    self._match_symbol(symbol, price, volume, ts)
+
+    def _activate(self, ts: float):
+        pending = self._pending
+        while pending and pending[0][0] <= ts:
+            order = heapq.heappop(pending)[2]
+            if order.status == "PENDING":
+                self._rest(order, ts)
+
+    # ---------- reads ----------
+    def get(self, order_id: int) -> dict:
+        order = self.orders.get(order_id)
+        return order.as_dict() if order else None
+
+    def open_orders(self, symbol: str = None) -> list:
+        return [o.as_dict() for o in self.orders.values()
+                if o.status in OPEN_STATES and (symbol is None or o.symbol == symbol)]
+
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def log_fill_to_ledger(event: dict):
+    """Matcher listener (feed thread): one trade-ledger row per paper fill."""
+    if event["type"] != "fill":
+        return
+    from datetime import datetime
+    from shared.trade_ledger import DEFAULT_TRADE_LOG, get_ledger
+    tag = event.get("tag") or {}
+    get_ledger(DEFAULT_TRADE_LOG).append({
+        "timestamp": datetime.fromtimestamp(event["ts"]).strftime("%Y-%m-%d %H:%M:%S"),
+        "symbol": tag.get("symbol", event["symbol"]),
+        "side": event["side"],
+        "qty": event["qty"],
+        "entry": event["price"],
+        "sl": tag.get("sl", 0.0),
+        "target": tag.get("target", 0.0),
+        "mode": "Paper",
+        "status": "Executed",
+        "order_id": event["order_id"],
+    })
+
+
+def get_paper_engine(**kwargs) -> PaperMatchingEngine:
+    """Process-wide paper matcher driven by the shared (started) tick feed; fills go to the ledger."""
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            from shared.bar_aggregator import start_live_bars
+            from shared.strategy_engine.data_feed_bridge import get_feed
+            start_live_bars()                   # backfill + start before we listen
+            feed = get_feed()
+            kwargs.setdefault("latency", RandomLatency(*PAPER_LATENCY_MS))
+            kwargs.setdefault("slippage", BpsSlippage(PAPER_SLIPPAGE_BPS))
+            kwargs.setdefault("universe", feed.symbols)
+            _ENGINE = PaperMatchingEngine(**kwargs)
+            _ENGINE.add_listener(log_fill_to_ledger)
+            feed.add_listener(_ENGINE.on_ticks)
+    return _ENGINE
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    fills = []
+    eng = PaperMatchingEngine(latency=FixedLatency(50), slippage=TickSlippage(1), participation=1.0)
+    eng.add_listener(lambda e: fills.append(e) if e["type"] == "fill" else None)
+    t = 1_700_000_000.0
+    m = eng.submit("NSE:NIFTY50", "BUY", 300, "MARKET", ts=t)
+    lim = eng.submit("NIFTY", "SELL", 50, "LIMIT", price=22510, ts=t)
+    slm = eng.submit("NIFTY", "SELL", 50, "SL-M", trigger=22480, ts=t)
+    stp = eng.submit("NIFTY", "BUY", 50, "STOP", price=22530, trigger=22520, ts=t)
+    bad = eng.submit("NIFTY", "BUY", 10, "LIMIT", ts=t)
+    listed = PaperMatchingEngine(universe={"NIFTY"})
+    assert listed.orders[listed.submit("NOSUCH", "BUY", 5, "MARKET")].status == "REJECTED"
+    assert listed.orders[listed.submit("NIFTY", "BUY", 5.5, "MARKET")].status == "REJECTED"
+    assert listed.orders[listed.submit("NSE:NIFTY50", "BUY", 5.0, "MARKET")].qty == 5
+
+    eng.on_tick("NIFTY", 22500.0, 1000, ts=t + 0.01)                  # still in flight
+    assert not fills and eng.orders[bad].status == "REJECTED"
+    eng.on_tick("NIFTY", 22500.0, 120, ts=t + 0.1)                    # market partial: 120 @ +1 tick
+    assert eng.orders[m].filled == 120 and fills[0]["price"] == 22500.05
+    eng.on_tick("NIFTY", 22512.0, 1000, ts=t + 0.2)                   # rest of market + sell limit
+    assert eng.orders[m].status == "FILLED" and eng.orders[lim].avg_price == 22512.0
+    eng.on_tick("NIFTY", 22525.0, 1000, ts=t + 0.3)                   # buy stop armed, 22525 ≤ 22530
+    assert eng.orders[stp].status == "FILLED"
+    eng.on_tick("NIFTY", 22470.0, 1000, ts=t + 0.4)                   # SL-M triggers and fills
+    assert eng.orders[slm].status == "FILLED"
+
+    n = 20_000
+    t0 = time.perf_counter()
+    for i in range(n):
+        sym = f"S{i % 200}"
+        if i % 4 == 0:
+            eng.submit(sym, "BUY", 10, "MARKET", ts=t + 1)
+        elif i % 4 == 1:
+            eng.submit(sym, "SELL", 10, "LIMIT", price=100.5, ts=t + 1)
+        elif i % 4 == 2:
+            eng.submit(sym, "SELL", 10, "SL-M", trigger=99.5, ts=t + 1)
+        else:
+            eng.cancel(i, ts=t + 1)
+    for k in range(50):
+        eng.on_ticks([(f"S{j}", 100.0 + (k % 5 - 2) * 0.4, 50) for j in range(200)], t + 2 + k)
+    dt = time.perf_counter() - t0
+    events = sum(eng.stats.values())
+    print(f"✅ Paper matcher OK: {events:,} order events in {dt:.2f} s ({events / dt:,.0f}/s)", eng.stats)
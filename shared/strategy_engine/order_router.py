@@ -0,0 +1,401 @@
+"""
+Phase 27.4 — Async Order Router
+File: shared/strategy_engine/order_router.py
+
+asyncio router between the UI / strategies and the broker:
+  • token bucket throttle (broker order-rate limit; default 10/s burst 10)
+  • idempotency keys — a key already seen returns the same ticket, so a
+    Streamlit rerun can never submit an order twice (the key is also sent
+    as the Idempotency-Key header)
+  • retries only when the order cannot have reached the broker (connect
+    errors, 429); a timeout or 5xx after sending is final ("failed" with
+    unknown_outcome) — reconcile against the order book before resending,
+    unless the broker is known to honour Idempotency-Key (idempotent=True)
+  • bounded concurrency for in-flight orders
+  • ack tracking per ticket (queued → sent → acked / rejected / failed)
+    with ack-latency percentiles
+
+Runs on its own event-loop thread; sync callers use submit_threadsafe().
+Transports: HttpTransport (REST, pooled httpx client) or FyersTransport
+(wraps the synchronous fyers SDK in the loop's executor).
+"""
+
+import asyncio
+import collections
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+DEFAULT_RATE = 10.0             # orders / second
+DEFAULT_BURST = 10
+DEFAULT_IN_FLIGHT = 32
+DEFAULT_RETRIES = 2
+RETRY_STATUS = {429}                            # rejected before acceptance: always safe to resend
+IDEMPOTENT_RETRY_STATUS = {500, 502, 503, 504}  # safe only if the broker dedups Idempotency-Key
+UNKNOWN_OUTCOME = "unknown_outcome"
+FINAL_STATES = {"acked", "rejected", "failed"}
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens/s, at most `capacity` banked."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                delay = (1.0 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+
+
+def build_order(symbol: str, side: str, qty: int, price: float, sl: float, target: float) -> dict:
+    """Terminal order dict as place_order builds it (checked by validate_order / the risk controller)."""
+    return {
+        "symbol": symbol,
+        "side": side.upper(),
+        "qty": qty,
+        "price": price,
+        "sl": sl,
+        "target": target,
+        "risk_pct": 1.0,
+        "expected_loss": abs(price - sl) * qty,
+    }
+
+
+def fyers_payload(order: dict) -> dict:
+    """Terminal order dict (symbol/side/qty/price/sl) → fyers place_order payload."""
+    return {
+        "symbol": order["symbol"],
+        "qty": order["qty"],
+        "type": 2 if order["side"] == "BUY" else 3,
+        "side": 1 if order["side"] == "BUY" else -1,
+        "limitPrice": order.get("price", 0),
+        "stopPrice": order.get("sl", 0),
+        "validity": "DAY",
+        "offlineOrder": "false",
+    }
+
+
+def idempotency_key(order: dict) -> str:
+    """Deterministic key for an order payload (used when the caller gives none)."""
+    body = json.dumps(order, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(body).hexdigest()
+
+
+# ==========================================================
+# 🔌 TRANSPORTS — async callable(order, key) → (ok, broker_id, response, retryable)
+# ==========================================================
+class HttpTransport:
+    """POST the order as JSON to a REST endpoint over one pooled httpx.AsyncClient."""
+
+    def __init__(self, base_url: str, path: str = "/api/v3/orders/sync",
+                 timeout: float = 5.0, max_connections: int = DEFAULT_IN_FLIGHT, headers: dict = None,
+                 idempotent: bool = False):
+        self.url = base_url.rstrip("/") + path
+        self.idempotent = idempotent            # broker dedups on Idempotency-Key → resending is safe
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.headers = headers or {}
+        self._client = None
+
+    async def __call__(self, order: dict, key: str):
+        import httpx
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, headers=self.headers)
+        try:
+            resp = await self._client.post(self.url, json=order, headers={"Idempotency-Key": key})
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            return False, None, {"error": str(e)}, True             # never left this process
+        except httpx.HTTPError as e:
+            return False, None, {"error": str(e), UNKNOWN_OUTCOME: not self.idempotent}, self.idempotent
+        try:
+            body = resp.json()
+        except ValueError:
+            body = {"raw": resp.text}
+        if resp.status_code >= 400:
+            retry = resp.status_code in RETRY_STATUS or (self.idempotent and resp.status_code in IDEMPOTENT_RETRY_STATUS)
+            if resp.status_code >= 500 and not retry:
+                body = {**body, UNKNOWN_OUTCOME: True} if isinstance(body, dict) else body
+            return False, None, body, retry
+        ok = body.get("s", "ok") == "ok"
+        return ok, body.get("id"), body, False
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FyersTransport:
+    """
+    Adapter for the synchronous fyers SDK (runs in the loop's default executor).
+    The SDK sends no idempotency key, so only connect failures and 429 are retried;
+    any other exception may have come after the broker accepted the order.
+    """
+
+    def __init__(self, fyers):
+        self.fyers = fyers
+
+    async def __call__(self, order: dict, key: str):
+        loop = asyncio.get_running_loop()
+        try:
+            resp = await loop.run_in_executor(None, self.fyers.place_order, order)
+        except Exception as e:
+            if _not_sent(e):
+                return False, None, {"error": str(e)}, True
+            return False, None, {"error": str(e), UNKNOWN_OUTCOME: True}, False
+        ok = isinstance(resp, dict) and resp.get("s") == "ok"
+        retry = not ok and isinstance(resp, dict) and resp.get("code") in RETRY_STATUS
+        return ok, (resp or {}).get("id") if isinstance(resp, dict) else None, resp, retry
+
+
+def _not_sent(exc: Exception) -> bool:
+    """True when the request provably never reached the broker (refused / failed connect)."""
+    if isinstance(exc, ConnectionRefusedError):
+        return True
+    try:
+        from requests.exceptions import ConnectTimeout, ConnectionError as RequestsConnectionError
+    except ImportError:
+        return False
+    if isinstance(exc, ConnectTimeout):
+        return True
+    # requests wraps a refused / unresolvable connect in urllib3's NewConnectionError
+    return isinstance(exc, RequestsConnectionError) and "NewConnectionError" in repr(exc.args)
+
+
+# ==========================================================
+# 🎫 TICKET
+# ==========================================================
+class OrderTicket:
+    __slots__ = ("key", "order", "state", "broker_id", "response", "attempts",
+                 "queued_at", "sent_at", "acked_at", "future", "tag")
+
+    def __init__(self, key: str, order: dict, future, tag=None):
+        self.key = key
+        self.order = order
+        self.tag = tag                  # caller metadata, never sent to the broker
+        self.state = "queued"
+        self.broker_id = None
+        self.response = None
+        self.attempts = 0
+        self.queued_at = time.perf_counter()
+        self.sent_at = None
+        self.acked_at = None
+        self.future = future
+
+    @property
+    def ack_latency(self):
+        """Seconds from first send to the broker's answer."""
+        return self.acked_at - self.sent_at if self.acked_at and self.sent_at else None
+
+    def as_dict(self) -> dict:
+        return {"key": self.key, "state": self.state, "broker_id": self.broker_id,
+                "attempts": self.attempts, "ack_latency_ms": None if self.ack_latency is None
+                else round(self.ack_latency * 1000, 2), "response": self.response}
+
+
+# ==========================================================
+# 🚦 ROUTER
+# ==========================================================
+class OrderRouter:
+    """Throttled, idempotent, concurrent order submission with ack tracking."""
+
+    def __init__(self, transport, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 max_in_flight: int = DEFAULT_IN_FLIGHT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = 0.2):
+        self.transport = transport
+        self.rate, self.burst = rate, burst
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.backoff = backoff
+        self.tickets = {}                       # idempotency key -> OrderTicket
+        self._listeners = []
+        self._latency = collections.deque(maxlen=10_000)
+        self.metrics = {"submitted": 0, "duplicates": 0, "acked": 0, "rejected": 0,
+                        "failed": 0, "retries": 0, "in_flight": 0}
+        self.loop = None
+        self._thread = None
+        self._bucket = None
+        self._slots = None
+
+    def add_listener(self, callback):
+        """callback(ticket) when a ticket reaches a final state (runs on the loop thread)."""
+        self._listeners.append(callback)
+
+    # ---------- loop ----------
+    def _bind(self, loop):
+        self.loop = loop
+        self._bucket = TokenBucket(self.rate, self.burst)
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+
+    def start(self):
+        """Run the router on a dedicated event-loop thread (for sync callers)."""
+        if self._thread is None:
+            ready = threading.Event()
+
+            def _run():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._bind(loop)
+                ready.set()
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name="order-router", daemon=True)
+            self._thread.start()
+            ready.wait()
+        return self
+
+    # ---------- submission ----------
+    async def submit(self, order: dict, key: str = None, tag=None) -> OrderTicket:
+        """Submit (or join) the order for `key` and wait for its final state."""
+        if self.loop is None:
+            self._bind(asyncio.get_running_loop())
+        key = key or idempotency_key(order)
+        ticket = self.tickets.get(key)
+        if ticket is not None:
+            self.metrics["duplicates"] += 1
+        else:
+            ticket = self.tickets[key] = OrderTicket(key, order, self.loop.create_future(), tag)
+            self.metrics["submitted"] += 1
+            self.loop.create_task(self._send(ticket))
+        await asyncio.shield(ticket.future)
+        return ticket
+
+    def submit_threadsafe(self, order: dict, key: str = None, tag=None):
+        """From any thread → concurrent.futures.Future[OrderTicket]."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self.submit(order, key, tag), self.loop)
+
+    async def _send(self, ticket: OrderTicket):
+        async with self._slots:
+            self.metrics["in_flight"] += 1
+            try:
+                for attempt in range(self.retries + 1):
+                    if attempt:
+                        self.metrics["retries"] += 1
+                        await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                    await self._bucket.acquire()
+                    ticket.attempts += 1
+                    ticket.state = "sent"
+                    ticket.sent_at = ticket.sent_at or time.perf_counter()
+                    ok, broker_id, response, retryable = await self.transport(ticket.order, ticket.key)
+                    ticket.response = response
+                    if ok or not retryable:
+                        break
+                ticket.acked_at = time.perf_counter()
+                ticket.broker_id = broker_id
+                unknown = isinstance(response, dict) and response.get(UNKNOWN_OUTCOME)
+                ticket.state = "acked" if ok else ("failed" if retryable or unknown else "rejected")
+            except Exception as e:
+                ticket.response = {"error": str(e)}
+                ticket.state = "failed"
+            finally:
+                self.metrics["in_flight"] -= 1
+        self.metrics[ticket.state] += 1
+        if ticket.state == "acked":
+            self._latency.append(ticket.ack_latency)
+        for callback in self._listeners:
+            try:
+                callback(ticket)
+            except Exception as e:
+                print("Router listener error:", e)
+        if not ticket.future.done():
+            ticket.future.set_result(ticket)
+
+    # ---------- reads ----------
+    def ticket(self, key: str):
+        return self.tickets.get(key)
+
+    def forget(self, key: str):
+        """Drop a finished ticket so the same key may be used again."""
+        ticket = self.tickets.get(key)
+        if ticket is not None and ticket.state in FINAL_STATES:
+            del self.tickets[key]
+
+    def stats(self) -> dict:
+        out = dict(self.metrics)
+        lat = np.array(self._latency) * 1000.0
+        if lat.size:
+            out["ack_ms"] = {"p50": round(float(np.percentile(lat, 50)), 2),
+                             "p99": round(float(np.percentile(lat, 99)), 2),
+                             "max": round(float(lat.max()), 2)}
+        if self._bucket is not None:
+            out["throttled_s"] = round(self._bucket.waited, 3)
+        return out
+
+    async def close(self):
+        close = getattr(self.transport, "close", None)
+        if close is not None:
+            await close()
+
+
+_ROUTERS = {}
+_ROUTERS_LOCK = threading.Lock()
+
+
+def get_order_router(fyers=None, base_url: str = None, idempotent: bool = False, **kwargs) -> OrderRouter:
+    """
+    Process-wide router per broker connection, started on its own loop thread.
+    idempotent=True only for REST brokers that dedup on Idempotency-Key.
+    """
+    key = id(fyers) if fyers is not None else base_url
+    with _ROUTERS_LOCK:
+        router = _ROUTERS.get(key)
+        if router is None:
+            transport = FyersTransport(fyers) if fyers is not None else HttpTransport(base_url, idempotent=idempotent)
+            router = _ROUTERS[key] = OrderRouter(transport, **kwargs).start()
+    return router
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    from benchmarks.fake_broker import FakeBroker
+
+    async def main(url):
+        router = OrderRouter(HttpTransport(url, idempotent=True), rate=200, burst=20, max_in_flight=16)
+        order = {"symbol": "NSE:NIFTY50-INDEX", "qty": 50, "side": 1, "type": 2}
+        first, again = await asyncio.gather(router.submit(order, "k1"), router.submit(order, "k1"))
+        assert first is again and router.metrics["submitted"] == 1
+        batch = await asyncio.gather(*(router.submit({**order, "qty": i + 1}) for i in range(100)))
+        assert all(t.state == "acked" for t in batch)
+        await router.close()
+
+        class _TimesOut:                        # fyers SDK raising after the order was sent
+            calls = 0
+
+            def place_order(self, order):
+                self.calls += 1
+                raise TimeoutError("read timed out")
+
+        fyers = _TimesOut()
+        lost = await OrderRouter(FyersTransport(fyers), backoff=0.0).submit(order, "k2")
+        assert fyers.calls == 1 and lost.state == "failed" and lost.response[UNKNOWN_OUTCOME]
+        return router.stats()
+
+    with FakeBroker(latency_ms=5) as broker:
+        stats = asyncio.run(main(broker.url))
+        assert broker.stats()["orders"] == 101, broker.stats()
+        print("✅ Order router OK:", stats, "| broker:", broker.stats())
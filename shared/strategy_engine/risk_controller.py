@@ -0,0 +1,359 @@
+"""
+Phase 27.6 — Pre-Trade Risk Controller
+File: shared/strategy_engine/risk_controller.py
+
+Rules are loaded once (DATA_PATH/risk_rules.json merged over DEFAULT_RULES)
+and compiled into a flat tuple of check functions — disabled rules (limit
+None) are dropped at compile time, per-symbol exposure limits and the
+symbol → sector-member map are precomputed. check(order) then runs only
+dict lookups and float compares against the live PositionBook:
+
+  max risk %            risk_pct (given, or expected loss / capital)
+  daily loss            book.daily_loss + expected loss ≤ max_daily_loss
+  max order qty / value
+  symbol exposure       |net qty after order| · price ≤ symbol limit
+  sector exposure       sector members' exposure (cached per book version)
+                        with this symbol's position after the order ≤ sector limit
+  max open positions    opening a new symbol when already at the cap
+  order rate            sliding 1 s / 60 s windows of accepted orders
+
+check_batch(orders) runs a basket through the same rules in sequence, each
+accepted leg counting against the next (exposure, open positions, daily
+loss, rate windows).
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+from shared.constants import DATA_PATH
+from shared.strategy_engine.data_feed_bridge import feed_symbol
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+RULES_FILE = os.path.join(DATA_PATH, "risk_rules.json")
+DEFAULT_RULES = {
+    "capital": 0.0,                     # 0 → use the order's own risk_pct
+    "max_risk_pct": 2.0,
+    "max_daily_loss": 10000.0,
+    "max_order_qty": None,
+    "max_order_value": None,
+    "max_symbol_exposure": None,        # notional per symbol
+    "max_sector_exposure": None,        # notional per sector
+    "max_open_positions": None,
+    "max_orders_per_sec": None,
+    "max_orders_per_min": None,
+    "symbol_limits": {},                # {"NIFTY": 2_000_000} overrides max_symbol_exposure
+    "sector_limits": {},                # {"NIFTY IT": 500_000} overrides max_sector_exposure
+    "universe": "Nifty F&O",            # symbol → sector map for sector exposure
+}
+SIDE_SIGN = {"BUY": 1, "SELL": -1}
+CALL_LIMITS = ("capital", "max_risk_pct", "max_daily_loss", "max_order_qty", "max_order_value",
+               "max_open_positions")       # scalar limits a caller may override per check()
+MAX_COMPILED = 64                          # memoised (rules, checks) per distinct CALL_LIMITS override
+_UNSET = object()
+_UNSETS = (_UNSET,) * len(CALL_LIMITS)
+
+
+def load_rules(path: str = RULES_FILE, overrides: dict = None) -> dict:
+    rules = dict(DEFAULT_RULES)
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            rules.update(json.load(f))
+    if overrides:
+        rules.update(overrides)
+    return rules
+
+
+class RiskController:
+    """Compiled pre-trade checks; check(order) → (ok, reason) like validate_order."""
+
+    def __init__(self, rules: dict = None, book=None, sectors=None, clock=time.monotonic):
+        self.rules = load_rules(None, rules) if rules is not None else load_rules()
+        self._book = book
+        self.clock = clock
+        self._sec = collections.deque()
+        self._min = collections.deque()
+        self._lock = threading.Lock()
+        self._pending = {}                      # batch overlay: symbol -> (qty of accepted legs, price)
+        self.stats = {"checked": 0, "rejected": 0}
+        if sectors is None and (self.rules["max_sector_exposure"] is not None or self.rules["sector_limits"]):
+            from shared.universe import load_universe
+            sectors = load_universe(self.rules["universe"])
+        self._compile(sectors or [])
+
+    @property
+    def book(self):
+        if self._book is None:
+            from shared.position_book import get_position_book
+            self._book = get_position_book()
+        return self._book
+
+    # ---------- compile ----------
+    def _compile(self, sectors):
+        r = self.rules
+        self._capital = float(r["capital"] or 0.0)
+        self.symbol_limit = {feed_symbol(s): float(v) for s, v in r["symbol_limits"].items()}
+        default_sym = r["max_symbol_exposure"]
+        self.default_symbol_limit = float(default_sym) if default_sym is not None else float("inf")
+
+        members = {}
+        for sym, sector in sectors:
+            members.setdefault(sector, []).append(feed_symbol(sym))
+        default_sec = r["max_sector_exposure"]
+        self.sector_of = {}                     # symbol -> (member tuple, sector limit, name)
+        self._sector_total = {}                 # sector -> (book version, exposure)
+        for sector, syms in members.items():
+            limit = r["sector_limits"].get(sector, default_sec)
+            if limit is None:
+                continue
+            entry = (tuple(syms), float(limit), sector)
+            for s in syms:
+                self.sector_of[s] = entry
+
+        self._r = r
+        self._checks = self._checks_for(r)
+        self._compiled = {}                     # frozen CALL_LIMITS overrides -> (rules, checks)
+
+    def _checks_for(self, r: dict) -> tuple:
+        checks = [self._check_qty, self._check_risk_pct, self._check_daily_loss]
+        if r["max_order_qty"] is not None or r["max_order_value"] is not None:
+            checks.append(self._check_order_size)
+        if r["max_symbol_exposure"] is not None or self.symbol_limit:
+            checks.append(self._check_symbol_exposure)
+        if self.sector_of:
+            checks.append(self._check_sector_exposure)
+        if r["max_open_positions"] is not None:
+            checks.append(self._check_open_positions)
+        if r["max_orders_per_sec"] is not None or r["max_orders_per_min"] is not None:
+            checks.append(self._check_rate)
+        return tuple(checks)
+
+    # ---------- rules: (symbol, signed qty, price, expected_loss, order, now) → reason or "" ----------
+    def _check_qty(self, sym, q, px, loss, order, now):
+        if str(order["side"]).upper() not in SIDE_SIGN:
+            return "❌ Invalid side"
+        return "" if order["qty"] > 0 else "❌ Invalid quantity"
+
+    def _check_risk_pct(self, sym, q, px, loss, order, now):
+        capital = self._capital
+        pct = loss / capital * 100.0 if capital > 0 else order.get("risk_pct", 0.0)
+        return "❌ Exceeds max risk %" if pct > self._r["max_risk_pct"] else ""
+
+    def _check_daily_loss(self, sym, q, px, loss, order, now):
+        return "❌ Exceeds daily loss limit" if self._day_loss + loss > self._r["max_daily_loss"] else ""
+
+    def _check_order_size(self, sym, q, px, loss, order, now):
+        r = self._r
+        if r["max_order_qty"] is not None and abs(q) > r["max_order_qty"]:
+            return "❌ Exceeds max order qty"
+        if r["max_order_value"] is not None and abs(q) * px > r["max_order_value"]:
+            return "❌ Exceeds max order value"
+        return ""
+
+    def _check_symbol_exposure(self, sym, q, px, loss, order, now):
+        pos = self.book.positions.get(sym)
+        held = pos.qty if pos is not None else 0
+        if self._pending:
+            held += self._pending.get(sym, (0, 0.0))[0]
+        limit = self.symbol_limit.get(sym, self.default_symbol_limit)
+        return "❌ Exceeds symbol exposure" if abs(held + q) * px > limit else ""
+
+    def _check_sector_exposure(self, sym, q, px, loss, order, now):
+        entry = self.sector_of.get(sym)
+        if entry is None:
+            return ""
+        syms, limit, sector = entry
+        book = self.book
+        cached = self._sector_total.get(sector)
+        if cached is None or cached[0] != book.version:         # re-sum only after a fill / mark
+            positions = book.positions
+            cached = (book.version, sum(positions[s].exposure for s in syms if s in positions))
+            self._sector_total[sector] = cached
+        pos = book.positions.get(sym)
+        held = pos.qty if pos is not None else 0
+        total = cached[1] - (pos.exposure if pos is not None else 0.0)
+        if self._pending:
+            held += self._pending.get(sym, (0, 0.0))[0]
+            for s, (dq, spx) in self._pending.items():     # earlier legs of the same basket
+                if s != sym and s in syms:
+                    p = book.positions.get(s)
+                    total += abs((p.qty if p is not None else 0) + dq) * spx - (p.exposure if p is not None else 0.0)
+        total += abs(held + q) * px
+        return f"❌ Exceeds {sector} exposure" if total > limit else ""
+
+    def _check_open_positions(self, sym, q, px, loss, order, now):
+        book = self.book
+        pos = book.positions.get(sym)
+        held = pos.qty if pos is not None else 0
+        count = book.open_count
+        if self._pending:
+            held += self._pending.get(sym, (0, 0.0))[0]
+            for s, (dq, _) in self._pending.items():
+                p = book.positions.get(s)
+                before = p.qty if p is not None else 0
+                count += bool(before + dq) - bool(before)
+        if held:
+            return ""
+        return "❌ Max open positions reached" if count >= self._r["max_open_positions"] else ""
+
+    def _check_rate(self, sym, q, px, loss, order, now):
+        r = self.rules
+        while self._sec and now - self._sec[0] >= 1.0:
+            self._sec.popleft()
+        while self._min and now - self._min[0] >= 60.0:
+            self._min.popleft()
+        if r["max_orders_per_sec"] is not None and len(self._sec) >= r["max_orders_per_sec"]:
+            return "❌ Order rate limit (per second)"
+        if r["max_orders_per_min"] is not None and len(self._min) >= r["max_orders_per_min"]:
+            return "❌ Order rate limit (per minute)"
+        return ""
+
+    # ---------- evaluate ----------
+    def _rules_for(self, limits: dict):
+        """(rules, compiled checks) with the caller's CALL_LIMITS applied, compiled once per override set."""
+        if not limits:
+            return self.rules, self._checks
+        key = tuple(map(limits.get, CALL_LIMITS, _UNSETS))
+        hit = self._compiled.get(key)
+        if hit is None:
+            r = {**self.rules, **{k: v for k, v in zip(CALL_LIMITS, key) if v is not _UNSET}}
+            if len(self._compiled) >= MAX_COMPILED:
+                self._compiled.clear()
+            hit = self._compiled[key] = (r, self._checks_for(r))
+        return hit
+
+    @staticmethod
+    def _terms(order: dict):
+        sym = feed_symbol(order["symbol"])
+        q = SIDE_SIGN.get(str(order["side"]).upper(), 0) * order["qty"]
+        px = order["price"]
+        loss = order.get("expected_loss")
+        if loss is None:
+            loss = abs(px - order.get("sl", 0.0)) * order["qty"]
+        return sym, q, px, loss
+
+    def check(self, order: dict, commit: bool = True, daily_loss: float = None, limits: dict = None):
+        """(ok, reason) for {symbol, side, qty, price, sl?, risk_pct?, expected_loss?}.
+
+        commit=True counts an accepted order against the rate windows;
+        daily_loss overrides the position book's figure (legacy callers);
+        limits overrides CALL_LIMITS for this check only (the UI's risk_limits).
+        """
+        r, checks = self._rules_for(limits)
+        sym, q, px, loss = self._terms(order)
+        now = self.clock()
+        with self._lock:
+            self.stats["checked"] += 1
+            self._day_loss = self.book.daily_loss if daily_loss is None else daily_loss
+            self._r, self._capital = r, float(r["capital"] or 0.0)
+            for rule in checks:
+                reason = rule(sym, q, px, loss, order, now)
+                if reason:
+                    self.stats["rejected"] += 1
+                    return False, reason
+            if commit:
+                self._sec.append(now)
+                self._min.append(now)
+        return True, "OK"
+
+    def check_batch(self, orders: list, commit: bool = True, daily_loss: float = None,
+                    limits: dict = None, all_or_none: bool = False) -> list:
+        """[(ok, reason)] per order, checked in sequence as one basket.
+
+        Each accepted order counts against the following ones: its position
+        (symbol / sector exposure, open positions), its expected loss (daily
+        loss) and its slot in the rate windows. With all_or_none, nothing is
+        committed to the rate windows unless every order passes.
+        """
+        r, checks = self._rules_for(limits)
+        terms = [self._terms(order) for order in orders]
+        now = self.clock()
+        out = []
+        with self._lock:
+            self._day_loss = self.book.daily_loss if daily_loss is None else daily_loss
+            self._r, self._capital = r, float(r["capital"] or 0.0)
+            try:
+                for order, (sym, q, px, loss) in zip(orders, terms):
+                    self.stats["checked"] += 1
+                    reason = next(filter(None, (rule(sym, q, px, loss, order, now) for rule in checks)), "")
+                    self.stats["rejected"] += bool(reason)
+                    out.append((not reason, reason or "OK"))
+                    if reason:
+                        continue
+                    self._pending[sym] = (self._pending.get(sym, (0, px))[0] + q, px)
+                    self._day_loss += loss
+                    self._sec.append(now)
+                    self._min.append(now)
+            finally:
+                self._pending = {}
+                accepted = sum(ok for ok, _ in out)
+                if not commit or (all_or_none and accepted < len(orders)):
+                    for _ in range(accepted):           # this batch's entries are the newest
+                        self._sec.pop()
+                        self._min.pop()
+        return out
+
+
+_CONTROLLERS = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def get_risk_controller(path: str = RULES_FILE) -> RiskController:
+    """
+    Process-wide controller per rules file (compiled once; one set of rate-limit
+    windows). Per-call limits go to check(order, limits=...), not into the key.
+    """
+    key = os.path.abspath(path)
+    with _CONTROLLERS_LOCK:
+        ctl = _CONTROLLERS.get(key)
+        if ctl is None:
+            ctl = _CONTROLLERS[key] = RiskController(load_rules(path))
+    return ctl
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    from shared.position_book import PositionBook
+
+    book = PositionBook()
+    clock = [0.0]
+    rules = {"capital": 1_000_000, "max_risk_pct": 1.0, "max_daily_loss": 20000,
+             "max_symbol_exposure": 1_500_000, "sector_limits": {"NIFTY IT": 600_000},
+             "max_open_positions": 2, "max_orders_per_sec": 2}
+    ctl = RiskController(rules, book=book, sectors=[("TCS", "NIFTY IT"), ("INFY", "NIFTY IT")],
+                         clock=lambda: clock[0])
+    buy = {"symbol": "NSE:TCS-EQ", "side": "BUY", "qty": 100, "price": 3800.0, "sl": 3750.0}
+    assert ctl.check(buy) == (True, "OK")
+    assert ctl.check({**buy, "qty": -5}, commit=False)[1] == "❌ Invalid quantity"
+    assert ctl.check({**buy, "side": "HOLD"}, commit=False)[1] == "❌ Invalid side"
+    book.on_fill("TCS", "BUY", 100, 3800.0)
+    assert ctl.check({**buy, "symbol": "NSE:INFY-EQ", "qty": 200, "price": 1500.0, "sl": 1490.0})[1] == "❌ Exceeds NIFTY IT exposure"
+    assert ctl.check({**buy, "sl": 3600.0})[1] == "❌ Exceeds max risk %"
+    book.on_fill("NIFTY", "BUY", 50, 22000.0)
+    assert ctl.check({"symbol": "SBIN", "side": "BUY", "qty": 10, "price": 800.0, "sl": 790.0})[1] == \
+        "❌ Max open positions reached"
+    assert ctl.check({**buy, "side": "SELL", "sl": 3850.0}) == (True, "OK")      # reduce TCS
+    assert ctl.check({**buy, "side": "SELL", "sl": 3850.0})[1] == "❌ Order rate limit (per second)"
+    clock[0] = 1.5
+    assert ctl.check({**buy, "side": "SELL", "sl": 3850.0}) == (True, "OK")
+    assert ctl.check({**buy, "side": "SELL", "sl": 3850.0}, limits={"max_risk_pct": 0.1})[1] == "❌ Exceeds max risk %"
+    assert ctl.check({**buy, "side": "SELL", "sl": 3850.0}, limits={"capital": 2_000_000}) == (True, "OK")
+    assert ctl._rules_for({"capital": 2_000_000, "daily_loss": 5.0}) is ctl._rules_for({"capital": 2_000_000})
+    assert ctl.check({**buy, "side": "SELL", "sl": 3850.0})[1] == "❌ Order rate limit (per second)"   # windows kept
+
+    clock[0] = 10.0                                         # basket: legs count against each other
+    book.on_fill("NIFTY", "SELL", 50, 22000.0)
+    infy = {"symbol": "INFY", "side": "BUY", "qty": 100, "price": 1500.0, "sl": 1495.0}
+    assert ctl.check(infy, commit=False) == (True, "OK")
+    assert ctl.check_batch([infy, infy], all_or_none=True) == [(True, "OK"), (False, "❌ Exceeds NIFTY IT exposure")]
+    assert ctl.check_batch([infy, {**infy, "symbol": "SBIN"}]) == [(True, "OK"), (False, "❌ Max open positions reached")]
+    assert len(ctl._sec) == 1               # all-or-none batch rolled back, the second kept its accepted leg
+    clock[0] = 20.0
+    assert ctl.check_batch([infy, infy, infy], commit=False)[0] == (True, "OK") and not ctl._sec
+    print("✅ Risk controller OK:", ctl.stats, "| rules compiled:", [c.__name__ for c in ctl._checks])
@@ -0,0 +1,382 @@
+"""
+Phase 27.1 — Append-Only Trade Ledger
+File: shared/trade_ledger.py
+
+Replaces the read-all / rewrite-all trade_logs.csv path.
+
+  <root>/ledger.log   one record per line:  "<crc32 hex> <json row>\\n"
+                      every add/update writes the full row (latest wins)
+  <root>/ledger.idx   checkpoint of the indexes (id → offset, symbol / date /
+                      status → ids) and the log length it covers
+
+Appends are O(1) (write + fsync). Opening loads the checkpoint and replays
+only the records written after it; a torn last line from a crash fails its
+CRC and is truncated away.
+
+Several processes may append to one ledger (Streamlit + the FastAPI bridge):
+writes take an exclusive lock on <root>/ledger.lock, first index whatever
+other writers appended, then take the id and the offset from the file
+itself. Readers pick up other writers' rows on the next ids() / get(). Rows are read back on demand (seek + read on a
+shared read handle — os.pread does not exist on Windows).
+"""
+
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+LOG_NAME = "ledger.log"
+INDEX_NAME = "ledger.idx"
+LOCK_NAME = "ledger.lock"
+CHECKPOINT_EVERY = 1000         # min appends between index checkpoints (grows with the ledger)
+DEFAULT_TRADE_LOG = "Streamlit_TradingSystems/System_2_TradingTerminal/logs/trade_logs.csv"
+
+
+def _encode(row: dict) -> bytes:
+    body = json.dumps(row, separators=(",", ":"), default=str).encode("utf-8")
+    return b"%08x " % zlib.crc32(body) + body + b"\n"
+
+
+def _decode(line: bytes):
+    """Return the row, or None for a torn / corrupt line."""
+    if len(line) < 10 or not line.endswith(b"\n") or line[8:9] != b" ":
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _lock_file(fd: int, lock: bool):
+    """Blocking exclusive lock / unlock of an open file (fcntl, or msvcrt on Windows)."""
+    if os.name == "nt":
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        if not lock:
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            return
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:                                     # LK_LOCK gives up after ~10 s
+                os.lseek(fd, 0, os.SEEK_SET)
+    else:
+        import fcntl
+        fcntl.flock(fd, fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+
+
+class TradeLedger:
+    """Durable append-only trade log with symbol / date / status indexes."""
+
+    def __init__(self, root: str, fsync: bool = True, checkpoint_every: int = CHECKPOINT_EVERY):
+        self.root = root
+        self.fsync = fsync
+        self.checkpoint_every = checkpoint_every
+        os.makedirs(root, exist_ok=True)
+        self.log_path = os.path.join(root, LOG_NAME)
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self._lock = threading.RLock()
+        self._lock_fh = open(os.path.join(root, LOCK_NAME), "a+b")
+        self._lock_depth = 0
+        self._listeners = []
+        self._since_checkpoint = 0
+        self._reset_index()
+        self._load()
+        self._fh = open(self.log_path, "ab")
+        self._rfh = open(self.log_path, "rb")
+
+    # ---------- index ----------
+    def _reset_index(self):
+        self.size = 0                   # bytes of log covered by the index
+        self.next_id = 1
+        self.offsets = {}               # id -> (offset, length) of the latest row
+        self.symbol = {}                # symbol -> [ids]
+        self.date = {}                  # YYYY-MM-DD -> [ids]
+        self.status = {}                # status -> {ids}
+        self._row_status = {}           # id -> current status
+        # running risk totals: open notional (qty·entry while Open), realised P&L of exited rows
+        self.open_notional = 0.0
+        self.realized_pnl = 0.0
+        self._contrib = {}              # id -> (notional, pnl) currently counted
+
+    def _index(self, row: dict, offset: int, length: int):
+        tid = row["id"]
+        if tid not in self.offsets:
+            self.symbol.setdefault(row.get("symbol", ""), []).append(tid)
+            self.date.setdefault(str(row.get("timestamp", ""))[:10], []).append(tid)
+            self.next_id = max(self.next_id, tid + 1)
+        old = self._row_status.get(tid)
+        new = row.get("status", "Open")
+        if old != new:
+            if old is not None:
+                self.status[old].discard(tid)
+            self.status.setdefault(new, set()).add(tid)
+            self._row_status[tid] = new
+        self.offsets[tid] = (offset, length)
+
+        notional = row.get("qty", 0) * row.get("entry", 0) if new == "Open" else 0.0
+        pnl = 0.0
+        if row.get("exit") is not None:
+            pnl = (row["exit"] - row.get("entry", 0)) * row.get("qty", 0) - row.get("charges", 0)
+        old_n, old_p = self._contrib.pop(tid, (0.0, 0.0))
+        self.open_notional += notional - old_n
+        self.realized_pnl += pnl - old_p
+        if notional or pnl:
+            self._contrib[tid] = (notional, pnl)
+
+    def _load(self):
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    ck = json.load(f)
+                log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+                if ck["size"] <= log_size:
+                    self.size, self.next_id = ck["size"], ck["next_id"]
+                    self.offsets = {int(k): tuple(v) for k, v in ck["offsets"].items()}
+                    self.symbol = ck["symbol"]
+                    self.date = ck["date"]
+                    self.status = {k: set(v) for k, v in ck["status"].items()}
+                    self._row_status = {tid: st for st, ids in self.status.items() for tid in ids}
+                    self._contrib = {int(k): tuple(v) for k, v in ck["contrib"].items()}
+                    self.open_notional = sum(n for n, _ in self._contrib.values())
+                    self.realized_pnl = sum(p for _, p in self._contrib.values())
+            except (ValueError, KeyError, OSError):
+                self._reset_index()
+        self._replay_tail()
+
+    def _replay_tail(self):
+        """Index records after the checkpoint; truncate a torn tail."""
+        with self._locked():
+            self._catch_up(truncate=True)
+
+    def _catch_up(self, truncate: bool = False):
+        """
+        Index complete records past self.size (written by this process before a
+        restart, or by another process). Only a writer holding the file lock may
+        truncate: without it a bad tail may be another writer's line in progress.
+        """
+        if not os.path.exists(self.log_path) or os.path.getsize(self.log_path) == self.size:
+            return
+        good = self.size
+        with open(self.log_path, "rb") as f:
+            f.seek(self.size)
+            for line in f:
+                row = _decode(line)
+                if row is None:
+                    break
+                self._index(row, good, len(line))
+                good += len(line)
+        if truncate and good != os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(good)
+        self.size = good
+
+    @contextmanager
+    def _locked(self):
+        """Thread lock + exclusive inter-process lock on ledger.lock (re-entrant)."""
+        with self._lock:
+            self._lock_depth += 1
+            if self._lock_depth == 1:
+                _lock_file(self._lock_fh.fileno(), True)
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if not self._lock_depth:
+                    _lock_file(self._lock_fh.fileno(), False)
+
+    def checkpoint(self):
+        """Atomically persist the indexes (tmp file + fsync + rename)."""
+        with self._locked():
+            ck = {
+                "size": self.size, "next_id": self.next_id,
+                "offsets": self.offsets, "symbol": self.symbol, "date": self.date,
+                "status": {k: sorted(v) for k, v in self.status.items()},
+                "contrib": self._contrib,
+            }
+            tmp = f"{self.index_path}.tmp{os.getpid()}"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(ck, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.index_path)
+            self._since_checkpoint = 0
+
+    # ---------- writes ----------
+    def add_listener(self, callback):
+        """callback(row, previous_row_or_None) after every durable write."""
+        self._listeners.append(callback)
+
+    def _notify(self, row: dict, prev):
+        for callback in self._listeners:
+            try:
+                callback(row, prev)
+            except Exception as e:
+                print("Ledger listener error:", e)
+
+    def _write(self, row: dict):
+        """Append one record; caller holds _locked() and has caught up."""
+        data = _encode(row)
+        self._fh.write(data)
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+        end = self._fh.tell()                                   # O_APPEND: the file's real end
+        self._index(row, end - len(data), len(data))
+        self.size = end
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= max(self.checkpoint_every, len(self.offsets)):
+            self.checkpoint()                               # geometric spacing keeps appends amortised O(1)
+
+    def append(self, trade: dict) -> int:
+        """Durably append a new trade; returns its id."""
+        with self._locked():
+            self._catch_up(truncate=True)
+            row = dict(trade)
+            row["id"] = self.next_id
+            row.setdefault("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            row.setdefault("status", "Open")
+            self._write(row)
+        self._notify(row, None)
+        return row["id"]
+
+    def update(self, trade_id: int, **fields) -> dict:
+        """Append a new version of a trade (e.g. status="Closed", exit=...)."""
+        with self._locked():
+            self._catch_up(truncate=True)
+            prev = self.get(trade_id)
+            if prev is None:
+                raise KeyError(trade_id)
+            row = {**prev, **fields}
+            self._write(row)
+        self._notify(row, prev)
+        return row
+
+    # ---------- reads ----------
+    def refresh(self):
+        """Index rows other processes appended since the last read."""
+        with self._lock:
+            self._catch_up()
+
+    def get(self, trade_id: int):
+        loc = self.offsets.get(trade_id)
+        if loc is None:
+            self.refresh()
+            loc = self.offsets.get(trade_id)
+            if loc is None:
+                return None
+        with self._lock:
+            self._rfh.seek(loc[0])
+            return _decode(self._rfh.read(loc[1]))
+
+    def rows(self, ids) -> list:
+        return [self.get(i) for i in ids]
+
+    def ids(self, symbol: str = None, date: str = None, status: str = None) -> list:
+        """Ids matching every given filter, in append order."""
+        self.refresh()
+        sets = []
+        if symbol is not None:
+            sets.append(self.symbol.get(symbol, []))
+        if date is not None:
+            sets.append(self.date.get(date, []))
+        if status is not None:
+            sets.append(self.status.get(status, ()))
+        if not sets:
+            return sorted(self.offsets)
+        sets.sort(key=len)
+        keep = set(sets[0]).intersection(*sets[1:]) if len(sets) > 1 else set(sets[0])
+        return sorted(keep)
+
+    def query(self, symbol: str = None, date: str = None, status: str = None) -> list:
+        return self.rows(self.ids(symbol, date, status))
+
+    def count(self, status: str = None) -> int:
+        return len(self.offsets) if status is None else len(self.status.get(status, ()))
+
+    def frame(self, ids=None):
+        import pandas as pd
+        rows = self.rows(self.ids() if ids is None else ids)
+        return pd.DataFrame(rows)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # ---------- lifecycle ----------
+    def import_csv(self, csv_path: str) -> int:
+        """One-time migration of a legacy trade_logs.csv."""
+        import pandas as pd
+        df = pd.read_csv(csv_path)
+        for row in df.to_dict("records"):
+            self.append({k: v for k, v in row.items() if v == v})      # drop NaN cells
+        self.checkpoint()
+        return len(df)
+
+    def close(self):
+        with self._lock:
+            if self._since_checkpoint:
+                self.checkpoint()
+            self._fh.close()
+            self._rfh.close()
+            self._lock_fh.close()
+
+
+_LEDGERS = {}
+_LEDGERS_LOCK = threading.Lock()
+
+
+def ledger_root(trade_logs_path: str) -> str:
+    """trade_logs.csv path (legacy callers) → ledger directory next to it."""
+    base, ext = os.path.splitext(trade_logs_path)
+    return base + "_ledger" if ext else trade_logs_path
+
+
+def get_ledger(trade_logs_path: str) -> TradeLedger:
+    """Process-wide ledger per path; imports the legacy CSV on first use."""
+    root = os.path.abspath(ledger_root(trade_logs_path))
+    with _LEDGERS_LOCK:
+        ledger = _LEDGERS.get(root)
+        if ledger is None:
+            ledger = _LEDGERS[root] = TradeLedger(root)
+            if not len(ledger) and trade_logs_path.endswith(".csv") and os.path.exists(trade_logs_path):
+                ledger.import_csv(trade_logs_path)
+    return ledger
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    import tempfile
+
+    root = tempfile.mkdtemp(prefix="ledger_")
+    led = TradeLedger(root, checkpoint_every=3)
+    for i in range(10):
+        led.append({"timestamp": f"2024-05-0{1 + i % 2} 10:00:00", "symbol": ["NIFTY", "INFY"][i % 2],
+                    "side": "BUY", "qty": 50, "entry": 100.0 + i})
+    led.update(3, status="Closed", exit=110.0)
+    assert led.ids(symbol="NIFTY", status="Closed") == [3]
+    assert len(led.query(date="2024-05-02")) == 5
+    size = led.size
+    led._fh.write(b"deadbeef {\"id\": 99, \"sym")                 # simulated crash mid-write
+    led._fh.flush()
+
+    led2 = TradeLedger(root)
+    assert led2.size == size and len(led2) == 10 and led2.get(3)["exit"] == 110.0
+    assert led2.count("Open") == 9 and led2.realized_pnl == (110.0 - 102.0) * 50
+    assert led2.open_notional == sum(t["qty"] * t["entry"] for t in led2.query(status="Open"))
+    assert led2.append({"symbol": "TCS", "qty": 1, "entry": 1.0}) == 11
+    other = TradeLedger(root)                                   # a second writer (another process)
+    assert other.append({"symbol": "SBIN", "qty": 1, "entry": 2.0}) == 12
+    assert led2.append({"symbol": "TCS", "qty": 2, "entry": 1.0}) == 13
+    assert led2.get(12)["symbol"] == "SBIN" and other.get(13)["qty"] == 2 and len(other.ids()) == 13
+    print("✅ Trade ledger OK:", len(led2), "trades,", led2.count("Open"), "open —", root)
@@ -0,0 +1,304 @@
+"""
+Phase 28.2 — Streaming Trailing Stop Manager
+File: shared/trailing_stop_engine.py
+
+Stop state for every open position in flat arrays (one slot per position).
+Each tick batch runs one vectorised step over all live slots:
+
+  Fixed %   stop = best price · (1 − p)                       (long; mirrored for shorts)
+  ATR       stop = best price − m · ATR(symbol)              (ATR from closed bars)
+  Step %    stop = initial stop + k · p · entry, k = whole p-steps the
+            best price has advanced from entry
+
+Stops only ratchet (never loosen). Prices are kept "signed" (side · price)
+so longs and shorts share one max() rule. Listeners get an event only for
+slots whose stop actually moved, plus "stop_hit" when price crosses the
+stop (the slot is then retired). update() latency is kept for stats().
+"""
+
+import collections
+import threading
+import time
+
+import numpy as np
+
+from shared.indicators.streaming import ATR
+from shared.strategy_engine.data_feed_bridge import feed_symbol
+
+# ==========================================================
+# ⚙️ SETTINGS
+# ==========================================================
+TRAIL_MODES = {"Step %": 0, "ATR": 1, "Fixed %": 2}     # labels used by alert_order_manager
+MODE_NAMES = {v: k for k, v in TRAIL_MODES.items()}
+SIDE_SIGN = {"BUY": 1.0, "SELL": -1.0}
+ATR_TIMEFRAME = "5m"
+ATR_PERIOD = 14
+
+
+class TrailingStopManager:
+    """Vectorised ratcheting stops for thousands of positions per tick."""
+
+    def __init__(self, capacity: int = 1024, atr_timeframe: str = ATR_TIMEFRAME, atr_period: int = ATR_PERIOD):
+        self.atr_timeframe = atr_timeframe
+        self.atr_period = atr_period
+        self.n = 0
+        self._alloc(capacity)
+        self.symbols = {}                       # symbol -> index into price / atr
+        self.names = []
+        self.price = np.full(16, np.nan)
+        self.atr = np.full(16, np.nan)
+        self._atr_state = {}
+        self.keys = {}                          # caller key (e.g. book symbol) -> slot
+        self._live = np.zeros(0, dtype=np.intp)
+        self._listeners = []
+        self._latency = collections.deque(maxlen=10_000)
+        self.updates = 0
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def _alloc(self, cap: int):
+        old = self.n
+        def grow(name, dtype, fill):
+            arr = np.full(cap, fill, dtype=dtype)
+            if old:
+                arr[:old] = getattr(self, name)[:old]
+            setattr(self, name, arr)
+        grow("sym", np.intp, 0)
+        grow("side", np.float64, 1.0)
+        grow("mode", np.int8, 0)
+        grow("param", np.float64, 0.0)
+        grow("entry", np.float64, 0.0)
+        grow("s_init", np.float64, -np.inf)     # signed initial stop
+        grow("s_stop", np.float64, -np.inf)     # signed current stop
+        grow("s_best", np.float64, -np.inf)     # signed best price since entry
+        grow("active", np.bool_, False)
+
+    def _symbol(self, symbol: str) -> int:
+        i = self.symbols.get(symbol)
+        if i is None:
+            i = self.symbols[symbol] = len(self.names)
+            self.names.append(symbol)
+            if i >= len(self.price):
+                self.price = np.concatenate([self.price, np.full(len(self.price), np.nan)])
+                self.atr = np.concatenate([self.atr, np.full(len(self.atr), np.nan)])
+        return i
+
+    def add_listener(self, callback):
+        """callback(events) with [{"type": "stop_move" | "stop_hit", ...}] per update that changed anything."""
+        self._listeners.append(callback)
+
+    # ---------- positions ----------
+    def add(self, symbol: str, side: str, entry: float, mode: str = "Fixed %", param: float = 1.0,
+            stop: float = None, key=None) -> int:
+        """Track a position; param is % for Step % / Fixed %, ATR multiple for ATR."""
+        sym = feed_symbol(symbol)
+        sign = SIDE_SIGN[side.upper()]
+        code = TRAIL_MODES[mode]
+        with self._lock:
+            if self.n == len(self.sym):
+                self._alloc(len(self.sym) * 2)
+            slot = self.n
+            self.n += 1
+            si = self._symbol(sym)
+            pct = param / 100.0
+            if stop is None:
+                if code == 1:
+                    stop = entry - sign * param * self.atr[si] if self.atr[si] == self.atr[si] else None
+                else:
+                    stop = entry * (1 - sign * pct)
+            self.sym[slot], self.side[slot], self.mode[slot] = si, sign, code
+            self.param[slot] = param if code == 1 else pct
+            self.entry[slot] = entry
+            self.s_init[slot] = self.s_stop[slot] = sign * stop if stop is not None else -np.inf
+            self.s_best[slot] = sign * entry
+            self.active[slot] = True
+            if key is not None:
+                self.keys[key] = slot
+            self._live = np.flatnonzero(self.active[:self.n])
+        return slot
+
+    def remove(self, slot: int):
+        with self._lock:
+            self.active[slot] = False
+            self._live = np.flatnonzero(self.active[:self.n])
+
+    def stop(self, slot: int) -> float:
+        s = self.s_stop[slot]
+        return float(self.side[slot] * s) if np.isfinite(s) else None
+
+    def sync_book(self, book, mode: str, param: float):
+        """Track every open PositionBook position (keyed by symbol); retire flat ones.
+
+        A position that flipped side gets a fresh slot (new side and entry), as
+        does a live one when the panel's mode / param change. A position whose
+        stop was hit keeps its (retired) slot until it goes flat or flips.
+        """
+        code = TRAIL_MODES[mode]
+        stored = param if code == 1 else param / 100.0
+        for sym, pos in list(book.positions.items()):
+            slot = self.keys.get(sym)
+            if slot is not None and pos.qty:
+                flipped = self.side[slot] != np.sign(pos.qty)
+                changed = self.active[slot] and (self.mode[slot] != code or self.param[slot] != stored)
+                if not (flipped or changed):
+                    continue
+            if slot is not None:
+                if self.active[slot]:
+                    self.remove(slot)
+                del self.keys[sym]
+            if pos.qty:
+                self.add(sym, "BUY" if pos.qty > 0 else "SELL", pos.avg_price, mode, param, key=sym)
+
+    # ---------- market data ----------
+    def on_ticks(self, ticks, ts: float):
+        """MockTickFeed listener: record prices, then one vectorised update."""
+        symbols, price = self.symbols, self.price
+        for symbol, px, _ in ticks:
+            i = symbols.get(symbol)
+            if i is not None:
+                price[i] = px
+        self.update(ts)
+
+    def on_bar_close(self, symbol: str, timeframe: str, series):
+        """BarAggregator close listener: feed the closed bar to the symbol's ATR."""
+        if timeframe != self.atr_timeframe or symbol not in self.symbols or series.n < 2:
+            return
+        state = self._atr_state.get(symbol)
+        if state is None:
+            state = self._atr_state[symbol] = ATR(self.atr_period)
+        _, high, low, close, _ = series.ohlcv[series.n - 2]
+        self.atr[self.symbols[symbol]] = state.update(high, low, close)
+
+    def update(self, ts: float = None) -> list:
+        """One step over all live slots; returns (and publishes) the events."""
+        t0 = time.perf_counter()
+        with self._lock:
+            live = self._live
+            if not live.size:
+                return []
+            si = self.sym[live]
+            side = self.side[live]
+            s_px = side * self.price[si]
+            old = self.s_stop[live]
+
+            hit = s_px <= old                                   # NaN price → False
+            best = np.fmax(self.s_best[live], s_px)
+            mode = self.mode[live]
+            p = self.param[live]
+            cand = np.where(mode == 2, best - p * np.abs(best), -np.inf)
+            cand = np.where(mode == 1, best - p * self.atr[si], cand)
+            steps = np.floor((best - side * self.entry[live]) / (p * self.entry[live]))
+            cand = np.where(mode == 0, self.s_init[live] + np.maximum(steps, 0.0) * p * self.entry[live], cand)
+            new = np.where(hit, old, np.fmax(old, cand))
+
+            self.s_best[live] = best
+            self.s_stop[live] = new
+            moved = np.flatnonzero(new > old)
+            hits = np.flatnonzero(hit)
+            events = []
+            if moved.size or hits.size:
+                stamp = time.time() if ts is None else ts
+                if moved.size:
+                    names, mode_names = self.names, MODE_NAMES
+                    sgn = side[moved]
+                    olds = np.where(np.isfinite(old[moved]), sgn * old[moved], np.nan).tolist()
+                    events = [{"type": "stop_move", "slot": slot, "symbol": names[k], "mode": mode_names[m],
+                               "old": None if o != o else o, "stop": v, "ts": stamp}
+                              for slot, k, m, o, v in zip(live[moved].tolist(), si[moved].tolist(),
+                                                          mode[moved].tolist(), olds,
+                                                          (sgn * new[moved]).tolist())]
+                for j in hits.tolist():
+                    events.append({"type": "stop_hit", "slot": int(live[j]), "symbol": self.names[si[j]],
+                                   "stop": float(side[j] * old[j]), "price": float(side[j] * s_px[j]),
+                                   "ts": stamp})
+                if hits.size:
+                    self.active[live[hits]] = False
+                    self._live = np.flatnonzero(self.active[:self.n])
+            self.updates += 1
+            self.events += len(events)
+        self._latency.append(time.perf_counter() - t0)
+        if events:
+            for callback in self._listeners:
+                try:
+                    callback(events)
+                except Exception as e:
+                    print("Trailing stop listener error:", e)
+        return events
+
+    # ---------- reads ----------
+    def rows(self) -> list:
+        out = []
+        for slot in self._live.tolist():
+            side = self.side[slot]
+            out.append({"slot": slot, "symbol": self.names[self.sym[slot]],
+                        "side": "BUY" if side > 0 else "SELL", "mode": MODE_NAMES[int(self.mode[slot])],
+                        "entry": float(self.entry[slot]), "best": float(side * self.s_best[slot]),
+                        "stop": self.stop(slot)})
+        return out
+
+    def stats(self) -> dict:
+        out = {"positions": int(self._live.size), "updates": self.updates, "events": self.events}
+        lat = np.array(self._latency) * 1e6
+        if lat.size:
+            out["update_us"] = {"p50": round(float(np.percentile(lat, 50)), 1),
+                                "p99": round(float(np.percentile(lat, 99)), 1)}
+        return out
+
+
+_MANAGER = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_trailing_stops() -> TrailingStopManager:
+    """Process-wide manager on the shared feed (ticks) and bar aggregator (ATR)."""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            from shared.bar_aggregator import start_live_bars
+            from shared.strategy_engine.data_feed_bridge import get_feed
+            agg = start_live_bars()
+            _MANAGER = TrailingStopManager()
+            agg.add_close_listener(_MANAGER.on_bar_close)
+            get_feed().add_listener(_MANAGER.on_ticks)
+    return _MANAGER
+
+
+# ==========================================================
+# 🧪 SMOKE TEST
+# ==========================================================
+if __name__ == "__main__":
+    mgr = TrailingStopManager()
+    seen = []
+    mgr.add_listener(seen.extend)
+    fixed = mgr.add("NSE:NIFTY50", "BUY", 100.0, "Fixed %", 2.0)           # stop 98
+    step = mgr.add("INFY", "BUY", 100.0, "Step %", 1.0)                     # stop 99, +1 per 1 %
+    short = mgr.add("TCS", "SELL", 100.0, "Fixed %", 2.0)                   # stop 102
+    atr = mgr.add("SBIN", "BUY", 100.0, "ATR", 2.0, stop=95.0)
+    mgr.atr[mgr.symbols["SBIN"]] = 1.5
+
+    mgr.on_ticks([("NIFTY", 105.0, 1), ("INFY", 102.5, 1), ("TCS", 95.0, 1), ("SBIN", 104.0, 1)], 1.0)
+    assert abs(mgr.stop(fixed) - 102.9) < 1e-9 and abs(mgr.stop(step) - 101.0) < 1e-9
+    assert abs(mgr.stop(short) - 96.9) < 1e-9 and mgr.stop(atr) == 101.0
+    assert len(seen) == 4
+    seen.clear()
+    mgr.on_ticks([("NIFTY", 104.0, 1), ("INFY", 102.9, 1)], 2.0)            # no new highs → no events
+    assert seen == []
+    mgr.on_ticks([("TCS", 97.5, 1)], 3.0)                                   # short stopped out
+    assert seen[0]["type"] == "stop_hit" and not mgr.active[short]
+
+    from shared.position_book import PositionBook
+    book, synced = PositionBook(), TrailingStopManager()
+    book.on_fill("INFY", "BUY", 10, 100.0)
+    synced.sync_book(book, "Fixed %", 2.0)
+    book.on_fill("INFY", "SELL", 20, 105.0)                                 # long → short in one fill
+    synced.sync_book(book, "Fixed %", 2.0)
+    row, = synced.rows()
+    assert row["side"] == "SELL" and row["entry"] == 105.0 and abs(row["stop"] - 107.1) < 1e-9
+    synced.sync_book(book, "Step %", 1.0)                                   # panel settings changed
+    row, = synced.rows()
+    assert row["mode"] == "Step %" and abs(row["stop"] - 106.05) < 1e-9
+    book.on_fill("INFY", "BUY", 10, 104.0)
+    synced.sync_book(book, "Step %", 1.0)
+    assert synced.rows() == [] and "INFY" not in synced.keys
+
+    print("✅ Trailing stops OK:", mgr.stats(), mgr.rows())
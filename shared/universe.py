@@ -0,0 +1,50 @@
+# === shared/universe.py ===
+# Scanner / sector universes: symbol → sector maps.
+# A universe CSV (symbol,sector) in DATA_PATH/universes/<slug>.csv overrides
+# the built-in list, e.g. data/universes/nifty_500.csv for the full index.
+
+import csv
+import os
+
+from shared.constants import DATA_PATH
+
+UNIVERSE_DIR = os.path.join(DATA_PATH, "universes")
+
+# Built-in F&O subset grouped by the sector indices the rotation panel shows
+SECTOR_CONSTITUENTS = {
+    "NIFTY BANK": ["HDFCBANK", "ICICIBANK", "SBIN", "KOTAKBANK", "AXISBANK",
+                   "INDUSINDBK", "BANKBARODA", "PNB", "FEDERALBNK", "IDFCFIRSTB"],
+    "NIFTY AUTO": ["MARUTI", "M&M", "TATAMOTORS", "BAJAJ-AUTO", "EICHERMOT",
+                   "HEROMOTOCO", "TVSMOTOR", "ASHOKLEY", "BHARATFORG", "MOTHERSON"],
+    "NIFTY IT": ["TCS", "INFY", "HCLTECH", "WIPRO", "TECHM",
+                 "LTIM", "PERSISTENT", "COFORGE", "MPHASIS", "LTTS"],
+    "NIFTY METAL": ["TATASTEEL", "JSWSTEEL", "HINDALCO", "VEDL", "SAIL",
+                    "JINDALSTEL", "NMDC", "NATIONALUM", "HINDZINC", "APLAPOLLO"],
+    "NIFTY FMCG": ["HINDUNILVR", "ITC", "NESTLEIND", "BRITANNIA", "DABUR",
+                   "MARICO", "GODREJCP", "COLPAL", "TATACONSUM", "UBL"],
+    "NIFTY PHARMA": ["SUNPHARMA", "DRREDDY", "CIPLA", "DIVISLAB", "LUPIN",
+                     "AUROPHARMA", "ALKEM", "TORNTPHARM", "BIOCON", "ZYDUSLIFE"],
+}
+
+
+def _slug(name: str) -> str:
+    return name.lower().replace("&", "").replace(" ", "_").replace("__", "_")
+
+
+def builtin_universe():
+    return [(sym, sector) for sector, syms in SECTOR_CONSTITUENTS.items() for sym in syms]
+
+
+def load_universe(name: str = "Nifty F&O"):
+    """Return [(symbol, sector), ...] for a universe name used by the panels."""
+    path = os.path.join(UNIVERSE_DIR, f"{_slug(name)}.csv")
+    if os.path.exists(path):
+        with open(path, newline="", encoding="utf-8") as f:
+            return [(row["symbol"], row.get("sector") or "OTHER") for row in csv.DictReader(f)]
+    return builtin_universe()
+
+
+def synthetic_universe(n: int = 500, sectors=None):
+    """n placeholder symbols spread round-robin across sectors (benchmarks / demos)."""
+    sectors = list(sectors or SECTOR_CONSTITUENTS.keys())
+    return [(f"SYM{i:04d}", sectors[i % len(sectors)]) for i in range(n)]